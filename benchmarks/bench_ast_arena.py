@@ -0,0 +1,144 @@
+"""
+AST de objetos frente al arena de columnas (`ASTArena`).
+
+Para cada tamaño se mide:
+  - construcción: `Parser.analyze` y, aparte, el aplanado `ASTArena.from_ast`;
+  - memoria retenida (tracemalloc) por cada representación;
+  - recorrido completo: preorden sobre `_fields` frente a `range(len(arena))`
+    y frente a `ASTArena.children`;
+  - `gc.collect()` con cada representación viva;
+  - Checker + IRCodeGenerator sobre los objetos y sobre las vistas del arena.
+Uso: python -m benchmarks.bench_ast_arena [--units N ...] [--repeat N]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import os
+import time
+import tracemalloc
+
+from src.compiler.code_analyzer.checker import Checker
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.code_analyzer.parser import Parser
+from src.compiler.interpreter.ir_generator import IRCodeGenerator
+from src.compiler.shared.AST.arena import ASTArena, CLASSES
+from src.compiler.shared.AST.visitor import walk
+from .synthetic import write_program
+
+DEFAULT_UNITS = [1000, 5000]
+
+
+def best_of(repeat, function, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = function(*args)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best, result
+
+
+def retained(function, *args):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0], result
+    finally:
+        tracemalloc.stop()
+
+
+def walk_objects(root):
+    return sum(1 for _ in walk(root))
+
+
+def walk_arena(arena):
+    counts = [0] * len(CLASSES)
+    for kind in arena.kinds:
+        counts[kind] += 1
+    return sum(counts)
+
+
+def walk_arena_children(arena):
+    count = 0
+    pending = [0]
+    children = arena.children
+    while pending:
+        index = pending.pop()
+        count += 1
+        pending.extend(children(index))
+    return count
+
+
+def check_and_generate(root):
+    with contextlib.redirect_stdout(io.StringIO()):
+        symtable = Checker(root).analyze()
+    return IRCodeGenerator(symtable).generate(root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gox-compiler: AST arena")
+    parser.add_argument("--units", type=int, nargs="*", default=DEFAULT_UNITS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    for units in args.units:
+        path = write_program(units)
+        try:
+            tokens = Lexer(path).analyze()
+        finally:
+            os.remove(path)
+
+        parse_time, ast = best_of(args.repeat, lambda: Parser(tokens).analyze())
+        flatten_time, arena = best_of(args.repeat, ASTArena.from_ast, ast)
+        objects_bytes, ast = retained(lambda: Parser(tokens).analyze())
+        arena_bytes, arena = retained(ASTArena.from_ast, ast)
+        print(f"unidades: {units}  nodos: {len(arena)}")
+        print(
+            f"  construcción     parser {parse_time * 1000:8.1f} ms   "
+            f"aplanado {flatten_time * 1000:8.1f} ms"
+        )
+        print(
+            f"  memoria          objetos {objects_bytes / 2**20:8.1f} MiB   "
+            f"arena {arena_bytes / 2**20:8.1f} MiB "
+            f"({arena.nbytes() / len(arena):.1f} B/nodo en columnas)"
+        )
+
+        objects_walk, _ = best_of(args.repeat, walk_objects, ast)
+        arena_walk, _ = best_of(args.repeat, walk_arena, arena)
+        children_walk, _ = best_of(args.repeat, walk_arena_children, arena)
+        print(
+            f"  recorrido        objetos {objects_walk * 1000:8.1f} ms   "
+            f"arena {arena_walk * 1000:8.1f} ms   "
+            f"arena por hijos {children_walk * 1000:8.1f} ms"
+        )
+
+        with_objects, _ = best_of(args.repeat, gc.collect)
+        root = arena.root
+        del ast
+        gc.collect()
+        with_arena, _ = best_of(args.repeat, gc.collect)
+        print(
+            f"  gc.collect()     objetos {with_objects * 1000:8.1f} ms   "
+            f"arena {with_arena * 1000:8.1f} ms"
+        )
+
+        ast = Parser(tokens).analyze()
+        objects_passes, _ = best_of(args.repeat, check_and_generate, ast)
+        arena_passes, _ = best_of(args.repeat, check_and_generate, ASTArena.from_ast(ast).root)
+        print(
+            f"  checker + IR     objetos {objects_passes * 1000:8.1f} ms   "
+            f"vistas {arena_passes * 1000:8.1f} ms"
+        )
+        del ast, root, arena
+
+
+if __name__ == "__main__":
+    main()
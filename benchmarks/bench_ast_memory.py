@@ -0,0 +1,82 @@
+"""
+Memoria del AST: bytes por nodo y total para un programa de ~1M de nodos.
+
+El programa sintético se tokeniza antes de medir; con tracemalloc se mide
+solo lo que asigna `Parser.analyze` y sigue vivo en el árbol resultante
+(nodos, listas de hijos y cadenas nuevas). Con `--check` se mide también lo
+que añade el checker al completar tipos, símbolos y scopes.
+Uso: python -m benchmarks.bench_ast_memory [--nodes N] [--check]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import os
+import sys
+import tracemalloc
+from collections import Counter
+
+from src.compiler.code_analyzer.checker import Checker
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.code_analyzer.parser import Parser
+from src.compiler.shared.AST.visitor import walk
+from .synthetic import write_program
+
+DEFAULT_NODES = 1_000_000
+
+
+def count_nodes(root):
+    return Counter(node.__class__ for node in walk(root))
+
+
+def tokens_for(units):
+    path = write_program(units)
+    try:
+        return Lexer(path).analyze()
+    finally:
+        os.remove(path)
+
+
+def measure(tokens, check):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        ast = Parser(tokens).analyze()
+        gc.collect()
+        parsed = tracemalloc.get_traced_memory()[0]
+        checked = None
+        if check:
+            with contextlib.redirect_stdout(io.StringIO()):
+                Checker(ast).analyze()
+            gc.collect()
+            checked = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return ast, parsed, checked
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gox-compiler: AST memory")
+    parser.add_argument("--nodes", type=int, default=DEFAULT_NODES)
+    parser.add_argument("--check", action="store_true", help="medir también el checker")
+    args = parser.parse_args()
+
+    nodes_per_unit = sum(count_nodes(Parser(tokens_for(1)).analyze()).values())
+    units = max(1, -(-args.nodes // nodes_per_unit))
+    tokens = tokens_for(units)
+    ast, parsed, checked = measure(tokens, args.check)
+    counts = count_nodes(ast)
+    total_nodes = sum(counts.values())
+
+    print(f"unidades: {units}  tokens: {len(tokens)}  nodos: {total_nodes}")
+    print(f"{'clase':<22}{'nodos':>10}{'sizeof (B)':>12}")
+    for cls, count in sorted(counts.items(), key=lambda item: -item[1]):
+        print(f"{cls.__name__:<22}{count:>10}{sys.getsizeof(object.__new__(cls)):>12}")
+    print(f"AST tras el parser: {parsed / 2**20:.1f} MiB, {parsed / total_nodes:.1f} B/nodo")
+    if checked is not None:
+        print(f"AST tras el checker: {checked / 2**20:.1f} MiB, {checked / total_nodes:.1f} B/nodo")
+
+
+if __name__ == "__main__":
+    main()
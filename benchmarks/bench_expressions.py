@@ -0,0 +1,173 @@
+"""
+Parser de expresiones: precedence climbing frente a la cadena anterior
+orterm → andterm → relterm → addterm → multterm → unaryterm → primary.
+
+La entrada es `code/mandel.gox` (con muchas expresiones aritméticas y de
+comparación) repetido hasta alcanzar miles de líneas. El recolector cíclico
+se desactiva durante la medición.
+Uso: python -m benchmarks.bench_expressions [--copies N ...] [--repeat N]
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+
+from src.compiler.code_analyzer.helpers.parser import ParserHelper
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.code_analyzer.parser import Parser, UNARY_KINDS
+from src.compiler.shared.AST.grammar.binary_operator import BinaryOp
+from src.compiler.shared.AST.grammar.cast import Cast
+from src.compiler.shared.AST.grammar.dereference_location import DereferenceLocation
+from src.compiler.shared.AST.grammar.function_call import FunctionCall
+from src.compiler.shared.AST.grammar.identifier_location import IdentifierLocation
+from src.compiler.shared.AST.grammar.literal import Literal
+from src.compiler.shared.AST.grammar.unary_operator import UnaryOp
+from src.compiler.shared.grammar.gox_token import (
+    LITERAL_KINDS,
+    TYPE_KINDS,
+    DEREF,
+    DIVIDE,
+    EQ,
+    GE,
+    GT,
+    ID,
+    LAND,
+    LE,
+    LOR,
+    LPAREN,
+    LT,
+    MINUS,
+    NE,
+    PLUS,
+    RPAREN,
+    TIMES,
+)
+
+MANDEL = os.path.join(os.path.dirname(__file__), "..", "code", "mandel.gox")
+DEFAULT_COPIES = [20, 100, 500]
+
+
+class LegacyExpressionParser(Parser):
+    """
+    Reproduce el descenso recursivo con un método por nivel de precedencia.
+    `unaryterm` y `primary` también son los recursivos de antes, para que los
+    paréntesis y los argumentos no pasen por el parser nuevo.
+    """
+
+    def expression(self):
+        return self.orterm()
+
+    def orterm(self):
+        return self._parse_binary_op(self.andterm, (LOR,))
+
+    def andterm(self):
+        return self._parse_binary_op(self.relterm, (LAND,))
+
+    def relterm(self):
+        return self._parse_binary_op(self.addterm, (LT, GT, LE, GE, EQ, NE))
+
+    def addterm(self):
+        return self._parse_binary_op(self.multterm, (PLUS, MINUS))
+
+    def multterm(self):
+        return self._parse_binary_op(self.unaryterm, (TIMES, DIVIDE))
+
+    def _parse_binary_op(self, higher_precedence_method, op_types):
+        node = higher_precedence_method()
+        while self.current_token and self.current_token.kind in op_types:
+            op_token = self.current_token
+            self.next_token()
+            right_node = higher_precedence_method()
+            node = BinaryOp(node, op_token.value, right_node)
+        return node
+
+    def unaryterm(self):
+        token = self.current_token
+        if token:
+            if token.kind in UNARY_KINDS:
+                self.next_token()
+                return UnaryOp(token.value, self.unaryterm())
+            elif token.kind == DEREF:
+                self.next_token()
+                deref_node = DereferenceLocation(self.unaryterm())
+                if hasattr(deref_node, "token"):
+                    deref_node.token = token
+                return deref_node
+        return self.primary()
+
+    def primary(self):
+        token = self.current_token
+        if not token:
+            return None
+        if token.kind in LITERAL_KINDS:
+            self.next_token()
+            return Literal(token.value, token.type)
+        elif token.kind == LPAREN:
+            self.next_token()
+            expr = self.expression()
+            ParserHelper.expect(self, RPAREN)
+            return expr
+        elif token.kind in TYPE_KINDS:
+            self.next_token()
+            ParserHelper.expect(self, LPAREN)
+            expr = self.expression()
+            ParserHelper.expect(self, RPAREN)
+            return Cast(token.value, expr)
+        elif token.kind == ID:
+            self.next_token()
+            if self.current_token and self.current_token.kind == LPAREN:
+                self.next_token()
+                args = self.arguments()
+                ParserHelper.expect(self, RPAREN)
+                return FunctionCall(token.value, args)
+            return IdentifierLocation(token.value)
+        self.errors.append((token, f"Token inesperado '{token.value}'"))
+        self.next_token()
+
+
+def time_parse(parser_class, tokens, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            parser_class(tokens).analyze()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+
+def scaled_tokens(copies):
+    with open(MANDEL, encoding="utf-8") as file:
+        text = file.read()
+    handle, path = tempfile.mkstemp(suffix=".gox")
+    with os.fdopen(handle, "w", encoding="utf-8") as file:
+        file.write(text * copies)
+    try:
+        return text.count("\n") * copies, Lexer(path).analyze()
+    finally:
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gox-compiler: expression parsing")
+    parser.add_argument("--copies", type=int, nargs="*", default=DEFAULT_COPIES)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(f"{'líneas':>8}{'tokens':>10}{'antes (ms)':>12}{'después (ms)':>14}{'mejora':>8}")
+    for copies in args.copies:
+        lines, tokens = scaled_tokens(copies)
+        before = time_parse(LegacyExpressionParser, tokens, args.repeat)
+        after = time_parse(Parser, tokens, args.repeat)
+        print(
+            f"{lines:>8}{len(tokens):>10}{before * 1000:>12.1f}"
+            f"{after * 1000:>14.1f}{before / after:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Throughput del lexer (MB/s) con palabras reservadas por tabla frente a la
+gramática anterior, que tenía una alternativa `\\bpalabra\\b` por cada una.
+
+Se mide sobre el corpus `code/*.gox` (repetido para que el tiempo sea
+medible) y sobre un programa sintético grande.
+Uso: python -m benchmarks.bench_lexer [--units N] [--repeat N]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import re
+import tempfile
+import time
+
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.shared.grammar.gox_grammar import Grammar
+from .synthetic import generate_program
+
+
+def legacy_regex():
+    specs = list(Grammar.TOKEN_SPECS)
+    position = next(i for i, (name, _) in enumerate(specs) if name == "CHAR")
+    keywords = [
+        (token_type, rf"\b{word}\b")
+        for word, token_type in Grammar.RESERVED_WORDS.items()
+    ]
+    specs[position:position] = keywords
+    return re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in specs))
+
+
+def time_lexer(path, regex, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        lexer = Lexer(path)
+        lexer.regular_expressions = regex
+        with contextlib.redirect_stdout(io.StringIO()):
+            lexer.analyze()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def write_source(text):
+    handle, path = tempfile.mkstemp(suffix=".gox")
+    with os.fdopen(handle, "w", encoding="utf-8") as file:
+        file.write(text)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gox-compiler: lexer throughput")
+    parser.add_argument("--units", type=int, default=4000)
+    parser.add_argument("--corpus-copies", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = ""
+    for path in sorted(glob.glob("code/*.gox")):
+        with open(path, encoding="utf-8") as file:
+            corpus += file.read() + "\n"
+    inputs = {
+        "code/*.gox": corpus * args.corpus_copies,
+        f"sintético x{args.units}": generate_program(args.units),
+    }
+    regexes = {"antes": legacy_regex(), "después": Grammar.get_compiled_regex()}
+
+    print(f"{'entrada':<20}{'MB':>8}" + "".join(f"{n + ' MB/s':>16}" for n in regexes))
+    for name, text in inputs.items():
+        path = write_source(text)
+        try:
+            size = os.path.getsize(path) / 1e6
+            rates = [size / time_lexer(path, r, args.repeat) for r in regexes.values()]
+        finally:
+            os.remove(path)
+        print(f"{name:<20}{size:>8.2f}" + "".join(f"{rate:>16.2f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
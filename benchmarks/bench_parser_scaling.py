@@ -0,0 +1,60 @@
+"""
+Escalado del parser: tiempo de `Parser.analyze` frente al número de tokens.
+
+Con un cursor O(1) el costo por token debe mantenerse constante al crecer la
+entrada. El recolector cíclico se desactiva durante la medición (salvo con
+`--gc`) porque su costo crece con el heap y no con el trabajo del parser.
+Uso: python -m benchmarks.bench_parser_scaling [--repeat N] [--gc]
+"""
+
+import argparse
+import gc
+import os
+import time
+
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.code_analyzer.parser import Parser
+from .synthetic import write_program
+
+DEFAULT_UNITS = [250, 500, 1000, 2000, 4000, 8000]
+
+
+def time_parse(tokens, repeat, keep_gc=False):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        if not keep_gc:
+            gc.disable()
+        try:
+            start = time.perf_counter()
+            Parser(list(tokens)).analyze()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gox-compiler: parser scaling")
+    parser.add_argument("--units", type=int, nargs="*", default=DEFAULT_UNITS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--gc", action="store_true", help="no desactivar el GC")
+    args = parser.parse_args()
+    print(f"{'líneas':>8}{'tokens':>10}{'parse (ms)':>12}{'µs/token':>10}")
+    for units in args.units:
+        path = write_program(units)
+        try:
+            with open(path, encoding="utf-8") as file:
+                lines = sum(1 for _ in file)
+            tokens = Lexer(path).analyze()
+        finally:
+            os.remove(path)
+        elapsed = time_parse(tokens, args.repeat, args.gc)
+        print(
+            f"{lines:>8}{len(tokens):>10}{elapsed * 1000:>12.1f}"
+            f"{elapsed / len(tokens) * 1e6:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Resolución de identificadores: Checker e IRCodeGenerator sobre un programa
+con bloques profundamente anidados y muchas referencias a variables.
+
+Cada función anida `--depth` bloques `if` y en el más interno repite
+`--refs` asignaciones que leen parámetros, locales y globales. Se informa
+el tiempo de cada pasada, el costo por referencia y cuántas veces se llamó
+a `Scope.lookup` durante la generación de IR.
+Uso: python -m benchmarks.bench_symbol_resolution [--functions N]
+     [--depth N] [--refs N] [--repeat N]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import os
+import tempfile
+import time
+
+from src.compiler.code_analyzer.checker import Checker
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.code_analyzer.parser import Parser
+from src.compiler.interpreter.ir_generator import IRCodeGenerator
+from src.compiler.shared.symtable.symtable import Scope
+
+
+def generate_program(functions, depth, refs):
+    lines = ["var g0 int = 1;", "var g1 float = 2.0;"]
+    for index in range(functions):
+        lines.append(f"func fn{index}(a int, b float) int {{")
+        lines.append("    var acc int = a;")
+        lines.append("    var scale float = b;")
+        for level in range(depth):
+            lines.append(f"if acc > {level} {{")
+        for _ in range(refs):
+            lines.append("acc = acc + a * g0 - int(scale * g1 + b);")
+        lines.extend("}" for _ in range(depth))
+        lines.append("    return acc;")
+        lines.append("}")
+        lines.append(f"g0 = fn{index}(g0, g1);")
+    return "\n".join(lines) + "\n"
+
+
+def best_of(repeat, function):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gox-compiler: symbol resolution")
+    parser.add_argument("--functions", type=int, default=50)
+    parser.add_argument("--depth", type=int, default=40)
+    parser.add_argument("--refs", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    handle, path = tempfile.mkstemp(suffix=".gox")
+    with os.fdopen(handle, "w", encoding="utf-8") as file:
+        file.write(generate_program(args.functions, args.depth, args.refs))
+    try:
+        ast = Parser(Lexer(path).analyze()).analyze()
+    finally:
+        os.remove(path)
+
+    def check():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return Checker(ast).analyze()
+
+    symtable = check()
+    references = args.functions * (args.refs * 7 + args.depth + 2)
+
+    lookups = 0
+    original_lookup = Scope.lookup
+
+    def counting_lookup(scope, name, current_scope_only=False):
+        nonlocal lookups
+        lookups += 1
+        return original_lookup(scope, name, current_scope_only)
+
+    Scope.lookup = counting_lookup
+    try:
+        IRCodeGenerator(symtable).generate(ast)
+    finally:
+        Scope.lookup = original_lookup
+
+    checker = best_of(args.repeat, check)
+    generator = best_of(args.repeat, lambda: IRCodeGenerator(symtable).generate(ast))
+    print(f"referencias: {references}  profundidad: {args.depth}")
+    print(
+        f"Checker          {checker * 1000:8.1f} ms  "
+        f"{checker / references * 1e6:6.2f} µs/ref"
+    )
+    print(
+        f"IRCodeGenerator  {generator * 1000:8.1f} ms  "
+        f"{generator / references * 1e6:6.2f} µs/ref  Scope.lookup: {lookups}"
+    )
+
+
+if __name__ == "__main__":
+    main()
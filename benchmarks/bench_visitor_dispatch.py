@@ -0,0 +1,133 @@
+"""
+Costo por nodo del despacho de visitantes en Checker e IRCodeGenerator.
+
+Compara, sobre todos los nodos de un programa sintético, la búsqueda
+anterior (`getattr(self, f"_visit_{clase}")` más la comprobación de módulo e
+`isinstance` del checker) con la tabla clase→método de `NodeVisitor` y el
+indicador `typed`. También mide las dos pasadas completas.
+Uso: python -m benchmarks.bench_visitor_dispatch [--units N] [--repeat N]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import os
+import time
+
+from src.compiler.code_analyzer.checker import Checker
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.code_analyzer.parser import Parser
+from src.compiler.interpreter.ir_generator import IRCodeGenerator
+from src.compiler.shared.AST.grammar.assigment import Assignment
+from src.compiler.shared.AST.grammar.break_stmt import BreakStmt
+from src.compiler.shared.AST.grammar.continue_stmt import ContinueStmt
+from src.compiler.shared.AST.grammar.funcdecl import FuncDecl
+from src.compiler.shared.AST.grammar.if_stmt import IfStmt
+from src.compiler.shared.AST.grammar.parameters import Parameters
+from src.compiler.shared.AST.grammar.print_stmt import PrintStmt
+from src.compiler.shared.AST.grammar.program import Program
+from src.compiler.shared.AST.grammar.return_stmt import ReturnStmt
+from src.compiler.shared.AST.grammar.vardecl import VarDecl
+from src.compiler.shared.AST.grammar.while_stmt import WhileStmt
+from src.compiler.shared.AST.visitor import walk
+from .synthetic import write_program
+
+UNTYPED = (
+    Program,
+    VarDecl,
+    FuncDecl,
+    IfStmt,
+    WhileStmt,
+    BreakStmt,
+    ContinueStmt,
+    ReturnStmt,
+    PrintStmt,
+    Assignment,
+    Parameters,
+)
+
+
+def dispatch_by_name(visitor, nodes):
+    fallback = visitor._generic_visit
+    for node in nodes:
+        getattr(visitor, f"_visit_{node.__class__.__name__}", fallback)
+
+
+def dispatch_by_table(visitor, nodes):
+    handlers = visitor._handlers
+    for node in nodes:
+        handlers.get(node.__class__) or visitor._resolve_handler(node.__class__)
+
+
+def category_by_module(nodes):
+    for node in nodes:
+        (
+            hasattr(node, "__module__")
+            and "AST.grammar" in node.__module__
+            and not isinstance(node, UNTYPED)
+        )
+
+
+def category_by_flag(nodes):
+    for node in nodes:
+        node.typed
+
+
+def best_of(repeat, function, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            function(*args)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+
+def run_checker(ast):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Checker(ast).analyze()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gox-compiler: visitor dispatch")
+    parser.add_argument("--units", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    path = write_program(args.units)
+    try:
+        ast = Parser(Lexer(path).analyze()).analyze()
+    finally:
+        os.remove(path)
+    nodes = list(walk(ast))
+    symtable = run_checker(ast)
+    count = len(nodes)
+    print(f"nodos: {count}")
+    print(f"{'despacho (ns/nodo)':<28}{'getattr':>10}{'tabla':>10}")
+    for name, visitor in (
+        ("Checker", Checker(ast)),
+        ("IRCodeGenerator", IRCodeGenerator(symtable)),
+    ):
+        by_name = best_of(args.repeat, dispatch_by_name, visitor, nodes)
+        by_table = best_of(args.repeat, dispatch_by_table, visitor, nodes)
+        print(f"{name:<28}{by_name / count * 1e9:>10.1f}{by_table / count * 1e9:>10.1f}")
+    by_module = best_of(args.repeat, category_by_module, nodes)
+    by_flag = best_of(args.repeat, category_by_flag, nodes)
+    print(
+        f"{'categoría (Checker)':<28}{by_module / count * 1e9:>10.1f}"
+        f"{by_flag / count * 1e9:>10.1f}"
+    )
+    checker = best_of(args.repeat, run_checker, ast)
+    generator = best_of(args.repeat, lambda: IRCodeGenerator(symtable).generate(ast))
+    print(
+        f"pasada completa (µs/nodo): Checker {checker / count * 1e6:.2f}, "
+        f"IRCodeGenerator {generator / count * 1e6:.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
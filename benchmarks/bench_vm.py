@@ -0,0 +1,55 @@
+"""
+Tiempos de ejecución del VM sobre los programas de `code/`.
+
+Uso: python -m benchmarks.bench_vm [--repeat N] [archivos.gox ...]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.code_analyzer.parser import Parser
+from src.compiler.code_analyzer.checker import Checker
+from src.compiler.interpreter.ir_generator import IRCodeGenerator
+from src.compiler.interpreter.vm import VirtualMachine
+
+DEFAULT_PROGRAMS = ["code/fib.gox", "code/mandel.gox"]
+
+
+def build_module(path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        tokens = Lexer(path).analyze()
+        ast = Parser(tokens).analyze()
+        symtable = Checker(ast).analyze()
+        return IRCodeGenerator(symtable).generate(ast)
+
+
+def time_program(path, repeat):
+    module = build_module(path)
+    load_times, run_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        vm = VirtualMachine(module, stdout=io.StringIO())
+        loaded = time.perf_counter()
+        vm.run()
+        finished = time.perf_counter()
+        load_times.append(loaded - start)
+        run_times.append(finished - loaded)
+    return min(load_times), min(run_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gox-compiler: VM benchmark")
+    parser.add_argument("programs", nargs="*", default=DEFAULT_PROGRAMS)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(f"{'programa':<24}{'carga (ms)':>12}{'ejecución (ms)':>16}")
+    for path in args.programs:
+        load, run = time_program(path, args.repeat)
+        print(f"{path:<24}{load * 1000:>12.3f}{run * 1000:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Cuenta las instrucciones IR que ejecuta cada programa, sin optimizar, con
+todas las optimizaciones menos las de `--skip` y con todas.
+
+Para contar sin tocar el VM, cada bloque básico (`ControlFlowGraph`) recibe
+al empezar un contador en una global propia (`GLOBAL_GET; CONSTI 1; ADDI;
+GLOBAL_SET`, sin efecto en la pila). Al terminar, las instrucciones
+ejecutadas son la suma de veces que corrió cada bloque por su tamaño; las
+etiquetas LOOP y ENDIF no cuentan porque el VM no las ejecuta.
+Uso: python -m benchmarks.dynamic_counts [--skip PASE] ... [archivos ...]
+"""
+
+import argparse
+import io
+import os
+
+from src.compiler.api import CompilationOptions, compile_file
+from src.compiler.interpreter.errors.vm import VMRuntimeError
+from src.compiler.interpreter.ir_generator import IRGlobal
+from src.compiler.interpreter.vm import VirtualMachine
+from src.compiler.optimizer.cfg import ControlFlowGraph
+
+CODE_DIR = os.path.join(os.path.dirname(__file__), "..", "code")
+DEFAULT_PROGRAMS = ["mandel.gox", "mandelplot.gox"]
+_LABELS = ("LOOP", "ENDIF")
+
+
+def instrument(module):
+    """Agrega los contadores y devuelve [(global, instrucciones del bloque)]."""
+    counters = []
+    for function in list(module.functions.values()):
+        if function.imported:
+            continue
+        cfg = ControlFlowGraph.from_function(function)
+        for block in cfg.blocks:
+            size = sum(1 for instruction in block.instructions if instruction[0] not in _LABELS)
+            if not size:
+                continue
+            name = f"$count_{function.name}_{block.index}"
+            module.globals[name] = IRGlobal(name, "I")
+            counters.append((name, size))
+            labels = 1 if block.instructions[0][0] in _LABELS else 0
+            block.instructions[labels:labels] = [
+                ("GLOBAL_GET", name),
+                ("CONSTI", 1),
+                ("ADDI",),
+                ("GLOBAL_SET", name),
+            ]
+        function.code = cfg.lower()
+    return counters
+
+
+def count_instructions(path, options):
+    """Instrucciones IR ejecutadas, o el motivo por el que no se pudo."""
+    result = compile_file(path, options)
+    if result.ircode is None:
+        return f"falla en {result.failed_phase}"
+    counters = instrument(result.ircode)
+    vm = VirtualMachine(result.ircode, stdout=io.StringIO())
+    try:
+        vm.run()
+    except VMRuntimeError as error:
+        return f"falla en run: {error.message}"
+    return sum(vm.globals[vm.global_slots[name]] * size for name, size in counters)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gox-compiler: instrucciones ejecutadas")
+    parser.add_argument("programs", nargs="*", default=DEFAULT_PROGRAMS)
+    parser.add_argument(
+        "--skip", action="append", metavar="PASE", help="se puede repetir; por defecto cse"
+    )
+    args = parser.parse_args()
+    skip = args.skip or ["cse"]
+
+    configurations = [
+        ("sin optimizar", CompilationOptions(optimize=False)),
+        (f"sin {','.join(skip)}", CompilationOptions(skip_passes=skip)),
+        ("optimizado", CompilationOptions()),
+    ]
+    print(f"{'programa':<22}" + "".join(f"{name:>18}" for name, _ in configurations))
+    for program in args.programs:
+        path = program if os.path.exists(program) else os.path.join(CODE_DIR, program)
+        counts = [count_instructions(path, options) for _, options in configurations]
+        row = f"{os.path.basename(path):<22}"
+        if all(isinstance(count, int) for count in counts):
+            row += "".join(f"{count:>18}" for count in counts)
+        else:
+            row += f"  {next(count for count in counts if isinstance(count, str))}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
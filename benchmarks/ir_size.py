@@ -0,0 +1,57 @@
+"""
+Reporte de tamaño del IR de cada `code/*.gox`: instrucciones sin optimizar,
+después del plegado de constantes y después de cada optimización de
+`IR_PASSES`, y cuántas veces aplicó cada regla peephole en total.
+Uso: python -m benchmarks.ir_size [archivos ...]
+"""
+
+import glob
+import os
+import sys
+
+from src.compiler.api import IR_PASSES, CompilationOptions, compile_file
+
+CODE_DIR = os.path.join(os.path.dirname(__file__), "..", "code")
+
+
+def ir_sizes(path):
+    """([sin optimizar, plegado, *IR_PASSES], hits); `None` si no llega al IR."""
+    plain = compile_file(path, CompilationOptions(optimize=False, time_passes=True))
+    optimized = compile_file(path, CompilationOptions(time_passes=True))
+    if plain.ircode is None or optimized.ircode is None:
+        return None
+    sizes = {stats.name: stats.size for stats in optimized.passes}
+    baseline = {stats.name: stats.size for stats in plain.passes}["ir"]
+    counts = [baseline, sizes["ir"]] + [sizes[name] for name, _ in IR_PASSES]
+    return counts, optimized.peephole_hits
+
+
+def main():
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join(CODE_DIR, "*.gox")))
+    columns = ["sin opt.", "plegado"] + [name for name, _ in IR_PASSES]
+    print(f"{'programa':<22}" + "".join(f"{column:>10}" for column in columns) + f"{'reducción':>11}")
+    totals = [0] * len(columns)
+    hits = {}
+    for path in paths:
+        name = os.path.basename(path)
+        sizes = ir_sizes(path)
+        if sizes is None:
+            print(f"{name:<22}{'(no compila)':>{10 * len(columns) + 1}}")
+            continue
+        counts, file_hits = sizes
+        for position, count in enumerate(counts):
+            totals[position] += count
+        for rule_name, count in file_hits.items():
+            hits[rule_name] = hits.get(rule_name, 0) + count
+        reduction = (1 - counts[-1] / counts[0]) * 100 if counts[0] else 0.0
+        print(f"{name:<22}" + "".join(f"{count:>10}" for count in counts) + f"{reduction:>10.1f}%")
+    reduction = (1 - totals[-1] / totals[0]) * 100 if totals[0] else 0.0
+    print(f"{'total':<22}" + "".join(f"{count:>10}" for count in totals) + f"{reduction:>10.1f}%")
+    print()
+    print(f"{'regla peephole':<22}{'aplicaciones':>14}")
+    for rule_name, count in hits.items():
+        print(f"{rule_name:<22}{count:>14}")
+
+
+if __name__ == "__main__":
+    main()
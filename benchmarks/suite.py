@@ -0,0 +1,132 @@
+"""
+Suite de benchmarks del compilador.
+
+Compila (y ejecuta, si llega a generar IR) cada `code/*.gox` y programas
+sintéticos de 10, 100 y 1000 unidades (`synthetic.generate_program`), con
+la API `compile_file`. Para cada caso guarda el mejor tiempo de reloj de
+cada fase (read, lexer, parser, checker, fold, ir, las optimizaciones de
+`IR_PASSES` y run) sobre `--repeat` repeticiones.
+
+Con `--save` los resultados se escriben como JSON y sirven de línea base;
+con `--baseline` se comparan contra una línea base anterior y el proceso
+termina con código 1 si alguna fase empeora más de `--threshold` (fracción)
+y más de `--min-time` segundos.
+Uso: python -m benchmarks.suite [--repeat N] [--scales N ...] [--no-run]
+     [--save RUTA] [--baseline RUTA] [--threshold F] [--min-time S]
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+
+from src.compiler.api import IR_PASSES, CompilationOptions, compile_file
+from .synthetic import write_program
+
+CODE_DIR = os.path.join(os.path.dirname(__file__), "..", "code")
+DEFAULT_SCALES = [10, 100, 1000]
+
+
+def iter_cases(scales):
+    """Genera (nombre, ruta, generado); cada sintético se escribe al pedirlo."""
+    for path in sorted(glob.glob(os.path.join(CODE_DIR, "*.gox"))):
+        yield f"code/{os.path.basename(path)}", path, False
+    for scale in scales:
+        yield f"synthetic/{scale}x", write_program(scale), True
+
+
+def measure(path, repeat, run):
+    best = {}
+    result = None
+    for _ in range(repeat):
+        result = compile_file(path, CompilationOptions(run=run))
+        for name, seconds in result.timings.items():
+            best[name] = min(seconds, best.get(name, seconds))
+    return {"ok": result.ok, "failed_phase": result.failed_phase, "phases": best}
+
+
+def compare(baseline, current, threshold, min_time):
+    """Lista de (caso, fase, antes, ahora) para las fases que empeoraron."""
+    regressions = []
+    for case, measured in current["cases"].items():
+        previous = baseline["cases"].get(case)
+        if previous is None:
+            continue
+        for phase, seconds in measured["phases"].items():
+            before = previous["phases"].get(phase)
+            if before is None:
+                continue
+            if seconds > before * (1 + threshold) and seconds - before > min_time:
+                regressions.append((case, phase, before, seconds))
+    return regressions
+
+
+def print_results(results, baseline):
+    phases = ["read", "lexer", "parser", "checker", "fold", "ir"]
+    phases += [name for name, _ in IR_PASSES] + ["run"]
+    print(f"{'caso (ms)':<24}" + "".join(f"{phase:>14}" for phase in phases))
+    for case, measured in results["cases"].items():
+        row = f"{case:<24}"
+        previous = baseline["cases"].get(case, {}).get("phases", {}) if baseline else {}
+        for phase in phases:
+            seconds = measured["phases"].get(phase)
+            if seconds is None:
+                row += f"{'-':>14}"
+                continue
+            cell = f"{seconds * 1000:.2f}"
+            if phase in previous and previous[phase] > 0:
+                cell += f"{(seconds / previous[phase] - 1) * 100:+.0f}%"
+            row += f"{cell:>14}"
+        if not measured["ok"]:
+            row += f"  (falla en {measured['failed_phase']})"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gox-compiler: benchmark suite")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scales", type=int, nargs="*", default=DEFAULT_SCALES)
+    parser.add_argument("--no-run", action="store_true", help="no ejecutar los programas")
+    parser.add_argument("--save", metavar="RUTA")
+    parser.add_argument("--baseline", metavar="RUTA")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--min-time", type=float, default=0.001)
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    results = {
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "cases": {},
+    }
+    for name, path, generated in iter_cases(args.scales):
+        try:
+            results["cases"][name] = measure(path, args.repeat, not args.no_run)
+        finally:
+            if generated:
+                os.remove(path)
+
+    print_results(results, baseline)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if baseline:
+        regressions = compare(baseline, results, args.threshold, args.min_time)
+        for case, phase, before, seconds in regressions:
+            print(
+                f"REGRESIÓN {case} {phase}: {before * 1000:.2f} ms -> "
+                f"{seconds * 1000:.2f} ms"
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Generador de programas GOX sintéticos para los benchmarks.
+
+Cada unidad declara globales propias y una función con bucles, condicionales,
+llamadas y expresiones mixtas int/float, de modo que el programa resultante
+pasa por todas las fases del compilador sin errores.
+"""
+
+import os
+import tempfile
+
+UNIT_TEMPLATE = """\
+var v{i} int = {i};
+var f{i} float = {i}.5;
+func fn{i}(a int, b float) float {{
+    var t float = b * 2.0 + float(a);
+    while a > 0 {{
+        if a / 2 * 2 == a {{
+            t = t - 1.0;
+        }} else {{
+            t = t + b / 3.0;
+        }}
+        a = a - 1;
+    }}
+    return t;
+}}
+v{i} = v{i} + int(fn{i}(3, f{i}));
+"""
+
+
+def generate_program(units: int) -> str:
+    return "".join(UNIT_TEMPLATE.format(i=i) for i in range(units))
+
+
+def write_program(units: int, directory: str | None = None) -> str:
+    """Escribe un programa de `units` unidades y devuelve la ruta del archivo."""
+    handle, path = tempfile.mkstemp(suffix=".gox", dir=directory)
+    with os.fdopen(handle, "w", encoding="utf-8") as file:
+        file.write(generate_program(units))
+    return path
@@ -0,0 +1,340 @@
+"""
+Compilación como biblioteca: `compile_source(texto, opciones)` y
+`compile_file(ruta, opciones)` ejecutan las fases y devuelven un
+`CompilationResult` con tokens, AST, tabla de símbolos, módulo IR,
+diagnósticos y métricas por fase. No escriben en stdout ni guardan estado
+entre llamadas, así que se pueden invocar muchas veces en el mismo proceso.
+"""
+
+import io
+import time
+import tracemalloc
+
+from .code_analyzer.lexer import Lexer
+from .code_analyzer.errors.lexer import LexerAbort
+from .code_analyzer.parser import Parser
+from .code_analyzer.checker import Checker
+from .shared.AST.arena import ASTArena
+from .shared.AST.visitor import walk
+from .interpreter.ir_generator import IRCodeGenerator
+from .interpreter.vm import VirtualMachine
+from .interpreter.errors.vm import VMRuntimeError
+from .optimizer.constant_folding import ConstantFolder
+from .optimizer.cse import CommonSubexpressionEliminator
+from .optimizer.dead_code import DeadCodeEliminator
+from .optimizer.licm import LoopInvariantCodeMotion
+from .optimizer.peephole import PeepholeOptimizer
+
+# Optimizaciones sobre el IR, en orden de ejecución.
+IR_PASSES = [
+    ("peephole", PeepholeOptimizer),
+    ("dce", DeadCodeEliminator),
+    ("licm", LoopInvariantCodeMotion),
+    ("cse", CommonSubexpressionEliminator),
+]
+
+
+class CompilationOptions:
+    """
+    - `keep_tokens`: guarda la lista de tokens en el resultado. Con `False`
+      el parser consume el lexer a demanda (`Lexer.iter_tokens`) y la fase
+      del lexer queda incluida en la del parser.
+    - `use_mmap`: en `compile_file`, analiza el archivo mapeado en memoria.
+    - `use_arena`: el checker y el generador recorren las vistas de un
+      `ASTArena`.
+    - `run`: ejecuta el módulo en la VM; la salida del programa queda en
+      `CompilationResult.output`.
+    - `optimize`: aplica las optimizaciones: el plegado de constantes
+      ("fold") antes de generar el IR y luego las de `IR_PASSES`. Con
+      `use_arena` el plegado no se aplica, porque las vistas del arena son
+      de solo lectura.
+    - `skip_passes`: nombres de optimizaciones que no se aplican, para
+      comparar el efecto de cada una.
+    - `time_passes`: además de los tiempos, mide el pico de memoria de cada
+      fase con `tracemalloc` y el tamaño de lo que produce (tokens, nodos,
+      símbolos, instrucciones). `tracemalloc` hace más lentas las fases.
+    """
+
+    def __init__(
+        self,
+        keep_tokens=True,
+        use_mmap=False,
+        use_arena=False,
+        run=False,
+        time_passes=False,
+        optimize=True,
+        skip_passes=(),
+    ):
+        self.keep_tokens = keep_tokens
+        self.use_mmap = use_mmap
+        self.use_arena = use_arena
+        self.run = run
+        self.time_passes = time_passes
+        self.optimize = optimize
+        self.skip_passes = frozenset(skip_passes)
+
+
+class Diagnostic:
+    def __init__(self, phase, message, line=None, column=None, error=None):
+        self.phase = phase
+        self.message = message
+        self.line = line
+        self.column = column
+        # El error tal como lo produjo la fase, para imprimirlo con su tabla.
+        self.error = error
+
+    def __repr__(self):
+        return (
+            f"Diagnostic({self.phase!r}, {self.message!r}, "
+            f"line={self.line!r}, column={self.column!r})"
+        )
+
+
+class PassStats:
+    """
+    Métricas de una fase. `peak_memory` (bytes asignados por encima de lo
+    que había al empezar) y `size` solo se miden con `time_passes`.
+    """
+
+    def __init__(self, name, wall, cpu, peak_memory=None, size=None, unit=None):
+        self.name = name
+        self.wall = wall
+        self.cpu = cpu
+        self.peak_memory = peak_memory
+        self.size = size
+        self.unit = unit
+
+    def to_dict(self):
+        return {
+            "pass": self.name,
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "peak_memory": self.peak_memory,
+            "size": self.size,
+            "unit": self.unit,
+        }
+
+    def __repr__(self):
+        return f"PassStats({self.name!r}, wall={self.wall:.6f}, cpu={self.cpu:.6f})"
+
+
+class CompilationResult:
+    def __init__(self, options):
+        self.options = options
+        self.tokens = None
+        self.ast = None
+        self.symtable = None
+        self.ircode = None
+        self.output = None
+        # Nombre de cada optimización del IR aplicada -> su optimizador.
+        self.optimizers = {}
+        self.diagnostics = []
+        # Una entrada por fase ejecutada, en orden.
+        self.passes = []
+
+    @property
+    def ok(self):
+        return not self.diagnostics
+
+    @property
+    def failed_phase(self):
+        return self.diagnostics[0].phase if self.diagnostics else None
+
+    @property
+    def peephole_hits(self):
+        """Aplicaciones de cada regla peephole, si se aplicó esa optimización."""
+        optimizer = self.optimizers.get("peephole")
+        return optimizer.hits if optimizer else None
+
+    @property
+    def timings(self):
+        """Segundos de reloj por fase."""
+        return {stats.name: stats.wall for stats in self.passes}
+
+    def errors(self, phase):
+        """Los errores originales de `phase`, en el formato de su clase de error."""
+        return [diagnostic.error for diagnostic in self.diagnostics if diagnostic.phase == phase]
+
+    def passes_to_dict(self):
+        return [stats.to_dict() for stats in self.passes]
+
+
+class PassClock:
+    """
+    Mide una fase a la vez: `start()` y luego `stop(nombre)`, que
+    devuelve el `PassStats`. Con `trace_memory` arranca `tracemalloc` si
+    nadie lo había hecho y lo detiene en `close()`.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self._owns_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+
+    def start(self):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            self._base_memory = tracemalloc.get_traced_memory()[0]
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+
+    def stop(self, name):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        peak_memory = None
+        if self.trace_memory:
+            peak_memory = tracemalloc.get_traced_memory()[1] - self._base_memory
+        return PassStats(name, wall, cpu, peak_memory)
+
+    def close(self):
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+
+def compile_source(text, options=None):
+    return _compile(lambda: Lexer(source=text), options or CompilationOptions())
+
+
+def compile_file(path, options=None):
+    options = options or CompilationOptions()
+    return _compile(lambda: Lexer(path, use_mmap=options.use_mmap), options)
+
+
+def _compile(make_lexer, options):
+    result = CompilationResult(options)
+    clock = PassClock(trace_memory=options.time_passes)
+    try:
+        _run_passes(make_lexer, result, clock)
+    finally:
+        clock.close()
+    return result
+
+
+def _run_passes(make_lexer, result, clock):
+    options = result.options
+
+    clock.start()
+    lexer = make_lexer()
+    _record(result, clock, "read", lambda: len(lexer.file_content), "chars")
+    if not _parse(lexer, result, clock):
+        return
+
+    clock.start()
+    checker = Checker(result.ast)
+    result.symtable = checker.analyze(report_errors=False)
+    _record(result, clock, "checker", lambda: _count_symbols(result.symtable), "symbols")
+    if not result.symtable:
+        result.diagnostics.extend(
+            Diagnostic("checker", message, _position(line), _position(column), error)
+            for (line, column, message), error in zip(checker.diagnostics, checker.errors)
+        )
+        return
+
+    if options.optimize and not options.use_arena and "fold" not in options.skip_passes:
+        clock.start()
+        folder = ConstantFolder()
+        folded = folder.fold(result.ast)
+        _record(result, clock, "fold", lambda: folder.folded, "folds")
+        if not folded:
+            result.diagnostics.extend(
+                Diagnostic("fold", message, _position(line), _position(column), error)
+                for (line, column, message), error in zip(folder.diagnostics, folder.errors)
+            )
+            return
+
+    clock.start()
+    result.ircode = IRCodeGenerator(result.symtable).generate(result.ast)
+    _record(
+        result, clock, "ir", lambda: _count_instructions(result.ircode), "instructions"
+    )
+
+    if options.optimize:
+        for name, optimizer_class in IR_PASSES:
+            if name in options.skip_passes:
+                continue
+            clock.start()
+            optimizer = optimizer_class()
+            optimizer.optimize_module(result.ircode)
+            result.optimizers[name] = optimizer
+            _record(
+                result, clock, name, lambda: _count_instructions(result.ircode), "instructions"
+            )
+
+    if options.run:
+        clock.start()
+        output = io.StringIO()
+        try:
+            VirtualMachine(result.ircode, stdout=output).run()
+        except VMRuntimeError as error:
+            result.diagnostics.append(Diagnostic("run", error.message, error=error))
+        result.output = output.getvalue()
+        _record(result, clock, "run", lambda: len(result.output), "chars")
+
+
+def _parse(lexer, result, clock):
+    options = result.options
+    if options.keep_tokens:
+        clock.start()
+        result.tokens = lexer.analyze(report_errors=False)
+        _record(result, clock, "lexer", lambda: len(result.tokens or ()), "tokens")
+        if result.tokens is None:
+            _add_lexer_diagnostics(result, lexer.errors)
+            return False
+        tokens = result.tokens
+    else:
+        tokens = lexer.iter_tokens(report_errors=False)
+
+    clock.start()
+    parser = Parser(tokens)
+    try:
+        result.ast = parser.analyze(report_errors=False)
+    except LexerAbort as abort:
+        _record(result, clock, "parser")
+        _add_lexer_diagnostics(result, abort.errors)
+        return False
+    if result.ast and options.use_arena:
+        result.ast = ASTArena.from_ast(result.ast).root
+    _record(result, clock, "parser", lambda: _count_nodes(result.ast), "nodes")
+    if not result.ast:
+        result.diagnostics.extend(
+            Diagnostic("parser", message, token.line, token.column, (token, message))
+            for token, message in parser.errors
+        )
+        return False
+    return True
+
+
+def _record(result, clock, name, count=None, unit=None):
+    # El tamaño se cuenta después de detener el reloj, fuera de la medición.
+    stats = clock.stop(name)
+    if result.options.time_passes and count is not None:
+        stats.size = count()
+        stats.unit = unit
+    result.passes.append(stats)
+
+
+def _add_lexer_diagnostics(result, errors):
+    result.diagnostics.extend(
+        Diagnostic("lexer", message, token.line, token.column, (token, message))
+        for token, message in errors
+    )
+
+
+def _count_nodes(ast):
+    return sum(1 for _ in walk(ast)) if ast else 0
+
+
+def _count_symbols(symtable):
+    if not symtable:
+        return 0
+    return sum(len(scope.symbols) for scope, _ in symtable.iter_scopes())
+
+
+def _count_instructions(module):
+    return sum(len(function.code) for function in module.functions.values())
+
+
+def _position(value):
+    return int(value) if str(value).isdigit() else None
@@ -1,6 +1,6 @@
+from types import GeneratorType
 from typing import Type
 from .errors.checker import CheckerError
-from .helpers.check import SymbolTablePrinter
 from ..shared.AST.grammar.program import Program
 from ..shared.AST.grammar.assigment import Assignment
 from ..shared.AST.grammar.vardecl import VarDecl
@@ -19,16 +19,21 @@ from ..shared.AST.grammar.identifier_location import IdentifierLocation
 from ..shared.AST.grammar.dereference_location import DereferenceLocation
 from ..shared.AST.grammar.function_call import FunctionCall
 from ..shared.AST.grammar.cast import Cast
+from ..shared.AST.visitor import NodeVisitor, iter_child_nodes
 from ..shared.grammar.gox_token import Token
-from ..shared.symtable.symbol import Symbol, SymbolKind
+from ..shared.symtable.symbol import StorageClass, Symbol, SymbolKind
 from ..shared.symtable.symtable import SymbolTable
 
-class Checker:
+class Checker(NodeVisitor):
     def __init__(self, ast):
         self.ast = ast
         self.symbol_table = SymbolTable()
         self.errors = []
+        # (línea, columna, mensaje) de cada error, para quien no imprime la tabla.
+        self.diagnostics = []
         self.expected_deref_type: str | None = None
+        self._global_slots = {}
+        self._local_slots = None
 
     def _get_node_location(self, node_or_token) -> tuple[str, str]:
         line, col = "N/A", "N/A"
@@ -60,64 +65,95 @@ class Checker:
         line, col = self._get_node_location(node_or_token_for_loc)
         full_message = f"Error Semántico (Línea {line}, Col {col}): {message}"
         self.errors.append(full_message)
+        self.diagnostics.append((line, col, message))
 
-    def analyze(self):
+    def analyze(self, report_errors=True):
         self.errors = []
+        self.diagnostics = []
         self.symbol_table = SymbolTable()
+        self._global_slots = {}
+        self._local_slots = None
         self._visit(self.ast)
         if self.errors:
-            return CheckerError(self.errors).print_errors()
-        SymbolTablePrinter(self.symbol_table).print_table()
+            return CheckerError(self.errors).print_errors() if report_errors else None
         return self.symbol_table
 
     def _visit(
         self, node, expected_type_hint: str | None = None
     ):
-        if node is None:
-            return None
-        previous_expected_deref_type = self.expected_deref_type
-        if expected_type_hint:
-            self.expected_deref_type = expected_type_hint
-        method_name = f"_visit_{node.__class__.__name__}"
-        visitor = getattr(self, method_name, self._generic_visit)
-        result_type = visitor(node)
+        """
+        Recorre `node` sin recursión en Python. Los visitantes que necesitan
+        visitar hijos son generadores: hacen `yield hijo` (o `yield hijo,
+        pista_de_tipo`) y reciben el tipo resultante. Aquí se ejecutan con una
+        pila explícita, así que la profundidad del AST solo la limita la
+        memoria.
+        """
+        handlers = self._handlers
+        pending = []
+        while True:
+            if node is None:
+                result_type = None
+            else:
+                previous_expected_deref_type = self.expected_deref_type
+                if expected_type_hint:
+                    self.expected_deref_type = expected_type_hint
+                handler = handlers.get(node.__class__) or self._resolve_handler(
+                    node.__class__
+                )
+                result_type = handler(self, node)
+                if result_type.__class__ is GeneratorType:
+                    pending.append(
+                        (result_type, node, previous_expected_deref_type, expected_type_hint)
+                    )
+                    result_type = None
+                else:
+                    self._finish_visit(
+                        node, result_type, previous_expected_deref_type, expected_type_hint
+                    )
+            while pending:
+                visitor, parent, previous_expected_deref_type, hint = pending[-1]
+                try:
+                    request = visitor.send(result_type)
+                except StopIteration as stop:
+                    pending.pop()
+                    result_type = stop.value
+                    self._finish_visit(
+                        parent, result_type, previous_expected_deref_type, hint
+                    )
+                    continue
+                if request.__class__ is tuple:
+                    node, expected_type_hint = request
+                else:
+                    node, expected_type_hint = request, None
+                break
+            else:
+                return result_type
+
+    def _assign_storage(self, symbol):
+        """
+        Fuera de toda función la variable es global; dentro, es local de la
+        función. Los nombres repetidos comparten slot, igual que en
+        `IRFunction.locals`, que agrupa los locales por nombre.
+        """
+        if self._local_slots is None:
+            symbol.storage = StorageClass.GLOBAL
+            slots = self._global_slots
+        else:
+            symbol.storage = StorageClass.LOCAL
+            slots = self._local_slots
+        symbol.slot = slots.setdefault(symbol.name, len(slots))
+
+    def _finish_visit(
+        self, node, result_type, previous_expected_deref_type, expected_type_hint
+    ):
         if expected_type_hint:
             self.expected_deref_type = previous_expected_deref_type
-        if (
-            hasattr(node, "__module__")
-            and "AST.grammar" in node.__module__
-            and result_type is not None
-        ):
-            if not isinstance(
-                node,
-                (
-                    Program,
-                    VarDecl,
-                    FuncDecl,
-                    IfStmt,
-                    WhileStmt,
-                    BreakStmt,
-                    ContinueStmt,
-                    ReturnStmt,
-                    PrintStmt,
-                    Assignment,
-                    Parameters,
-                ),
-            ):
-                node.semantic_type = result_type
-        return result_type
+        if result_type is not None and node.typed:
+            node.semantic_type = result_type
 
     def _generic_visit(self, node):
-        for field_name, field_value in vars(node).items():
-            if isinstance(field_value, list):
-                for item in field_value:
-                    if hasattr(item, "__module__") and "AST.grammar" in item.__module__:
-                        self._visit(item)
-            elif (
-                hasattr(field_value, "__module__")
-                and "AST.grammar" in field_value.__module__
-            ):
-                self._visit(field_value)
+        for child in iter_child_nodes(node):
+            yield child
         return None
 
     def _visit_Program(self, node: Program):
@@ -125,7 +161,7 @@ class Checker:
         program_body_scope = self.symbol_table.global_scope
         node.program_body_semantic_scope = program_body_scope
         for stmt in node.statements:
-            self._visit(stmt)
+            yield stmt
 
     def _visit_VarDecl(self, node: VarDecl):
         var_name = node.identifier
@@ -134,9 +170,7 @@ class Checker:
             declared_type_str = None
         initializer_type = None
         if node.initializer:
-            initializer_type = self._visit(
-                node.initializer, expected_type_hint=declared_type_str
-            )
+            initializer_type = (yield node.initializer, declared_type_str)
         actual_type = None
         if declared_type_str:
             actual_type = declared_type_str
@@ -167,11 +201,12 @@ class Checker:
             var_name,
             symbol_kind,
             actual_type,
-            node=node.identifier_token if hasattr(node, "identifier_token") else node,
+            node=node.identifier_token or node,
         )
         symbol.initialized = (node.initializer is not None) or (
             symbol_kind == SymbolKind.CONSTANT
         )
+        self._assign_storage(symbol)
         node.defined_symbol = symbol
         if not self.symbol_table.current_scope.define(symbol):
             pass
@@ -180,13 +215,12 @@ class Checker:
         expected_type_for_rhs = None
         if isinstance(node.location, IdentifierLocation):
             var_symbol = self.symbol_table.current_scope.lookup(node.location.name)
+            node.location.referenced_symbol = var_symbol
             if var_symbol:
                 expected_type_for_rhs = var_symbol.type
         elif isinstance(node.location, DereferenceLocation):
             pass
-        expr_type = self._visit(
-            node.expression, expected_type_hint=expected_type_for_rhs
-        )
+        expr_type = (yield node.expression, expected_type_for_rhs)
         if expr_type is None:
             if isinstance(node.location, IdentifierLocation):
                 node.location.semantic_type = None
@@ -195,7 +229,7 @@ class Checker:
             return
         if isinstance(node.location, IdentifierLocation):
             var_name = node.location.name
-            symbol = self.symbol_table.current_scope.lookup(var_name)
+            symbol = node.location.referenced_symbol
             if not symbol:
                 self._add_error(
                     f"Asignación a variable no declarada '{var_name}'.", node.location
@@ -222,13 +256,11 @@ class Checker:
             node.location.referenced_symbol = symbol
         elif isinstance(node.location, DereferenceLocation):
             node.location.semantic_type = expr_type
-            self._visit(
-                node.location.expression, expected_type_hint="int"
-            )
+            yield node.location.expression, "int"
 
     def _visit_BinaryOp(self, node: BinaryOp):
-        left_type = self._visit(node.left)
-        right_type = self._visit(node.right)
+        left_type = (yield node.left)
+        right_type = (yield node.right)
         if (
             isinstance(node.left, DereferenceLocation)
             and node.left.semantic_type is None
@@ -262,9 +294,7 @@ class Checker:
 
     def _visit_UnaryOp(self, node: UnaryOp):
         expected_hint_for_operand = "int" if node.op == "^" else None
-        expr_type = self._visit(
-            node.expr, expected_type_hint=expected_hint_for_operand
-        )
+        expr_type = (yield node.expr, expected_hint_for_operand)
         if expr_type is None:
             node.semantic_type = None
             return None
@@ -322,7 +352,7 @@ class Checker:
         return symbol.type
 
     def _visit_DereferenceLocation(self, node: DereferenceLocation):
-        self._visit(node.expression, expected_type_hint="int")
+        yield node.expression, "int"
         if (
             not hasattr(node.expression, "semantic_type")
             or node.expression.semantic_type != "int"
@@ -372,7 +402,7 @@ class Checker:
             func_name,
             SymbolKind.FUNCTION,
             sym_type=declared_type_str,
-            node=node.id_token if hasattr(node, "id_token") else node,
+            node=node.id_token or node,
             params_info=params_info,
             return_type=declared_type_str,
             is_import=node.is_import,
@@ -388,7 +418,12 @@ class Checker:
             scope_name=f"<func_body_{func_name}>", current_function_symbol=func_symbol
         )
         node.body_semantic_scope = func_body_scope
+        previous_local_slots = self._local_slots
+        self._local_slots = {}
         for p_info in params_info:
+            # Los parámetros ocupan los primeros slots, en orden, como en
+            # `IRFunction.parmnames`, aunque su tipo no sea válido.
+            self._local_slots.setdefault(p_info["name"], len(self._local_slots))
             if p_info["type"]:
                 param_sym = Symbol(
                     p_info["name"],
@@ -396,10 +431,12 @@ class Checker:
                     p_info["type"],
                     node=p_info["node"],
                 )
+                self._assign_storage(param_sym)
                 self.symbol_table.current_scope.define(param_sym)
         for stmt in node.body:
-            self._visit(stmt)
+            yield stmt
         self.symbol_table.exit_scope()
+        self._local_slots = previous_local_slots
 
     def _visit_FunctionCall(self, node: FunctionCall):
         func_name = node.name
@@ -418,18 +455,14 @@ class Checker:
                     if i < len(func_symbol.params_info)
                     else None
                 )
-                passed_arg_type = self._visit(
-                    arg_expr_node, expected_type_hint=expected_param_type_for_arg
-                )
+                passed_arg_type = (yield arg_expr_node, expected_param_type_for_arg)
         node.semantic_type = (
             func_symbol.return_type
         )
         return func_symbol.return_type
 
     def _visit_IfStmt(self, node: IfStmt):
-        self._visit(
-            node.condition, expected_type_hint="bool"
-        )
+        yield node.condition, "bool"
         if (
             node.condition.semantic_type is not None
             and node.condition.semantic_type != "bool"
@@ -441,21 +474,19 @@ class Checker:
         then_scope = self.symbol_table.enter_scope(scope_name="<if_then_block>")
         node.then_block_semantic_scope = then_scope
         for stmt in node.then_block:
-            self._visit(stmt)
+            yield stmt
         self.symbol_table.exit_scope()
         if node.else_block:
             else_scope = self.symbol_table.enter_scope(scope_name="<if_else_block>")
             node.else_block_semantic_scope = else_scope
             for stmt in node.else_block:
-                self._visit(stmt)
+                yield stmt
             self.symbol_table.exit_scope()
         else:
             node.else_block_semantic_scope = None
 
     def _visit_WhileStmt(self, node: WhileStmt):
-        self._visit(
-            node.condition, expected_type_hint="bool"
-        )
+        yield node.condition, "bool"
         if (
             node.condition.semantic_type is not None
             and node.condition.semantic_type != "bool"
@@ -469,21 +500,17 @@ class Checker:
         )
         node.body_semantic_scope = body_scope
         for stmt in node.body:
-            self._visit(stmt)
+            yield stmt
         self.symbol_table.exit_scope()
 
     def _visit_ReturnStmt(self, node: ReturnStmt):
         current_func_sym = self.symbol_table.current_scope.get_current_function_symbol()
         if not current_func_sym:
-            self._visit(
-                node.expression
-            )
+            yield node.expression
             return
         current_func_sym.has_return_statement = True
         expected_return_type = current_func_sym.return_type
-        returned_expr_type = self._visit(
-            node.expression, expected_type_hint=expected_return_type
-        )
+        returned_expr_type = (yield node.expression, expected_return_type)
         if returned_expr_type is None:
             return
         if expected_return_type is None:
@@ -494,9 +521,7 @@ class Checker:
             self._add_error(f"...", node.expression)
 
     def _visit_PrintStmt(self, node: PrintStmt):
-        expr_type = self._visit(
-            node.expression
-        )
+        expr_type = (yield node.expression)
         if expr_type is None:
             return
         allowed_print_types = {"int", "float", "char", "bool"}
@@ -511,12 +536,10 @@ class Checker:
             target_type_str not in self.symbol_table.valid_types
             or target_type_str == "void"
         ):
-            self._visit(node.expression)
+            yield node.expression
             node.semantic_type = None
             return None
-        source_expr_type = self._visit(
-            node.expression
-        )
+        source_expr_type = (yield node.expression)
         if source_expr_type is None:
             node.semantic_type = None
             return None
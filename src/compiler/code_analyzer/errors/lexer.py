@@ -2,6 +2,18 @@ from prettytable import PrettyTable
 from colorama import Fore, Style
 
 
+class LexerAbort(Exception):
+    """
+    Lo lanza `Lexer.iter_tokens` cuando hubo errores léxicos: corta el
+    análisis de quien consume el flujo (el parser) después de imprimir la
+    tabla de errores, igual que `Lexer.analyze` detiene la compilación.
+    """
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} errores léxicos")
+        self.errors = errors
+
+
 class LexerError:
     def __init__(self, errors):
         self.errors = errors
@@ -5,6 +5,10 @@ from ...shared.symtable.symbol import Symbol, SymbolKind
 
 colorama_init(autoreset=True)
 
+# La sangría deja de crecer a partir de esta profundidad: con miles de bloques
+# anidados la salida crecería de forma cuadrática.
+MAX_INDENT_DEPTH = 32
+
 
 class SymbolTablePrinter:
     def __init__(self, symbol_table: SymbolTable):
@@ -14,11 +18,12 @@ class SymbolTablePrinter:
         print(Style.BRIGHT + Fore.CYAN + "=" * 70)
         print(Style.BRIGHT + Fore.CYAN + "TABLA DE SÍMBOLOS COMPLETA".center(70))
         print(Style.BRIGHT + Fore.CYAN + "=" * 70)
-        self._print_scope_recursively(self.symbol_table.global_scope, 0)
+        for scope, depth in self.symbol_table.iter_scopes():
+            self._print_scope(scope, depth)
         print(Style.BRIGHT + Fore.CYAN + "=" * 70)
 
-    def _print_scope_recursively(self, scope: Scope, depth: int):
-        indent_str = "  " * depth
+    def _print_scope(self, scope: Scope, depth: int):
+        indent_str = "  " * min(depth, MAX_INDENT_DEPTH)
 
         scope_display_name = scope.scope_name
         scope_color = Fore.YELLOW
@@ -113,10 +118,6 @@ class SymbolTablePrinter:
             )
             print(indented_table_string)
 
-        for child_scope in scope.children_scopes:
-            self._print_scope_recursively(child_scope, depth + 1)
-
-
     def _format_symbol_type(self, symbol: Symbol) -> str:
         if symbol.kind == SymbolKind.FUNCTION:
             param_types_str = []
@@ -1,34 +1,26 @@
-from ...shared.grammar.gox_token import Token
+from ...shared.grammar.gox_token import Token, TokenKind, TYPE_KINDS
 
 
 class ParserHelper:
     @staticmethod
-    def peek_token(parser):
-        if parser.tokens:
-            return parser.tokens[0]
-        else:
-            return None
+    def peek_token(parser, k=1):
+        return parser.tokens.peek(k)
 
     @staticmethod
     def expect(parser, token_type):
-        if parser.current_token and parser.current_token.type == token_type:
-            value = parser.current_token.value
-            parser.next_token()
-            return value
+        token = parser.current_token
+        if token and token.kind == token_type:
+            parser.current_token = parser.tokens.advance()
+            return token.value
         else:
             ParserHelper.error(
                 parser,
-                f"Se esperaba el token {token_type}, pero se obtuvo {parser.current_token}",
+                f"Se esperaba el token {TokenKind(token_type).name}, pero se obtuvo {parser.current_token}",
             )
 
     @staticmethod
     def expect_type(parser):
-        if parser.current_token and parser.current_token.type in (
-            "INT",
-            "FLOAT_TYPE",
-            "CHAR_TYPE",
-            "BOOL",
-        ):
+        if parser.current_token and parser.current_token.kind in TYPE_KINDS:
             value = parser.current_token.value
             parser.next_token()
             return value
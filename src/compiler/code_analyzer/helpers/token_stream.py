@@ -0,0 +1,74 @@
+from collections import deque
+from typing import Iterable
+
+from ...shared.grammar.gox_token import Token
+
+
+class TokenStream:
+    """
+    Cursor sobre la lista de tokens del lexer.
+
+    Avanzar y mirar por adelantado son O(1): la lista nunca se modifica, solo
+    se mueve el índice `position`.
+    """
+
+    def __init__(self, tokens: list[Token]):
+        self.tokens = tokens
+        self.position = 0
+
+    def advance(self) -> Token | None:
+        """Devuelve el siguiente token y mueve el cursor, o None al final."""
+        position = self.position
+        if position < len(self.tokens):
+            self.position = position + 1
+            return self.tokens[position]
+        return None
+
+    def peek(self, k: int = 1) -> Token | None:
+        """Devuelve el k-ésimo token pendiente sin consumirlo (k >= 1)."""
+        index = self.position + k - 1
+        if index < len(self.tokens):
+            return self.tokens[index]
+        return None
+
+    def __len__(self):
+        return len(self.tokens) - self.position
+
+    def __bool__(self):
+        return self.position < len(self.tokens)
+
+
+class LazyTokenStream:
+    """
+    Misma interfaz que TokenStream, pero tira de un iterador (por ejemplo
+    `Lexer.iter_tokens()`). Solo se guardan los tokens pedidos con `peek`
+    que aún no se han consumido.
+    """
+
+    def __init__(self, tokens: Iterable[Token]):
+        self.source = iter(tokens)
+        self.lookahead = deque()
+
+    def advance(self) -> Token | None:
+        """Devuelve el siguiente token, o None cuando el iterador se agota."""
+        if self.lookahead:
+            return self.lookahead.popleft()
+        return next(self.source, None)
+
+    def peek(self, k: int = 1) -> Token | None:
+        """Devuelve el k-ésimo token pendiente sin consumirlo (k >= 1)."""
+        if self._fill(k):
+            return self.lookahead[k - 1]
+        return None
+
+    def _fill(self, k):
+        lookahead = self.lookahead
+        while len(lookahead) < k:
+            token = next(self.source, None)
+            if token is None:
+                return False
+            lookahead.append(token)
+        return True
+
+    def __bool__(self):
+        return self._fill(1)
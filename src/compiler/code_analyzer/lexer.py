@@ -1,38 +1,133 @@
-from .errors.lexer import LexerError
+import mmap
+import re
+from array import array
+from bisect import bisect_right
+from .errors.lexer import LexerAbort, LexerError
 from ..shared.grammar.gox_grammar import Grammar
-from ..shared.grammar.gox_token import Token
+from ..shared.grammar.gox_token import Token, TokenKind
 from ...utils.reader.file_reader import FileReader
 
 
+NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+
 class Lexer:
-    def __init__(self, file_path):
+    def __init__(self, file_path=None, use_mmap=False, source=None):
+        """
+        Con `use_mmap=True` el archivo se mapea en memoria y se analiza como
+        bytes, sin cargarlo ni decodificarlo completo; solo se decodifican los
+        valores de los tokens. Tokens, líneas y columnas (en caracteres) son
+        los mismos que en modo texto. Con `source` se analiza ese texto en
+        lugar de leer `file_path`.
+        """
         self.errors = []
         self.tokens = []
-        self.file_content = FileReader.read(file_path)
-        self.regular_expressions = Grammar.get_compiled_regex()
+        if source is not None:
+            self.file_content = source
+            self.regular_expressions = Grammar.get_compiled_regex()
+        elif use_mmap:
+            self.file_content = FileReader.map(file_path)
+            self.regular_expressions = Grammar.get_compiled_bytes_regex()
+        else:
+            self.file_content = FileReader.read(file_path)
+            self.regular_expressions = Grammar.get_compiled_regex()
+        self.line_starts = self._build_line_starts(self.file_content)
 
-    def analyze(self):
-        line_number = 1
+    def analyze(self, report_errors=True):
+        try:
+            self.tokens.extend(self._scan())
+        finally:
+            self.close()
+
+        if self.errors:
+            return LexerError(self.errors).print_errors() if report_errors else None
+
+        return self.tokens
+
+    def iter_tokens(self, report_errors=True):
+        """
+        Genera los tokens a medida que se reconocen, sin construir la lista
+        completa. Al primer error léxico deja de entregar tokens, recorre el
+        resto del archivo solo para reunir todos los errores, imprime la misma
+        tabla que `analyze` (salvo con `report_errors=False`) y lanza
+        LexerAbort, así el parser nunca ve un flujo truncado.
+        """
+        scan = self._scan()
+        try:
+            for token in scan:
+                if self.errors:
+                    break
+                yield token
+
+            if self.errors:
+                for _ in scan:
+                    pass
+        finally:
+            # También si el consumidor abandona el generador a medias.
+            scan.close()
+            self.close()
+
+        if self.errors:
+            if report_errors:
+                LexerError(self.errors).print_errors()
+            raise LexerAbort(self.errors)
+
+    def close(self):
+        """Libera el mapeo del archivo en modo mmap; en modo texto no hace nada."""
+        if isinstance(self.file_content, mmap.mmap):
+            self.file_content.close()
+
+    def _scan(self):
+        content = self.file_content
+        is_text = isinstance(content, str)
+        line_starts = self.line_starts
+        line_index = 0
         line_start = 0
+        line_number = 1
+        next_line_start = self._next_line_start(line_index)
+        token_kinds = {name: kind.value for name, kind in TokenKind.__members__.items()}
+        # Un único objeto str por lexema repetido (identificadores, números...).
+        # Sobre bytes, la clave es el lexema crudo y así se decodifica una vez.
+        values = {}
+        # Sobre bytes, offset y columna solo coinciden en líneas ASCII; en las
+        # demás la columna se acumula decodificando desde el token anterior.
+        multibyte = not is_text and NON_ASCII.search(content) is not None
+        line_is_ascii = not multibyte or self._is_ascii(line_start, next_line_start)
+        column_base = column_offset = 0
 
-        for match in self.regular_expressions.finditer(self.file_content):
+        for match in self.regular_expressions.finditer(content):
             token_type, value, start_pos, end_pos = self._extract_match_info(match)
-            line_number, line_start = self._update_line_info(
-                start_pos, line_start, line_number
-            )
-            column_number = start_pos - line_start
+            if start_pos >= next_line_start:
+                line_index = bisect_right(line_starts, start_pos, line_index) - 1
+                line_start = line_starts[line_index]
+                line_number = line_index + 1
+                next_line_start = self._next_line_start(line_index)
+                if multibyte:
+                    line_is_ascii = self._is_ascii(line_start, next_line_start)
+                    column_base, column_offset = line_start, 0
+            if line_is_ascii:
+                column_number = start_pos - line_start
+            else:
+                column_offset += len(self._decode(content[column_base:start_pos]))
+                column_base = start_pos
+                column_number = column_offset
 
-            if token_type in ["WHITESPACE", "NEWLINE", "COMMENT"]:
+            if token_type in ("WHITESPACE", "NEWLINE", "COMMENT"):
                 continue
-            elif token_type in ["ERROR", "UNCLOSED_CHAR", "UNCLOSED_COMMENT"]:
+            elif token_type in ("ERROR", "UNCLOSED_CHAR", "UNCLOSED_COMMENT"):
+                if not is_text:
+                    value = self._decode(value)
                 self._handle_error(token_type, value, line_number, column_number)
             else:
-                self.tokens.append(Token(token_type, value, line_number, column_number))
-
-        if self.errors:
-            return LexerError(self.errors).print_errors()
-
-        return self.tokens
+                raw = value
+                value = values.get(raw)
+                if value is None:
+                    value = values[raw] = raw if is_text else self._decode(raw)
+                if token_type == "ID":
+                    token_type = Grammar.classify_identifier(
+                        content, value, start_pos, end_pos
+                    )
+                yield Token(token_kinds[token_type], value, line_number, column_number)
 
     def _extract_match_info(self, match):
         token_type = match.lastgroup
@@ -41,14 +136,28 @@ class Lexer:
         end_pos = match.end()
         return token_type, value, start_pos, end_pos
 
-    def _update_line_info(self, start_pos, line_start, line_number):
-        while line_start < start_pos:
-            newline_pos = self.file_content.find("\n", line_start, start_pos)
-            if newline_pos == -1:
-                break
-            line_number += 1
-            line_start = newline_pos + 1
-        return line_number, line_start
+    @staticmethod
+    def _build_line_starts(content):
+        """Offsets donde empieza cada línea; se calcula una sola vez por archivo."""
+        newline = "\n" if isinstance(content, str) else b"\n"
+        line_starts = array("q", [0])
+        position = content.find(newline)
+        while position != -1:
+            line_starts.append(position + 1)
+            position = content.find(newline, position + 1)
+        return line_starts
+
+    @staticmethod
+    def _decode(raw):
+        return raw.decode("utf-8", "replace")
+
+    def _is_ascii(self, start, end):
+        return NON_ASCII.search(self.file_content, start, end) is None
+
+    def _next_line_start(self, line_index):
+        if line_index + 1 < len(self.line_starts):
+            return self.line_starts[line_index + 1]
+        return len(self.file_content) + 1
 
     def _handle_error(self, token_type, value, line_number, column_number):
         error_messages = {
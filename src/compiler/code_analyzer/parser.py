@@ -1,3 +1,5 @@
+from types import GeneratorType
+
 from ..shared.AST.grammar.program import Program
 from ..shared.AST.grammar.assigment import Assignment
 from ..shared.AST.grammar.vardecl import VarDecl
@@ -17,24 +19,108 @@ from ..shared.AST.grammar.dereference_location import DereferenceLocation
 from ..shared.AST.grammar.function_call import FunctionCall
 from ..shared.AST.grammar.cast import Cast
 from .helpers.parser import ParserHelper
+from .helpers.token_stream import LazyTokenStream, TokenStream
 from .errors.parser import ParserError
-from ..shared.grammar.gox_token import Token
+from ..shared.grammar.gox_token import (
+    Token,
+    LITERAL_KINDS,
+    TYPE_KINDS,
+    ASSIGN,
+    BREAK,
+    COMMA,
+    CONST,
+    CONTINUE,
+    DEREF,
+    DIVIDE,
+    ELSE,
+    EOF,
+    EQ,
+    FUNC,
+    GE,
+    GROW,
+    GT,
+    ID,
+    IF,
+    IMPORT,
+    LAND,
+    LBRACE,
+    LE,
+    LOR,
+    LPAREN,
+    LT,
+    MINUS,
+    NE,
+    NOT,
+    PLUS,
+    PRINT,
+    RBRACE,
+    RETURN,
+    RPAREN,
+    SEMI,
+    TIMES,
+    VAR,
+    WHILE,
+)
+
+# Precedencia de los operadores binarios, de menor a mayor:
+# orterm (||), andterm (&&), relterm, addterm y multterm.
+BINARY_PRECEDENCE = {
+    LOR: 1,
+    LAND: 2,
+    LT: 3,
+    GT: 3,
+    LE: 3,
+    GE: 3,
+    EQ: 3,
+    NE: 3,
+    PLUS: 4,
+    MINUS: 4,
+    TIMES: 5,
+    DIVIDE: 5,
+}
+UNARY_KINDS = frozenset({PLUS, MINUS, GROW, NOT})
+
+# Marcos de la pila de `Parser._parse_expression`.
+_OPERAND = "operand"
+_BINARY = "binary"
+_UNARY = "unary"
+_DEREF = "deref"
+_GROUP = "group"
+_CAST = "cast"
+_ARGUMENT = "argument"
 
 
 class Parser:
     def __init__(self, tokens):
-        self.tokens = tokens
+        # Una lista (Lexer.analyze) se recorre con un cursor; cualquier otro
+        # iterable (Lexer.iter_tokens) se consume a demanda.
+        if isinstance(tokens, list):
+            self.tokens = TokenStream(tokens)
+        else:
+            self.tokens = LazyTokenStream(tokens)
         self.current_token = None
+        self.report_errors = True
+        self.statement_rules = {
+            DEREF: self.assignment,
+            VAR: self.vardecl,
+            CONST: self.vardecl,
+            FUNC: self.funcdecl,
+            IMPORT: self.funcdecl,
+            IF: self.if_stmt,
+            WHILE: self.while_stmt,
+            BREAK: self.break_stmt,
+            CONTINUE: self.continue_stmt,
+            RETURN: self.return_stmt,
+            PRINT: self.print_stmt,
+        }
         self.next_token()
 
     def next_token(self):
-        if self.tokens:
-            self.current_token = self.tokens.pop(0)
-        else:
-            self.current_token = None
+        self.current_token = self.tokens.advance()
 
-    def analyze(self):
+    def analyze(self, report_errors=True):
         self.errors = []
+        self.report_errors = report_errors
         return self.program()
 
     def program(self):
@@ -42,11 +128,13 @@ class Parser:
         ### statement* EOF
         """
         statements = []
-        while self.current_token and self.current_token.type != "EOF":
+        while self.current_token and self.current_token.kind != EOF:
             statements.append(self.statement())
 
         if len(self.errors) > 0:
-            return ParserError(self.errors).print_errors()
+            if self.report_errors:
+                ParserError(self.errors).print_errors()
+            return None
 
         return Program(statements)
 
@@ -61,11 +149,36 @@ class Parser:
         ###           / continue_stmt
         ###           / return_stmt
         ###           / print_stmt
-        """
-        if self.current_token and self.current_token.type == "ID":
-            if ParserHelper.peek_token(self).type == "ASSIGN":
+
+        Las sentencias con bloque (funcdecl, if_stmt, while_stmt) son
+        generadores que hacen `yield` cada vez que necesitan una sentencia
+        anidada; aquí se ejecutan con una pila explícita, así que la
+        profundidad de anidamiento no consume pila de Python.
+        """
+        pending = []
+        result = self._statement_rule()
+        while True:
+            if result.__class__ is GeneratorType:
+                pending.append(result)
+                result = None
+            while pending:
+                try:
+                    pending[-1].send(result)
+                except StopIteration as stop:
+                    pending.pop()
+                    result = stop.value
+                    continue
+                break
+            else:
+                return result
+            result = self._statement_rule()
+
+    def _statement_rule(self):
+        """Analiza una sentencia simple o devuelve el generador de un bloque."""
+        if self.current_token and self.current_token.kind == ID:
+            if ParserHelper.peek_token(self).kind == ASSIGN:
                 return self.assignment()
-            elif ParserHelper.peek_token(self).type == "LPAREN":
+            elif ParserHelper.peek_token(self).kind == LPAREN:
                 return self.func_call()
             else:
                 token_type, value, line_number, column_number = (
@@ -84,24 +197,8 @@ class Parser:
                     )
                 )
                 self.next_token()
-        elif self.current_token and self.current_token.type == ("DEREF"):
-            return self.assignment()
-        elif self.current_token and self.current_token.type in ("VAR", "CONST"):
-            return self.vardecl()
-        elif self.current_token and self.current_token.type in ("FUNC", "IMPORT"):
-            return self.funcdecl()
-        elif self.current_token and self.current_token.type == "IF":
-            return self.if_stmt()
-        elif self.current_token and self.current_token.type == "WHILE":
-            return self.while_stmt()
-        elif self.current_token and self.current_token.type == "BREAK":
-            return self.break_stmt()
-        elif self.current_token and self.current_token.type == "CONTINUE":
-            return self.continue_stmt()
-        elif self.current_token and self.current_token.type == "RETURN":
-            return self.return_stmt()
-        elif self.current_token and self.current_token.type == "PRINT":
-            return self.print_stmt()
+        elif self.current_token and self.current_token.kind in self.statement_rules:
+            return self.statement_rules[self.current_token.kind]()
         else:
             token_type, value, line_number, column_number = (
                 self.current_token if self.current_token else (None, None, None, None)
@@ -123,9 +220,9 @@ class Parser:
         ### location '=' expression ';'
         """
         location = self.location()
-        ParserHelper.expect(self, "ASSIGN")
+        ParserHelper.expect(self, ASSIGN)
         expression = self.expression()
-        ParserHelper.expect(self, "SEMI")
+        ParserHelper.expect(self, SEMI)
         return Assignment(location, expression)
 
     def vardecl(self):
@@ -134,111 +231,113 @@ class Parser:
         """
         kind = self.current_token.type if self.current_token else None
         self.next_token()
-        identifier = self.current_token.value if self.current_token else None
-        ParserHelper.expect(self, "ID")
+        identifier_token = self.current_token
+        identifier = identifier_token.value if identifier_token else None
+        ParserHelper.expect(self, ID)
         var_type = None
-        if self.current_token.type in ("INT", "FLOAT_TYPE", "CHAR_TYPE", "BOOL"):
+        if self.current_token.kind in TYPE_KINDS:
             var_type = self.current_token.value
             self.next_token()
         initializer = None
-        if self.current_token.type == "ASSIGN":
+        if self.current_token.kind == ASSIGN:
             self.next_token()
             initializer = self.expression()
-        ParserHelper.expect(self, "SEMI")
-        return VarDecl(kind, identifier, var_type, initializer)
+        ParserHelper.expect(self, SEMI)
+        return VarDecl(kind, identifier, var_type, initializer, identifier_token)
 
     def funcdecl(self):
         """
         ### 'import'? 'func' ID '(' parameters ')' type '{' statement* '}'
         """
         is_import = False
-        if self.current_token.type == "IMPORT":
+        if self.current_token.kind == IMPORT:
             is_import = True
             self.next_token()
-        ParserHelper.expect(self, "FUNC")
-        identifier = self.current_token.value
-        ParserHelper.expect(self, "ID")
-        ParserHelper.expect(self, "LPAREN")
+        ParserHelper.expect(self, FUNC)
+        id_token = self.current_token
+        identifier = id_token.value
+        ParserHelper.expect(self, ID)
+        ParserHelper.expect(self, LPAREN)
         parameters = self.parameters()
-        ParserHelper.expect(self, "RPAREN")
+        ParserHelper.expect(self, RPAREN)
         return_type = ParserHelper.expect_type(self)
         body = []
         if not is_import:
-            ParserHelper.expect(self, "LBRACE")
-            while self.current_token and self.current_token.type != "RBRACE":
-                body.append(self.statement())
-            ParserHelper.expect(self, "RBRACE")
+            ParserHelper.expect(self, LBRACE)
+            while self.current_token and self.current_token.kind != RBRACE:
+                body.append((yield))
+            ParserHelper.expect(self, RBRACE)
         else:
-            ParserHelper.expect(self, "SEMI")
-        return FuncDecl(is_import, identifier, parameters, return_type, body)
+            ParserHelper.expect(self, SEMI)
+        return FuncDecl(is_import, identifier, parameters, return_type, body, id_token)
 
     def if_stmt(self):
         """
         ### 'if' expression '{' statement* '}' ('else' '{' statement* '}')?
         """
-        ParserHelper.expect(self, "IF")
+        ParserHelper.expect(self, IF)
         condition = self.expression()
-        ParserHelper.expect(self, "LBRACE")
+        ParserHelper.expect(self, LBRACE)
         then_block = []
-        while self.current_token.type != "RBRACE":
-            then_block.append(self.statement())
-        ParserHelper.expect(self, "RBRACE")
+        while self.current_token.kind != RBRACE:
+            then_block.append((yield))
+        ParserHelper.expect(self, RBRACE)
         else_block = None
         if self.current_token:
-            if self.current_token.type == "ELSE":
+            if self.current_token.kind == ELSE:
                 self.next_token()
-                ParserHelper.expect(self, "LBRACE")
+                ParserHelper.expect(self, LBRACE)
                 else_block = []
-                while self.current_token.type != "RBRACE":
-                    else_block.append(self.statement())
-                ParserHelper.expect(self, "RBRACE")
+                while self.current_token.kind != RBRACE:
+                    else_block.append((yield))
+                ParserHelper.expect(self, RBRACE)
         return IfStmt(condition, then_block, else_block)
 
     def while_stmt(self):
         """
         ### 'while' expression '{' statement* '}'
         """
-        ParserHelper.expect(self, "WHILE")
+        ParserHelper.expect(self, WHILE)
         condition = self.expression()
-        ParserHelper.expect(self, "LBRACE")
+        ParserHelper.expect(self, LBRACE)
         body = []
-        while self.current_token.type != "RBRACE":
-            body.append(self.statement())
-        ParserHelper.expect(self, "RBRACE")
+        while self.current_token.kind != RBRACE:
+            body.append((yield))
+        ParserHelper.expect(self, RBRACE)
         return WhileStmt(condition, body)
 
     def break_stmt(self):
         """
         ### 'break' ';'
         """
-        ParserHelper.expect(self, "BREAK")
-        ParserHelper.expect(self, "SEMI")
+        ParserHelper.expect(self, BREAK)
+        ParserHelper.expect(self, SEMI)
         return BreakStmt()
 
     def continue_stmt(self):
         """
         ### 'continue' ';'
         """
-        ParserHelper.expect(self, "CONTINUE")
-        ParserHelper.expect(self, "SEMI")
+        ParserHelper.expect(self, CONTINUE)
+        ParserHelper.expect(self, SEMI)
         return ContinueStmt()
 
     def return_stmt(self):
         """
         ### 'return' expression ';'
         """
-        ParserHelper.expect(self, "RETURN")
+        ParserHelper.expect(self, RETURN)
         expression = self.expression()
-        ParserHelper.expect(self, "SEMI")
+        ParserHelper.expect(self, SEMI)
         return ReturnStmt(expression)
 
     def print_stmt(self):
         """
         ### 'print' expression ';'
         """
-        ParserHelper.expect(self, "PRINT")
+        ParserHelper.expect(self, PRINT)
         expression = self.expression()
-        ParserHelper.expect(self, "SEMI")
+        ParserHelper.expect(self, SEMI)
         return PrintStmt(expression)
 
     def parameters(self):
@@ -246,142 +345,152 @@ class Parser:
         ### ID type (',' ID type)* / empty
         """
         params = []
-        if self.current_token.type != "RPAREN":
+        if self.current_token.kind != RPAREN:
             param_name = self.current_token.value
-            ParserHelper.expect(self, "ID")
+            ParserHelper.expect(self, ID)
             param_type = ParserHelper.expect_type(self)
             params.append((param_name, param_type))
-            while self.current_token.type == "COMMA":
+            while self.current_token.kind == COMMA:
                 self.next_token()
                 param_name = self.current_token.value
-                ParserHelper.expect(self, "ID")
+                ParserHelper.expect(self, ID)
                 param_type = ParserHelper.expect_type(self)
                 params.append((param_name, param_type))
         return Parameters(params)
 
     def expression(self):
-        return self.orterm()
-
-    def orterm(self):
-        return self._parse_binary_op(self.andterm, ("LOR",))
-
-    def andterm(self):
-        return self._parse_binary_op(self.relterm, ("LAND",))
-
-    def relterm(self):
-        return self._parse_binary_op(self.addterm, ("LT", "GT", "LE", "GE", "EQ", "NE"))
-
-    def addterm(self):
-        return self._parse_binary_op(self.multterm, ("PLUS", "MINUS"))
-
-    def multterm(self):
-        return self._parse_binary_op(self.unaryterm, ("TIMES", "DIVIDE"))
-
-    def _parse_binary_op(self, higher_precedence_method, op_types):
-        """Función helper genérica para parsear operadores binarios izquierdas-asociativos."""
-        node = higher_precedence_method()
-        while self.current_token and self.current_token.type in op_types:
-            op_token = self.current_token
-            self.next_token()
-            right_node = higher_precedence_method()
-            node = BinaryOp(node, op_token.value, right_node)
-        return node
+        """
+        expression <- orterm
+        orterm     <- andterm ('||' andterm)*
+        andterm    <- relterm ('&&' relterm)*
+        relterm    <- addterm (('<' / '>' / '<=' / '>=' / '==' / '!=') addterm)*
+        addterm    <- multterm (('+' / '-') multterm)*
+        multterm   <- unaryterm (('*' / '/') unaryterm)*
+        """
+        return self._parse_expression(True)
 
     def unaryterm(self):
         """
         Handles unary operators like +, -, !, ^, and ` (dereference as R-value).
         unary_op_term <- ('+' / '-' / '^' / '!' / '`') unary_op_term
                       / primary_expression
-        """
-        token = self.current_token
-        if token:
-            if token.type in ("PLUS", "MINUS", "GROW", "NOT"):
-                op_token = token
-                self.next_token()
-                operand = self.unaryterm()
-                return UnaryOp(op_token.value, operand)
-            elif token.type == "DEREF":
-                op_token = token
-                self.next_token()
-                address_expression = self.unaryterm()
-                deref_node = DereferenceLocation(address_expression)
-                if hasattr(deref_node, "token"):
-                    deref_node.token = op_token
-                return deref_node
-
-        return self.primary()
-
-    def primary(
-        self,
-    ):
-        """
-        expression <- literal
+        primary_expression <- literal
             / ID
             / ID '(' arguments ')'
             / '(' expression ')'
             / type '(' expression ')'
         """
-        token = self.current_token
-        if not token:
-            return None
-
-        if token.type in ("INTEGER", "FLOAT", "CHAR", "TRUE", "FALSE"):
-            literal_token = token
-            self.next_token()
-            return Literal(literal_token.value, literal_token.type)
-
-        elif token.type == "LPAREN":
-            self.next_token()
-            expr = self.expression()
-            ParserHelper.expect(self, "RPAREN")
-            return expr
-
-        elif token.type in (
-            "INT",
-            "FLOAT_TYPE",
-            "CHAR_TYPE",
-            "BOOL",
-        ):
-            cast_type_token = token
-            self.next_token()
-            ParserHelper.expect(self, "LPAREN")
-            expr = self.expression()
-            ParserHelper.expect(self, "RPAREN")
-            return Cast(cast_type_token.value, expr)
+        return self._parse_expression(False)
+
+    def _parse_expression(self, binary):
+        """
+        Precedence climbing sin recursión. Cada construcción que espera una
+        subexpresión (operando derecho, operador unario, paréntesis, cast o
+        argumento) deja un marco en `pending`; al completarse un operando se
+        desapilan los marcos que lo consumen. Todos los operadores binarios
+        son asociativos por la izquierda: el operando derecho se analiza
+        exigiendo una precedencia estrictamente mayor (BINARY_PRECEDENCE).
+        """
+        pending = [(_OPERAND, 1)] if binary else []
+        while True:
+            # Prefijos unarios y expresión primaria.
+            token = self.current_token
+            while token is not None:
+                kind = token.kind
+                if kind in UNARY_KINDS:
+                    pending.append((_UNARY, token))
+                elif kind == DEREF:
+                    pending.append((_DEREF, token))
+                else:
+                    break
+                self.next_token()
+                token = self.current_token
 
-        elif token.type == "ID":
-            id_token = token
-            name = token.value
-            self.next_token()
-            if self.current_token and self.current_token.type == "LPAREN":
+            if token is None:
+                node = None
+            elif kind in LITERAL_KINDS:
+                self.next_token()
+                node = Literal(token.value, token.type)
+            elif kind == LPAREN:
                 self.next_token()
-                args = self.arguments()
-                ParserHelper.expect(self, "RPAREN")
-                return FunctionCall(name, args)
+                pending.append((_GROUP, None))
+                pending.append((_OPERAND, 1))
+                continue
+            elif kind in TYPE_KINDS:
+                self.next_token()
+                ParserHelper.expect(self, LPAREN)
+                pending.append((_CAST, token.value))
+                pending.append((_OPERAND, 1))
+                continue
+            elif kind == ID:
+                self.next_token()
+                if self.current_token and self.current_token.kind == LPAREN:
+                    self.next_token()
+                    args = []
+                    if self.current_token.kind != RPAREN:
+                        pending.append((_ARGUMENT, (token, args)))
+                        pending.append((_OPERAND, 1))
+                        continue
+                    ParserHelper.expect(self, RPAREN)
+                    node = FunctionCall(token.value, args, token)
+                else:
+                    node = IdentifierLocation(token.value, token)
             else:
-                return IdentifierLocation(name)
-        else:
-            token_type, value, line, col = (
-                token.type,
-                token.value,
-                token.line,
-                token.column,
-            )
-            self.errors.append(
-                (
-                    token,
+                self.errors.append(
                     (
-                        f"Token inesperado '{value}' ({token_type}) en la línea {line}, columna {col} al esperar un primario (literal, ID, '(', tipo)."
-                    ),
+                        token,
+                        (
+                            f"Token inesperado '{token.value}' ({token.type}) en la línea {token.line}, columna {token.column} al esperar un primario (literal, ID, '(', tipo)."
+                        ),
+                    )
                 )
-            )
-            self.next_token()
+                self.next_token()
+                node = None
+
+            # Entrega `node` a los marcos pendientes hasta que alguno pida
+            # otro operando.
+            while pending:
+                frame, data = pending.pop()
+                if frame is _BINARY:
+                    data, left, op_token = data
+                    node = BinaryOp(left, op_token.value, node, op_token)
+                    frame = _OPERAND
+                if frame is _OPERAND:
+                    op_token = self.current_token
+                    if op_token is not None:
+                        precedence = BINARY_PRECEDENCE.get(op_token.kind)
+                        if precedence is not None and precedence >= data:
+                            self.next_token()
+                            pending.append((_BINARY, (data, node, op_token)))
+                            pending.append((_OPERAND, precedence + 1))
+                            break
+                elif frame is _UNARY:
+                    node = UnaryOp(data.value, node, data)
+                elif frame is _DEREF:
+                    node = DereferenceLocation(node, data)
+                elif frame is _GROUP:
+                    ParserHelper.expect(self, RPAREN)
+                elif frame is _CAST:
+                    ParserHelper.expect(self, RPAREN)
+                    node = Cast(data, node)
+                else:
+                    name_token, args = data
+                    args.append(node)
+                    if self.current_token.kind == COMMA:
+                        self.next_token()
+                        pending.append((frame, data))
+                        pending.append((_OPERAND, 1))
+                        break
+                    ParserHelper.expect(self, RPAREN)
+                    node = FunctionCall(name_token.value, args, name_token)
+            else:
+                return node
 
     def arguments(self):
         args = []
-        if self.current_token.type != "RPAREN":
+        if self.current_token.kind != RPAREN:
             args.append(self.expression())
-            while self.current_token.type == "COMMA":
+            while self.current_token.kind == COMMA:
                 self.next_token()
                 args.append(self.expression())
         return args
@@ -392,18 +501,15 @@ class Parser:
                 / '`' expression
         """
         token = self.current_token
-        if token and token.type == "ID":
+        if token and token.kind == ID:
             id_token = token
             self.next_token()
-            return IdentifierLocation(id_token.value)
-        elif token and token.type == "DEREF":
+            return IdentifierLocation(id_token.value, id_token)
+        elif token and token.kind == DEREF:
             deref_op_token = token
             self.next_token()
             address_expr = self.unaryterm()
-            deref_node = DereferenceLocation(address_expr)
-            if hasattr(deref_node, "token"):
-                deref_node.token = deref_op_token
-            return deref_node
+            return DereferenceLocation(address_expr, deref_op_token)
         else:
             token_type, value, line_number, column_number = (
                 self.current_token if self.current_token else (None, None, None, None)
@@ -423,10 +529,10 @@ class Parser:
         """
         ### ID '(' arguments ')'
         """
-        name = self.current_token.value
+        name_token = self.current_token
         self.next_token()
-        ParserHelper.expect(self, "LPAREN")
+        ParserHelper.expect(self, LPAREN)
         args = self.arguments()
-        ParserHelper.expect(self, "RPAREN")
-        ParserHelper.expect(self, "SEMI")
-        return FunctionCall(name, args)
+        ParserHelper.expect(self, RPAREN)
+        ParserHelper.expect(self, SEMI)
+        return FunctionCall(name_token.value, args, name_token)
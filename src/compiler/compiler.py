@@ -1,37 +1,119 @@
-from .code_analyzer.lexer import Lexer
-from .code_analyzer.parser import Parser
-from .code_analyzer.checker import Checker
-from .interpreter.ir_generator import IRCodeGenerator
+import json
+import os
+
+from .api import CompilationOptions, Diagnostic, PassClock, compile_file
+from .code_analyzer.errors.checker import CheckerError
+from .code_analyzer.errors.lexer import LexerError
+from .code_analyzer.errors.parser import ParserError
+from .interpreter.vm import VirtualMachine
+from .interpreter.errors.vm import VMRuntimeError
+from ..utils.report.reporter import Reporter
+
+# A partir de este tamaño el lexer trabaja sobre el archivo mapeado en memoria.
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+ERROR_TABLES = {
+    "lexer": LexerError,
+    "parser": ParserError,
+    "checker": CheckerError,
+    "fold": CheckerError,
+}
 
 
 class Compiler:
-    def __init__(self, path_file):
+    """
+    Interfaz de línea de comandos sobre `compile_file`: imprime los errores
+    de la fase que falló, los reportes de `Reporter` y ejecuta el programa
+    escribiendo su salida directamente en stdout (como eventos `output` si el
+    reporter usa líneas JSON).
+
+    Con `time_passes` se miden las fases por separado (el lexer entrega la
+    lista completa de tokens en lugar de alimentar al parser a demanda) y
+    también la salida de los reportes. La tabla se imprime al final y, si
+    se da `time_passes_json`, las métricas se guardan en ese archivo.
+    """
+
+    def __init__(
+        self,
+        path_file,
+        use_arena=False,
+        reporter=None,
+        time_passes=False,
+        time_passes_json=None,
+        optimize=True,
+    ):
         self.path_file = path_file
+        self.use_arena = use_arena
+        self.reporter = reporter or Reporter()
+        self.time_passes = time_passes or time_passes_json is not None
+        self.time_passes_json = time_passes_json
+        self.optimize = optimize
         self.compile()
 
     def compile(self):
-        if self.code_verify():
-            return 0
-        if self.gen_ircode():
+        # El reloj se crea antes de compilar para que tracemalloc cubra todas
+        # las fases, incluida la salida.
+        clock = PassClock(trace_memory=True) if self.time_passes else None
+        try:
+            if self.code_verify():
+                return self.report_passes()
+            if clock:
+                clock.start()
+            self.reporter.symbol_table(self.symtable)
+            self.reporter.ir_module(self.ircode)
+            if clock:
+                self.result.passes.append(clock.stop("output"))
+        finally:
+            if clock:
+                clock.close()
+        self.reporter.execution()
+        self.run()
+        self.report_passes()
+
+    def report_passes(self):
+        if not self.time_passes:
             return 0
-        print("\n--- MÓDULO IR GENERADO ---")
-        self.ircode.dump()
+        self.reporter.pass_stats(self.result.passes)
+        if self.time_passes_json:
+            with open(self.time_passes_json, "w", encoding="utf-8") as file:
+                json.dump(
+                    {"file": self.path_file, "passes": self.result.passes_to_dict()},
+                    file,
+                    indent=2,
+                )
+        return 0
 
     def code_verify(self):
-        return self.set_lexer() or self.set_parser() or self.set_checker()
-
-    def set_lexer(self):
-        self.tokens = Lexer(self.path_file).analyze()
-        return False if self.tokens else True
-
-    def set_parser(self):
-        self.ast = Parser(self.tokens).analyze()
-        return False if self.ast else True
-
-    def set_checker(self):
-        self.symtable = Checker(self.ast).analyze()
-        return False if self.symtable else True
+        # El parser pide los tokens al lexer a medida que los necesita, así la
+        # lista completa de tokens nunca convive en memoria con el AST.
+        use_mmap = (
+            os.path.isfile(self.path_file)
+            and os.path.getsize(self.path_file) >= MMAP_THRESHOLD
+        )
+        options = CompilationOptions(
+            keep_tokens=self.time_passes,
+            use_mmap=use_mmap,
+            use_arena=self.use_arena,
+            time_passes=self.time_passes,
+            optimize=self.optimize,
+        )
+        self.result = compile_file(self.path_file, options)
+        self.ast = self.result.ast
+        self.symtable = self.result.symtable
+        self.ircode = self.result.ircode
+        if self.result.ok:
+            return False
+        phase = self.result.failed_phase
+        if self.reporter.json_lines:
+            self.reporter.errors(self.result.diagnostics)
+        else:
+            ERROR_TABLES[phase](self.result.errors(phase)).print_errors()
+        return True
 
-    def gen_ircode(self):
-        self.ircode = IRCodeGenerator(self.symtable).generate(self.ast)
-        return False if self.ircode else True
+    def run(self):
+        try:
+            return VirtualMachine(self.ircode, stdout=self.reporter.program_output()).run()
+        except VMRuntimeError as error:
+            if self.reporter.json_lines:
+                return self.reporter.errors([Diagnostic("run", error.message, error=error)])
+            return error.print_errors()
@@ -0,0 +1,26 @@
+from prettytable import PrettyTable
+from colorama import Fore, Style
+
+
+class VMRuntimeError(Exception):
+    def __init__(self, message, function_name=None):
+        super().__init__(message)
+        self.message = message
+        self.function_name = function_name
+
+    def print_errors(self):
+        table = self._create_error_table()
+        print(table)
+        return None
+
+    def _create_error_table(self):
+        table = PrettyTable()
+        table.field_names = ["Num", "Function", "Message"]
+        table.add_row(
+            [
+                1,
+                self.function_name or "-",
+                f"{Fore.RED}{self.message}{Style.RESET_ALL}",
+            ]
+        )
+        return table
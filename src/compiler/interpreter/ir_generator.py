@@ -1,3 +1,4 @@
+from types import GeneratorType
 from typing import Type
 from ..shared.AST.nodes.statement_node import Statement
 from ..shared.AST.nodes.expression_node import Expression
@@ -19,7 +20,20 @@ from ..shared.AST.grammar.identifier_location import IdentifierLocation
 from ..shared.AST.grammar.dereference_location import DereferenceLocation
 from ..shared.AST.grammar.function_call import FunctionCall
 from ..shared.AST.grammar.cast import Cast
-from ..shared.symtable.symtable import SymbolTable as SemanticSymbolTable
+from ..shared.AST.visitor import NodeVisitor
+from ..shared.symtable.symtable import (
+    BINARY_OP_IDS,
+    BINARY_OPERATORS,
+    TYPE_COUNT,
+    TYPE_IDS,
+    TYPE_NAMES,
+    UNARY_OP_IDS,
+    UNARY_OPERATORS,
+    SymbolTable as SemanticSymbolTable,
+    binary_index,
+    unary_index,
+)
+from ..shared.symtable.symbol import StorageClass
 from ..shared.symtable.symbol import SymbolKind as SemanticSymbolKind
 
 class IRModule:
@@ -78,48 +92,92 @@ _typemap = {
     "char": "I",
 }
 
-class IRCodeGenerator:
+_binop_opcodes = {
+    ("int", "+", "int"): "ADDI",
+    ("int", "-", "int"): "SUBI",
+    ("int", "*", "int"): "MULI",
+    ("int", "/", "int"): "DIVI",
+    ("int", "<", "int"): "LTI",
+    ("int", "<=", "int"): "LEI",
+    ("int", ">", "int"): "GTI",
+    ("int", ">=", "int"): "GEI",
+    ("int", "==", "int"): "EQI",
+    ("int", "!=", "int"): "NEI",
+    ("float", "+", "float"): "ADDF",
+    ("float", "-", "float"): "SUBF",
+    ("float", "*", "float"): "MULF",
+    ("float", "/", "float"): "DIVF",
+    ("float", "<", "float"): "LTF",
+    ("float", "<=", "float"): "LEF",
+    ("float", ">", "float"): "GTF",
+    ("float", ">=", "float"): "GEF",
+    ("float", "==", "float"): "EQF",
+    ("float", "!=", "float"): "NEF",
+    ("char", "<", "char"): "LTI",
+    ("char", "<=", "char"): "LEI",
+    ("char", ">", "char"): "GTI",
+    ("char", ">=", "char"): "GEI",
+    ("char", "==", "char"): "EQI",
+    ("char", "!=", "char"): "NEI",
+}
+_unaryop_instructions = {
+    ("+", "int"): [],
+    ("+", "float"): [],
+    ("-", "int"): [("CONSTI", -1), ("MULI",)],
+    ("-", "float"): [("CONSTF", -1.0), ("MULF",)],
+    ("!", "bool"): [("CONSTI", 0), ("EQI",)],
+    ("^", "int"): [("GROW",)],
+}
+_float_coercion_ops = {"+", "-", "*", "<", "<=", ">", ">=", "==", "!="}
+_int_like = {"char": "int", "bool": "int"}
+
+
+def _build_binop_table():
+    # Para cada (operador, tipo izquierdo, tipo derecho) se guarda el par
+    # (convertir con ITOF el operando de la cima, opcode). En la división la
+    # cima es el dividendo, que se apila después del chequeo del divisor.
+    table = [None] * (len(BINARY_OPERATORS) * TYPE_COUNT**2)
+    for op, op_id in BINARY_OP_IDS.items():
+        for left_id, left in enumerate(TYPE_NAMES):
+            for right_id, right in enumerate(TYPE_NAMES):
+                if op == "/":
+                    is_float_op = "float" in (left, right)
+                    convert = is_float_op and left == "int"
+                    key = ("float", "/", "float") if is_float_op else ("int", "/", "int")
+                else:
+                    is_float_op = op in _float_coercion_ops and "float" in (left, right)
+                    convert = is_float_op and right == "int"
+                    if is_float_op:
+                        key = ("float", op, "float")
+                    else:
+                        key = (_int_like.get(left, left), op, _int_like.get(right, right))
+                opcode = _binop_opcodes.get(key)
+                if convert or opcode:
+                    table[binary_index(op_id, left_id, right_id)] = (convert, opcode)
+    return table
+
+
+def _build_unaryop_table():
+    table = [None] * (len(UNARY_OPERATORS) * TYPE_COUNT)
+    for op, op_id in UNARY_OP_IDS.items():
+        for type_id, type_name in enumerate(TYPE_NAMES):
+            key_type = "int" if type_name == "char" else type_name
+            instructions = _unaryop_instructions.get((op, key_type))
+            if instructions is not None:
+                table[unary_index(op_id, type_id)] = instructions
+    return table
+
+
+_BINOP_IRCODE = _build_binop_table()
+_UNARYOP_IRCODE = _build_unaryop_table()
+
+class IRCodeGenerator(NodeVisitor):
     def __init__(self, semantic_symbol_table: SemanticSymbolTable):
         self.semantic_symbol_table = semantic_symbol_table
         self.module = IRModule()
         self.current_function: IRFunction | None = None
-        self.current_scope_path = []
-        self._binop_ircode = {
-            ("int", "+", "int"): "ADDI",
-            ("int", "-", "int"): "SUBI",
-            ("int", "*", "int"): "MULI",
-            ("int", "/", "int"): "DIVI",
-            ("int", "<", "int"): "LTI",
-            ("int", "<=", "int"): "LEI",
-            ("int", ">", "int"): "GTI",
-            ("int", ">=", "int"): "GEI",
-            ("int", "==", "int"): "EQI",
-            ("int", "!=", "int"): "NEI",
-            ("float", "+", "float"): "ADDF",
-            ("float", "-", "float"): "SUBF",
-            ("float", "*", "float"): "MULF",
-            ("float", "/", "float"): "DIVF",
-            ("float", "<", "float"): "LTF",
-            ("float", "<=", "float"): "LEF",
-            ("float", ">", "float"): "GTF",
-            ("float", ">=", "float"): "GEF",
-            ("float", "==", "float"): "EQF",
-            ("float", "!=", "float"): "NEF",
-            ("char", "<", "char"): "LTI",
-            ("char", "<=", "char"): "LEI",
-            ("char", ">", "char"): "GTI",
-            ("char", ">=", "char"): "GEI",
-            ("char", "==", "char"): "EQI",
-            ("char", "!=", "char"): "NEI",
-        }
-        self._unaryop_ircode = {
-            ("+", "int"): [],
-            ("+", "float"): [],
-            ("-", "int"): [("CONSTI", -1), ("MULI",)],
-            ("-", "float"): [("CONSTF", -1.0), ("MULF",)],
-            ("!", "bool"): [("CONSTI", -1), ("MULI",)],
-            ("^", "int"): [("GROW",)],
-        }
+        self._binop_ircode = _BINOP_IRCODE
+        self._unaryop_ircode = _UNARYOP_IRCODE
         self._typecast_ircode = {
             ("int", "float"): [("ITOF",)],
             ("float", "int"): [("FTOI",)],
@@ -136,7 +194,6 @@ class IRCodeGenerator:
         self.current_function = IRFunction(
             self.module, init_func_name, [], [], _typemap["int"]
         )
-        self.current_scope_path.append(self.semantic_symbol_table.global_scope)
         global_stmts = [
             s for s in ast_root_node.statements if not isinstance(s, FuncDecl)
         ]
@@ -151,7 +208,6 @@ class IRCodeGenerator:
         else:
             self.current_function.append(("CONSTI", 0))
         self.current_function.append(("RET",))
-        self.current_scope_path.pop()
         user_func_decls = [
             s for s in ast_root_node.statements if isinstance(s, FuncDecl)
         ]
@@ -164,7 +220,7 @@ class IRCodeGenerator:
         for stmt in statements:
             if isinstance(stmt, VarDecl):
                 var_name = stmt.identifier
-                var_sym = self.semantic_symbol_table.global_scope.lookup(var_name)
+                var_sym = stmt.defined_symbol
                 if var_sym and var_sym.type:
                     ir_type = _typemap.get(var_sym.type)
                     if ir_type and var_name not in self.module.globals:
@@ -178,9 +234,7 @@ class IRCodeGenerator:
                         if stmt.parameters
                         else []
                     )
-                    func_sym_semantic = self.semantic_symbol_table.global_scope.lookup(
-                        func_name
-                    )
+                    func_sym_semantic = stmt.defined_symbol
                     if not func_sym_semantic:
                         continue
                     parmtypes_lang = [
@@ -200,13 +254,6 @@ class IRCodeGenerator:
                         stmt.is_import,
                     )
 
-    def _get_semantic_symbol(self, name: str):
-        for scope_semantic in reversed(self.current_scope_path):
-            symbol = scope_semantic.lookup(name)
-            if symbol:
-                return symbol
-        return None
-
     def _get_node_semantic_type(self, node: Expression) -> str | None:
         if hasattr(node, "semantic_type") and node.semantic_type is not None:
             return node.semantic_type
@@ -220,7 +267,7 @@ class IRCodeGenerator:
             if node.type_token in ("TRUE", "FALSE"):
                 return "bool"
         elif isinstance(node, IdentifierLocation):
-            sym = self._get_semantic_symbol(node.name)
+            sym = node.referenced_symbol
             return sym.type if sym else None
         return None
 
@@ -233,11 +280,30 @@ class IRCodeGenerator:
             )
 
     def _visit(self, node):
-        if node is None:
-            return
-        method_name = f"_visit_{node.__class__.__name__}"
-        visitor = getattr(self, method_name, self._generic_visit)
-        return visitor(node)
+        """
+        Genera el código de `node` sin recursión en Python: los visitantes con
+        hijos son generadores que hacen `yield hijo`, y aquí se ejecutan con
+        una pila explícita.
+        """
+        handlers = self._handlers
+        pending = []
+        while True:
+            if node is not None:
+                handler = handlers.get(node.__class__) or self._resolve_handler(
+                    node.__class__
+                )
+                result = handler(self, node)
+                if result.__class__ is GeneratorType:
+                    pending.append(result)
+            while pending:
+                try:
+                    node = pending[-1].send(None)
+                except StopIteration:
+                    pending.pop()
+                    continue
+                break
+            else:
+                return
 
     def _generic_visit(self, node):
         raise NotImplementedError(f"No IR generator visitor for {type(node)}")
@@ -245,54 +311,45 @@ class IRCodeGenerator:
     def _visit_Program(self, node: Program):
         pass
 
+    # Los nombres ya vienen resueltos por el checker: cada VarDecl e
+    # IdentifierLocation lleva su Symbol con la clase de almacenamiento, así
+    # que aquí no se busca nada en los scopes.
     def _visit_VarDecl(self, node: VarDecl):
         var_name = node.identifier
-        is_global_context = (
-            self.current_function is not None
-            and self.current_function.name == "main"
-            and self.current_function.module.functions[self.current_function.name]
-            == self.current_function
-        )
-        var_sym_semantic = self._get_semantic_symbol(var_name)
+        var_sym_semantic = node.defined_symbol
         if not var_sym_semantic or not var_sym_semantic.type:
             return
         var_ir_type = _typemap.get(var_sym_semantic.type)
         if not var_ir_type:
             return
-        if is_global_context:
+        if var_sym_semantic.storage is StorageClass.GLOBAL:
+            if var_name not in self.module.globals:
+                # Declarada dentro de un bloque del nivel superior.
+                self.module.globals[var_name] = IRGlobal(var_name, var_ir_type)
             if node.initializer:
-                self._visit(node.initializer)
+                yield node.initializer
                 self._emit(("GLOBAL_SET", var_name))
         else:
             if var_name not in self.current_function.locals:
                 self.current_function.new_local(var_name, var_ir_type)
             if node.initializer:
-                self._visit(node.initializer)
+                yield node.initializer
                 self._emit(("LOCAL_SET", var_name))
 
     def _visit_Assignment(self, node: Assignment):
         location_node = node.location
         if isinstance(location_node, IdentifierLocation):
-            self._visit(node.expression)
-            var_name = location_node.name
-            sym_semantic = self._get_semantic_symbol(var_name)
+            yield node.expression
+            sym_semantic = location_node.referenced_symbol
             if not sym_semantic:
                 return
-            if self.current_function and var_name in self.current_function.locals:
-                self._emit(("LOCAL_SET", var_name))
-            elif var_name in self.module.globals:
-                self._emit(("GLOBAL_SET", var_name))
+            if sym_semantic.storage is StorageClass.LOCAL:
+                self._emit(("LOCAL_SET", sym_semantic.name))
             else:
-                if self.current_function and self.current_function.name == "main":
-                    if var_name in self.module.globals:
-                        self._emit(("GLOBAL_SET", var_name))
-                    else:
-                        pass
-                else:
-                    self._emit(("LOCAL_SET", var_name))
+                self._emit(("GLOBAL_SET", sym_semantic.name))
         elif isinstance(location_node, DereferenceLocation):
-            self._visit(location_node.expression)
-            self._visit(node.expression)
+            yield location_node.expression
+            yield node.expression
             value_type_lang = self._get_node_semantic_type(node.expression)
             if value_type_lang == "int" or value_type_lang == "bool":
                 self._emit(("POKEI",))
@@ -352,22 +409,13 @@ class IRCodeGenerator:
             self._emit(("CONSTI", 0))
 
     def _visit_IdentifierLocation(self, node: IdentifierLocation):
-        var_name = node.name
-        sym_semantic = self._get_semantic_symbol(var_name)
+        sym_semantic = node.referenced_symbol
         if not sym_semantic:
             return
-        if self.current_function and var_name in self.current_function.locals:
-            self._emit(("LOCAL_GET", var_name))
-        elif var_name in self.module.globals:
-            self._emit(("GLOBAL_GET", var_name))
+        if sym_semantic.storage is StorageClass.LOCAL:
+            self._emit(("LOCAL_GET", sym_semantic.name))
         else:
-            if self.current_function and self.current_function.name == "main":
-                if var_name in self.module.globals:
-                    self._emit(("GLOBAL_GET", var_name))
-                else:
-                    pass
-            else:
-                self._emit(("LOCAL_GET", var_name))
+            self._emit(("GLOBAL_GET", sym_semantic.name))
 
     def _visit_BinaryOp(self, node: BinaryOp):
         left_type_lang = self._get_node_semantic_type(node.left)
@@ -376,13 +424,13 @@ class IRCodeGenerator:
             if not (left_type_lang == "bool"):
                 self._emit(("CONSTI", 0)) 
                 return
-            self._visit(node.left)
+            yield node.left
             self._emit(("IF",))
             right_type_lang = self._get_node_semantic_type(node.right)
             if not (right_type_lang == "bool"):
                 self._emit(("CONSTI", 0))
             else:
-                self._visit(node.right)
+                yield node.right
             self._emit(("ELSE",))
             self._emit(("CONSTI", 0))
             self._emit(("ENDIF",))
@@ -391,7 +439,7 @@ class IRCodeGenerator:
             if not (left_type_lang == "bool"):
                 self._emit(("CONSTI", 0))
                 return
-            self._visit(node.left)
+            yield node.left
             self._emit(("IF",))
             self._emit(("CONSTI", 1))
             self._emit(("ELSE",))
@@ -399,14 +447,14 @@ class IRCodeGenerator:
             if not (right_type_lang == "bool"):
                 self._emit(("CONSTI", 0))
             else:
-                self._visit(node.right)
+                yield node.right
             self._emit(("ENDIF",))
             return
         right_type_lang = self._get_node_semantic_type(node.right)
         if not left_type_lang or not right_type_lang:
             return
         if op == '/':
-            self._visit(node.right)
+            yield node.right
             self._emit(("DUP",))
             is_float_division_check = (right_type_lang == "float")
             if is_float_division_check:
@@ -419,74 +467,56 @@ class IRCodeGenerator:
             self._emit(("POP", 1))
             self._emit(("RUNTIME_ERROR", "DivisionByZero"))
             self._emit(("ELSE",))
-            self._visit(node.left)
-            left_type_lang_effective = self._get_node_semantic_type(node.left)
-            right_type_lang_effective = right_type_lang
-            if not left_type_lang_effective or not right_type_lang_effective: return
-            is_float_op_div = (left_type_lang_effective == "float" or right_type_lang_effective == "float")
-            if is_float_op_div:
-                if left_type_lang_effective == "int":
-                    self._emit(("ITOF",))
-                    left_type_lang_effective = "float"
-                if right_type_lang_effective == "int":
-                    right_type_lang_effective = "float"
+            yield node.left
+            left_type_lang = self._get_node_semantic_type(node.left)
+            if not left_type_lang:
+                return
+            entry = self._binop_entry(op, left_type_lang, right_type_lang)
+            if entry is not None and entry[0]:
+                self._emit(("ITOF",))
             self._emit(("SWAP",))
-            div_op_key_left = "float" if left_type_lang_effective == "float" else "int"
-            div_op_key_right = "float" if right_type_lang_effective == "float" else "int"
-            div_op_lookup_key = (div_op_key_left, '/', div_op_key_right)
-            if div_op_lookup_key in self._binop_ircode:
-                self._emit((self._binop_ircode[div_op_lookup_key],))
+            if entry is not None and entry[1]:
+                self._emit((entry[1],))
             else:
                 self._emit(("CONSTI", 0))
             self._emit(("ENDIF",))
             return
-        self._visit(node.left)
-        left_type_lang_effective = self._get_node_semantic_type(node.left)
-        self._visit(node.right)
-        right_type_lang_effective = self._get_node_semantic_type(node.right)
-        if not left_type_lang_effective or not right_type_lang_effective:
+        yield node.left
+        left_type_lang = self._get_node_semantic_type(node.left)
+        yield node.right
+        right_type_lang = self._get_node_semantic_type(node.right)
+        if not left_type_lang or not right_type_lang:
             return
-        op_char = op
-        is_float_op = False
-        if op_char in ["+", "-", "*", "<", "<=", ">", ">=", "==", "!="]:
-            if (
-                left_type_lang_effective == "float"
-                or right_type_lang_effective == "float"
-            ):
-                is_float_op = True
-        if is_float_op:
-            if right_type_lang_effective == "int":
-                self._emit(("ITOF",)) 
-                right_type_lang_effective = "float"
-            if left_type_lang_effective == "int":
-                left_type_lang_effective = "float"
-        key_left = ("int" if left_type_lang_effective in ("char", "bool") else left_type_lang_effective)
-        key_right = ("int" if right_type_lang_effective in ("char", "bool") else right_type_lang_effective)
-        if is_float_op:  
-            key_left = "float"
-            key_right = "float"
-        op_key = (key_left, op_char, key_right)
-        if op_key in self._binop_ircode:
-            self._emit((self._binop_ircode[op_key],))
-        else:
-            pass
+        entry = self._binop_entry(op, left_type_lang, right_type_lang)
+        if entry is None:
+            return
+        convert, opcode = entry
+        if convert:
+            self._emit(("ITOF",))
+        if opcode:
+            self._emit((opcode,))
+
+    def _binop_entry(self, op, left_type, right_type):
+        op_id = BINARY_OP_IDS.get(op)
+        left_id = TYPE_IDS.get(left_type)
+        right_id = TYPE_IDS.get(right_type)
+        if op_id is None or left_id is None or right_id is None:
+            return None
+        return self._binop_ircode[binary_index(op_id, left_id, right_id)]
 
     def _visit_UnaryOp(self, node: UnaryOp):
-        self._visit(node.expr)
+        yield node.expr
         expr_type_lang = self._get_node_semantic_type(node.expr)
         if not expr_type_lang:
             return
-        key_expr_type = (
-            "bool"
-            if expr_type_lang == "bool"
-            else "int" if expr_type_lang == "char" else expr_type_lang
-        )
-        op_key = (node.op, key_expr_type)
-        if op_key in self._unaryop_ircode:
-            for instr_tuple in self._unaryop_ircode[op_key]:
+        op_id = UNARY_OP_IDS.get(node.op)
+        type_id = TYPE_IDS.get(expr_type_lang)
+        if op_id is None or type_id is None:
+            return
+        instructions = self._unaryop_ircode[unary_index(op_id, type_id)]
+        if instructions:
+            for instr_tuple in instructions:
                 self._emit(instr_tuple)
-        else:
-            pass
 
     def _visit_FuncDecl(self, node: FuncDecl):
         func_name_ast = node.identifier
@@ -497,42 +527,29 @@ class IRCodeGenerator:
         if node.is_import:
             target_ir_func.imported = True
             return
+        if not node.body_semantic_scope:
+            return
         previous_function = self.current_function
         self.current_function = target_ir_func
-        func_sem_scope = None
-        if hasattr(node, "semantic_scope") and node.semantic_scope:
-            func_sem_scope = node.semantic_scope
-        else:
-            for child_scope in self.semantic_symbol_table.global_scope.children_scopes:
-                if (
-                    child_scope.scope_name == f"<func_body_{func_name_ast}>"
-                ):
-                    func_sem_scope = child_scope
-                    break
-        if not func_sem_scope:
-            self.current_function = previous_function
-            return
-        self.current_scope_path.append(func_sem_scope)
         for pname, ptype_ir in zip(target_ir_func.parmnames, target_ir_func.parmtypes):
             target_ir_func.new_local(pname, ptype_ir)
         for stmt_node in node.body:
-            self._visit(stmt_node)
-        self.current_scope_path.pop()
+            yield stmt_node
         self.current_function = previous_function
 
     def _visit_FunctionCall(self, node: FunctionCall):
         if node.arguments:
             for arg_expr in node.arguments:
-                self._visit(arg_expr)
+                yield arg_expr
         ir_call_name = "_actual_main" if node.name == "main" else node.name
         self._emit(("CALL", ir_call_name))
 
     def _visit_ReturnStmt(self, node: ReturnStmt):
-        self._visit(node.expression)
+        yield node.expression
         self._emit(("RET",))
 
     def _visit_PrintStmt(self, node: PrintStmt):
-        self._visit(node.expression)
+        yield node.expression
         expr_type_lang = self._get_node_semantic_type(node.expression)
         if not expr_type_lang:
             return
@@ -548,28 +565,26 @@ class IRCodeGenerator:
             pass
 
     def _visit_IfStmt(self, node: IfStmt):
-        self._visit(node.condition)
+        yield node.condition
         self._emit(("IF",))
         for stmt in node.then_block:
-            self._visit(stmt)
+            yield stmt
         if node.else_block:
             self._emit(("ELSE",))
             for stmt in node.else_block:
-                self._visit(stmt)
+                yield stmt
         self._emit(("ENDIF",))
 
     def _visit_WhileStmt(self, node: WhileStmt):
         self._emit(("LOOP",))
-        self._visit(
-            node.condition
-        )
+        yield node.condition
         self._emit(("CONSTI", 1))
         self._emit(("SUBI",))
         self._emit(
             ("CBREAK",)
         )
         for stmt in node.body:
-            self._visit(stmt)
+            yield stmt
         self._emit(("ENDLOOP",))
 
     def _visit_BreakStmt(self, node: BreakStmt):
@@ -580,7 +595,7 @@ class IRCodeGenerator:
         self._emit(("CONTINUE",))
 
     def _visit_Cast(self, node: Cast):
-        self._visit(node.expression)
+        yield node.expression
         from_type_lang = self._get_node_semantic_type(node.expression)
         to_type_lang = node.cast_type
         if not from_type_lang:
@@ -592,7 +607,7 @@ class IRCodeGenerator:
                     self._emit(instr_tuple)
 
     def _visit_DereferenceLocation(self, node: DereferenceLocation):
-        self._visit(node.expression)
+        yield node.expression
         expected_type_lang = self._get_node_semantic_type(node)
         if expected_type_lang == "int" or expected_type_lang == "bool":
             self._emit(("PEEKI",))
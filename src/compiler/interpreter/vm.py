@@ -0,0 +1,452 @@
+import operator
+import struct
+import sys
+from .errors.vm import VMRuntimeError
+from .ir_generator import IRModule
+
+# Códigos internos del VM. Las instrucciones IR se traducen a estos enteros al
+# cargar el módulo; las variantes I/F que en Python se ejecutan igual comparten
+# código (ADDI/ADDF -> _ADD, CONSTI/CONSTF -> _CONST, ...).
+_LOCAL_GET = 0
+_CONST = 1
+_LOCAL_SET = 2
+_GLOBAL_GET = 3
+_GLOBAL_SET = 4
+_ARITH_LOCAL = 5
+_ARITH_GLOBAL = 6
+_ARITH_CONST = 7
+_MUL = 8
+_ADD = 9
+_SUB = 10
+_IF = 11
+_JUMP = 12
+_CBREAK = 13
+_COMPARE_LOCAL = 14
+_COMPARE_GLOBAL = 15
+_COMPARE_CONST = 16
+_LT = 17
+_GT = 18
+_LE = 19
+_GE = 20
+_EQ = 21
+_NE = 22
+_CALL = 23
+_RET = 24
+_DIVI = 25
+_DIVF = 26
+_ITOF = 27
+_FTOI = 28
+_PRINTI = 29
+_PRINTB = 30
+_PEEKI = 31
+_PEEKF = 32
+_PEEKB = 33
+_POKEI = 34
+_POKEF = 35
+_POKEB = 36
+_GROW = 37
+_DUP = 38
+_POP = 39
+_SWAP = 40
+_RUNTIME_ERROR = 41
+
+_simple_opcodes = {
+    "ADDI": _ADD,
+    "ADDF": _ADD,
+    "SUBI": _SUB,
+    "SUBF": _SUB,
+    "MULI": _MUL,
+    "MULF": _MUL,
+    "DIVI": _DIVI,
+    "DIVF": _DIVF,
+    "LTI": _LT,
+    "LTF": _LT,
+    "GTI": _GT,
+    "GTF": _GT,
+    "LEI": _LE,
+    "LEF": _LE,
+    "GEI": _GE,
+    "GEF": _GE,
+    "EQI": _EQ,
+    "EQF": _EQ,
+    "NEI": _NE,
+    "NEF": _NE,
+    "ITOF": _ITOF,
+    "FTOI": _FTOI,
+    "PRINTI": _PRINTI,
+    "PRINTF": _PRINTI,
+    "PRINTB": _PRINTB,
+    "PEEKI": _PEEKI,
+    "PEEKF": _PEEKF,
+    "PEEKB": _PEEKB,
+    "POKEI": _POKEI,
+    "POKEF": _POKEF,
+    "POKEB": _POKEB,
+    "GROW": _GROW,
+    "DUP": _DUP,
+    "SWAP": _SWAP,
+    "RET": _RET,
+}
+
+# Superinstrucciones: una operación binaria cuyo operando derecho viene de una
+# local, una global o una constante se fusiona con la carga previa.
+_arithmetic_functions = {_ADD: operator.add, _SUB: operator.sub, _MUL: operator.mul}
+_comparison_functions = {
+    _LT: operator.lt,
+    _GT: operator.gt,
+    _LE: operator.le,
+    _GE: operator.ge,
+    _EQ: operator.eq,
+    _NE: operator.ne,
+}
+_fused_arithmetic = {
+    _LOCAL_GET: _ARITH_LOCAL,
+    _GLOBAL_GET: _ARITH_GLOBAL,
+    _CONST: _ARITH_CONST,
+}
+_fused_comparison = {
+    _LOCAL_GET: _COMPARE_LOCAL,
+    _GLOBAL_GET: _COMPARE_GLOBAL,
+    _CONST: _COMPARE_CONST,
+}
+
+_memory_opcodes = {_PEEKI, _PEEKF, _PEEKB, _POKEI, _POKEF, _POKEB}
+
+_default_values = {"I": 0, "F": 0.0}
+
+_int32 = struct.Struct("<i")
+_float64 = struct.Struct("<d")
+
+
+class _LoadedFunction:
+    __slots__ = ("name", "code", "nparams", "local_defaults", "slots", "host")
+
+    def __init__(self, name, host=None):
+        self.name = name
+        self.code = []
+        self.nparams = 0
+        self.local_defaults = []
+        self.slots = {}
+        self.host = host
+
+
+class VirtualMachine:
+    """
+    Ejecuta un `IRModule` sobre una máquina de pila.
+
+    Al cargar el módulo cada `IRFunction.code` se traduce una sola vez a una
+    lista de pares `(opcode, arg)`: los nombres de locales y globales se
+    convierten en índices, los `CALL` apuntan directamente a la función
+    destino y los marcadores estructurados (IF/ELSE/ENDIF, LOOP/CBREAK/
+    CONTINUE/ENDLOOP) se resuelven a saltos absolutos.
+    """
+
+    def __init__(self, module: IRModule, imports=None, stdout=None):
+        self.module = module
+        self.imports = imports or {}
+        self.stdout = stdout if stdout is not None else sys.stdout
+        self.memory = bytearray()
+        self.global_slots = {}
+        self.globals = []
+        self.functions = {}
+        self._load()
+
+    def _load(self):
+        for glob in self.module.globals.values():
+            self._global_slot(glob.name, glob.type)
+        for func in self.module.functions.values():
+            if func.imported:
+                self.functions[func.name] = _LoadedFunction(
+                    func.name, host=self._resolve_import(func.name)
+                )
+            else:
+                self.functions[func.name] = _LoadedFunction(func.name)
+        for func in self.module.functions.values():
+            if not func.imported:
+                self._load_function(func, self.functions[func.name])
+
+    def _resolve_import(self, name):
+        host = self.imports.get(name)
+        if host is not None:
+            return host
+
+        def missing(*args):
+            raise VMRuntimeError(
+                f"La función importada '{name}' no está disponible en el VM.", name
+            )
+
+        return missing
+
+    def _global_slot(self, name, ir_type="I"):
+        slot = self.global_slots.get(name)
+        if slot is None:
+            slot = len(self.globals)
+            self.global_slots[name] = slot
+            self.globals.append(_default_values.get(ir_type, 0))
+        return slot
+
+    def _local_slot(self, loaded, name, ir_type="I"):
+        slot = loaded.slots.get(name)
+        if slot is None:
+            slot = len(loaded.local_defaults)
+            loaded.slots[name] = slot
+            loaded.local_defaults.append(_default_values.get(ir_type, 0))
+        return slot
+
+    def _load_function(self, func, loaded):
+        for pname, ptype in zip(func.parmnames, func.parmtypes):
+            self._local_slot(loaded, pname, ptype)
+        loaded.nparams = len(func.parmnames)
+        for lname, ltype in func.locals.items():
+            self._local_slot(loaded, lname, ltype)
+
+        code = loaded.code
+        blocks = []  # (opcode, índice) de IF/ELSE pendientes de parchear
+        loops = []  # (inicio del bucle, [CBREAK pendientes])
+        labels = set()  # índices que son destino de algún salto
+        for instr in func.code:
+            opname = instr[0]
+            if opname == "LOCAL_GET":
+                code.append((_LOCAL_GET, self._local_slot(loaded, instr[1])))
+            elif opname == "LOCAL_SET":
+                code.append((_LOCAL_SET, self._local_slot(loaded, instr[1])))
+            elif opname == "GLOBAL_GET":
+                code.append((_GLOBAL_GET, self._global_slot(instr[1])))
+            elif opname == "GLOBAL_SET":
+                code.append((_GLOBAL_SET, self._global_slot(instr[1])))
+            elif opname in ("CONSTI", "CONSTF"):
+                code.append((_CONST, instr[1]))
+            elif opname == "CALL":
+                target = self.functions.get(instr[1])
+                if target is None:
+                    raise VMRuntimeError(
+                        f"Llamada a función inexistente '{instr[1]}'.", func.name
+                    )
+                code.append((_CALL, target))
+            elif opname == "POP":
+                code.append((_POP, instr[1] if len(instr) > 1 else 1))
+            elif opname == "RUNTIME_ERROR":
+                code.append((_RUNTIME_ERROR, instr[1]))
+            elif opname == "IF":
+                blocks.append((_IF, len(code)))
+                code.append(None)
+            elif opname == "ELSE":
+                _, if_index = blocks.pop()
+                blocks.append((_JUMP, len(code)))
+                code.append(None)
+                code[if_index] = (_IF, len(code))
+                labels.add(len(code))
+            elif opname == "ENDIF":
+                kind, index = blocks.pop()
+                code[index] = (kind, len(code))
+                labels.add(len(code))
+            elif opname == "LOOP":
+                loops.append((len(code), []))
+                labels.add(len(code))
+            elif opname == "CBREAK":
+                loops[-1][1].append(len(code))
+                code.append(None)
+            elif opname == "CONTINUE":
+                code.append((_JUMP, loops[-1][0]))
+            elif opname == "ENDLOOP":
+                start, breaks = loops.pop()
+                code.append((_JUMP, start))
+                for index in breaks:
+                    code[index] = (_CBREAK, len(code))
+                labels.add(len(code))
+            elif opname in _simple_opcodes:
+                self._append_simple(code, labels, _simple_opcodes[opname])
+            else:
+                raise VMRuntimeError(
+                    f"Instrucción IR desconocida '{opname}'.", func.name
+                )
+        # Retorno implícito para funciones que terminan sin RET.
+        code.append((_CONST, 0))
+        code.append((_RET, None))
+
+    def _append_simple(self, code, labels, op):
+        previous = code[-1] if code and len(code) not in labels else None
+        if previous is not None:
+            if op in _arithmetic_functions and previous[0] in _fused_arithmetic:
+                code[-1] = (
+                    _fused_arithmetic[previous[0]],
+                    (_arithmetic_functions[op], previous[1]),
+                )
+                return
+            if op in _comparison_functions and previous[0] in _fused_comparison:
+                code[-1] = (
+                    _fused_comparison[previous[0]],
+                    (_comparison_functions[op], previous[1]),
+                )
+                return
+        code.append((op, None))
+
+    def run(self, function_name="main"):
+        entry = self.functions.get(function_name)
+        if entry is None or entry.host is not None:
+            raise VMRuntimeError(f"No existe la función '{function_name}'.")
+        return self._execute(entry)
+
+    def _execute(self, entry):
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        globals_ = self.globals
+        memory = self.memory
+        write = self.stdout.write
+        unpack_i = _int32.unpack_from
+        pack_i = _int32.pack_into
+        unpack_f = _float64.unpack_from
+        pack_f = _float64.pack_into
+
+        frames = []
+        func = entry
+        code = func.code
+        local = func.local_defaults[:]
+        base = 0
+        pc = 0
+        try:
+            while True:
+                op, arg = code[pc]
+                pc += 1
+                if op == _LOCAL_GET:
+                    push(local[arg])
+                elif op == _CONST:
+                    push(arg)
+                elif op == _LOCAL_SET:
+                    local[arg] = pop()
+                elif op == _GLOBAL_GET:
+                    push(globals_[arg])
+                elif op == _GLOBAL_SET:
+                    globals_[arg] = pop()
+                elif op == _ARITH_LOCAL:
+                    function, slot = arg
+                    stack[-1] = function(stack[-1], local[slot])
+                elif op == _ARITH_GLOBAL:
+                    function, slot = arg
+                    stack[-1] = function(stack[-1], globals_[slot])
+                elif op == _ARITH_CONST:
+                    function, value = arg
+                    stack[-1] = function(stack[-1], value)
+                elif op == _MUL:
+                    b = pop()
+                    stack[-1] = stack[-1] * b
+                elif op == _ADD:
+                    b = pop()
+                    stack[-1] = stack[-1] + b
+                elif op == _SUB:
+                    b = pop()
+                    stack[-1] = stack[-1] - b
+                elif op == _IF:
+                    if not pop():
+                        pc = arg
+                elif op == _JUMP:
+                    pc = arg
+                elif op == _CBREAK:
+                    if pop():
+                        pc = arg
+                elif op == _COMPARE_LOCAL:
+                    function, slot = arg
+                    stack[-1] = 1 if function(stack[-1], local[slot]) else 0
+                elif op == _COMPARE_GLOBAL:
+                    function, slot = arg
+                    stack[-1] = 1 if function(stack[-1], globals_[slot]) else 0
+                elif op == _COMPARE_CONST:
+                    function, value = arg
+                    stack[-1] = 1 if function(stack[-1], value) else 0
+                elif op == _LT:
+                    b = pop()
+                    stack[-1] = 1 if stack[-1] < b else 0
+                elif op == _GT:
+                    b = pop()
+                    stack[-1] = 1 if stack[-1] > b else 0
+                elif op == _LE:
+                    b = pop()
+                    stack[-1] = 1 if stack[-1] <= b else 0
+                elif op == _GE:
+                    b = pop()
+                    stack[-1] = 1 if stack[-1] >= b else 0
+                elif op == _EQ:
+                    b = pop()
+                    stack[-1] = 1 if stack[-1] == b else 0
+                elif op == _NE:
+                    b = pop()
+                    stack[-1] = 1 if stack[-1] != b else 0
+                elif op == _CALL:
+                    nparams = arg.nparams
+                    if arg.host is not None:
+                        args = stack[len(stack) - nparams :] if nparams else []
+                        if nparams:
+                            del stack[-nparams:]
+                        push(arg.host(*args))
+                        continue
+                    frame = arg.local_defaults[:]
+                    if nparams:
+                        frame[:nparams] = stack[-nparams:]
+                        del stack[-nparams:]
+                    frames.append((func, code, pc, local, base))
+                    func = arg
+                    code = arg.code
+                    local = frame
+                    base = len(stack)
+                    pc = 0
+                elif op == _RET:
+                    result = pop() if len(stack) > base else 0
+                    if not frames:
+                        return result
+                    del stack[base:]
+                    push(result)
+                    func, code, pc, local, base = frames.pop()
+                elif op == _DIVI:
+                    b = pop()
+                    a = stack[-1]
+                    q = abs(a) // abs(b)
+                    stack[-1] = q if (a < 0) == (b < 0) else -q
+                elif op == _DIVF:
+                    b = pop()
+                    stack[-1] = stack[-1] / b
+                elif op == _ITOF:
+                    stack[-1] = float(stack[-1])
+                elif op == _FTOI:
+                    stack[-1] = int(stack[-1])
+                elif op == _PRINTI:
+                    write(f"{pop()}\n")
+                elif op == _PRINTB:
+                    write(chr(pop() & 0xFF))
+                elif op == _PEEKI:
+                    stack[-1] = unpack_i(memory, stack[-1])[0]
+                elif op == _PEEKF:
+                    stack[-1] = unpack_f(memory, stack[-1])[0]
+                elif op == _PEEKB:
+                    stack[-1] = memory[stack[-1]]
+                elif op == _POKEI:
+                    value = pop()
+                    pack_i(memory, pop(), value)
+                elif op == _POKEF:
+                    value = pop()
+                    pack_f(memory, pop(), value)
+                elif op == _POKEB:
+                    value = pop()
+                    memory[pop()] = value & 0xFF
+                elif op == _GROW:
+                    memory.extend(bytes(stack[-1]))
+                    stack[-1] = len(memory)
+                elif op == _DUP:
+                    push(stack[-1])
+                elif op == _POP:
+                    del stack[-arg:]
+                elif op == _SWAP:
+                    stack[-1], stack[-2] = stack[-2], stack[-1]
+                elif op == _RUNTIME_ERROR:
+                    raise VMRuntimeError(
+                        f"Error en tiempo de ejecución: {arg}", func.name
+                    )
+        except (IndexError, struct.error, ZeroDivisionError, OverflowError) as error:
+            op = code[pc - 1][0]
+            if op in _memory_opcodes:
+                message = f"Acceso a memoria fuera de rango ({error})."
+            elif op in (_DIVI, _DIVF):
+                message = "Error en tiempo de ejecución: DivisionByZero"
+            else:
+                message = f"Error interno del VM: {error}"
+            raise VMRuntimeError(message, func.name) from None
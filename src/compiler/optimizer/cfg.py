@@ -0,0 +1,340 @@
+"""
+Grafo de flujo de control de una `IRFunction`.
+
+El IR solo tiene marcadores estructurados, que el VM resuelve así: `IF`
+salta tras el `ELSE` (o al `ENDIF`) si la condición es falsa, `ELSE` salta al
+`ENDIF`, `CBREAK` salta tras el `ENDLOOP` si la condición es verdadera y
+`CONTINUE`/`ENDLOOP` saltan al `LOOP`. Con esas reglas el código lineal se
+parte en bloques básicos:
+
+- Un bloque empieza en la posición 0, en cada etiqueta (`LOOP`, `ENDIF`) y
+  después de cada instrucción que termina un bloque (`IF`, `ELSE`, `CBREAK`,
+  `CONTINUE`, `ENDLOOP`, `RET`, `RUNTIME_ERROR`).
+- Cada bloque conserva sus instrucciones tal cual, marcadores incluidos, así
+  que `lower()` recupera el código lineal concatenándolos en orden.
+- Al final siempre hay un bloque vacío: el retorno implícito que agrega el VM.
+
+Un `IF` o `CBREAK` precedido por una constante tiene un solo sucesor.
+
+Los bucles salen de los marcadores: el cuerpo de un `LOOP` son los bloques
+contiguos hasta el de su `ENDLOOP`, y el anidamiento es el de los marcadores.
+Todo se construye en tiempo casi lineal, porque un programa puede tener
+decenas de miles de bloques anidados.
+"""
+
+from bisect import bisect_right
+
+_LABELS = frozenset({"LOOP", "ENDIF"})
+_TERMINATORS = frozenset(
+    {"IF", "ELSE", "CBREAK", "CONTINUE", "ENDLOOP", "RET", "RUNTIME_ERROR"}
+)
+# Marcadores que pertenecen a un IF o LOOP abierto antes.
+_CLOSERS = frozenset({"ELSE", "ENDIF", "CBREAK", "CONTINUE", "ENDLOOP"})
+
+
+class BasicBlock:
+    __slots__ = ("index", "start", "instructions", "successors", "predecessors")
+
+    def __init__(self, index, start):
+        self.index = index
+        # Posición de su primera instrucción en el código lineal.
+        self.start = start
+        self.instructions = []
+        self.successors = []
+        self.predecessors = []
+
+    @property
+    def terminator(self):
+        return self.instructions[-1][0] if self.instructions else None
+
+    def __repr__(self):
+        return f"BasicBlock({self.index}, start={self.start}, size={len(self.instructions)})"
+
+
+class Loop:
+    """Bucle: `header` y el rango `blocks` de índices de sus bloques."""
+
+    __slots__ = ("header", "blocks", "parent", "depth")
+
+    def __init__(self, header, blocks):
+        self.header = header
+        self.blocks = blocks
+        self.parent = None
+        self.depth = 1
+
+    def __repr__(self):
+        return f"Loop(header={self.header}, blocks={self.blocks}, depth={self.depth})"
+
+
+class ControlFlowGraph:
+    """
+    `blocks` en el orden del código, `entry` es `blocks[0]`. Los dominadores
+    y los bucles se calculan sobre los bloques alcanzables desde la entrada.
+    """
+
+    def __init__(self, code):
+        self.code = code
+        self.blocks = []
+        # Posición de cada marcador -> posición de su IF o LOOP.
+        self.openers = {}
+        self._block_at = {}
+        # Para cada LOOP, la posición de su ENDLOOP, en el orden del código.
+        self._loop_end = {}
+        self._build_blocks()
+        self._starts = [block.start for block in self.blocks]
+        self._link_blocks()
+        self.entry = self.blocks[0]
+        self.reachable = self._reachable()
+        self.idom = self._dominators()
+        self._number_dominator_tree()
+        self.loops = self._loops()
+        self._depths = self._block_depths()
+
+    @classmethod
+    def from_function(cls, function):
+        return cls(function.code)
+
+    def _build_blocks(self):
+        code = self.code
+        block = None
+        for position, instruction in enumerate(code):
+            opcode = instruction[0]
+            if block is None or opcode in _LABELS:
+                block = self._new_block(position)
+            block.instructions.append(instruction)
+            if opcode in _TERMINATORS:
+                block = None
+        # Retorno implícito del VM; también es el destino de un CBREAK o de un
+        # IF cuyo ENDLOOP/ENDIF es la última instrucción.
+        self._new_block(len(code))
+
+    def _new_block(self, start):
+        block = BasicBlock(len(self.blocks), start)
+        self.blocks.append(block)
+        self._block_at[start] = block
+        return block
+
+    def _link_blocks(self):
+        code = self.code
+        # Para cada IF/LOOP, la posición de su ELSE/ENDIF/ENDLOOP.
+        pending = []
+        pending_loops = []
+        else_of = {}
+        end_of = {}
+        for position, instruction in enumerate(code):
+            opcode = instruction[0]
+            if opcode in ("IF", "LOOP"):
+                pending.append(position)
+                if opcode == "LOOP":
+                    pending_loops.append(position)
+                    self._loop_end[position] = None
+            elif opcode in _CLOSERS:
+                if opcode in ("ELSE", "ENDIF"):
+                    opener = pending[-1]
+                elif pending_loops:
+                    opener = pending_loops[-1]
+                else:
+                    raise ValueError("CBREAK/CONTINUE/ENDLOOP fuera de un LOOP")
+                self.openers[position] = opener
+                if opcode == "ELSE":
+                    else_of[opener] = position
+                elif opcode in ("ENDIF", "ENDLOOP"):
+                    end_of[opener] = position
+                    pending.pop()
+                    if opcode == "ENDLOOP":
+                        self._loop_end[opener] = position
+                        pending_loops.pop()
+
+        for index, block in enumerate(self.blocks):
+            if not block.instructions:
+                continue
+            position = block.start + len(block.instructions) - 1
+            opcode = block.terminator
+            following = self.blocks[index + 1] if index + 1 < len(self.blocks) else None
+            constant = self._constant_condition(block)
+            if opcode == "IF":
+                target = else_of.get(position)
+                false_target = (
+                    self._block_at[target + 1] if target is not None
+                    else self._block_at[end_of[position]]
+                )
+                if constant is None or constant:
+                    self._add_edge(block, following)
+                if constant is None or not constant:
+                    self._add_edge(block, false_target)
+            elif opcode == "ELSE":
+                self._add_edge(block, self._block_at[end_of[self.openers[position]]])
+            elif opcode == "CBREAK":
+                if constant is None or not constant:
+                    self._add_edge(block, following)
+                if constant is None or constant:
+                    exit_position = end_of[self.openers[position]] + 1
+                    self._add_edge(block, self._block_at[exit_position])
+            elif opcode in ("CONTINUE", "ENDLOOP"):
+                self._add_edge(block, self._block_at[self.openers[position]])
+            elif opcode not in ("RET", "RUNTIME_ERROR"):
+                self._add_edge(block, following)
+
+    @staticmethod
+    def _constant_condition(block):
+        # Valor de verdad de la constante que consume un IF/CBREAK, o None.
+        instructions = block.instructions
+        if len(instructions) < 2 or instructions[-1][0] not in ("IF", "CBREAK"):
+            return None
+        previous = instructions[-2]
+        if previous[0] in ("CONSTI", "CONSTF"):
+            return bool(previous[1])
+        return None
+
+    @staticmethod
+    def _add_edge(source, target):
+        if target is None or target in source.successors:
+            return
+        source.successors.append(target)
+        target.predecessors.append(source)
+
+    def _reachable(self):
+        seen = {self.entry.index}
+        pending = [self.entry]
+        while pending:
+            for successor in pending.pop().successors:
+                if successor.index not in seen:
+                    seen.add(successor.index)
+                    pending.append(successor)
+        return seen
+
+    def reverse_postorder(self):
+        order = []
+        seen = {self.entry.index}
+        stack = [(self.entry, iter(self.entry.successors))]
+        while stack:
+            block, successors = stack[-1]
+            for successor in successors:
+                if successor.index not in seen:
+                    seen.add(successor.index)
+                    stack.append((successor, iter(successor.successors)))
+                    break
+            else:
+                stack.pop()
+                order.append(block)
+        order.reverse()
+        return order
+
+    def _dominators(self):
+        # Cooper, Harvey y Kennedy: iterar sobre el orden postorden inverso
+        # hasta que ningún dominador inmediato cambia.
+        order = self.reverse_postorder()
+        rank = {block.index: position for position, block in enumerate(order)}
+        idom = {self.entry.index: self.entry.index}
+        changed = True
+        while changed:
+            changed = False
+            for block in order[1:]:
+                new_idom = None
+                for predecessor in block.predecessors:
+                    if predecessor.index not in idom:
+                        continue
+                    if new_idom is None:
+                        new_idom = predecessor.index
+                        continue
+                    first, second = predecessor.index, new_idom
+                    while first != second:
+                        while rank[first] > rank[second]:
+                            first = idom[first]
+                        while rank[second] > rank[first]:
+                            second = idom[second]
+                    new_idom = first
+                if idom.get(block.index) != new_idom:
+                    idom[block.index] = new_idom
+                    changed = True
+        return idom
+
+    def _number_dominator_tree(self):
+        # Numeración previa y posterior del árbol de dominadores: `a` domina
+        # a `b` exactamente cuando el intervalo de `b` está dentro del de `a`.
+        children = {}
+        for block, parent in self.idom.items():
+            if block != parent:
+                children.setdefault(parent, []).append(block)
+        self._preorder = {}
+        self._postorder = {}
+        counter = 0
+        stack = [(self.entry.index, False)]
+        while stack:
+            block, finished = stack.pop()
+            if finished:
+                self._postorder[block] = counter
+            else:
+                self._preorder[block] = counter
+                stack.append((block, True))
+                stack.extend((child, False) for child in children.get(block, ()))
+            counter += 1
+
+    def dominates(self, dominator, block):
+        """Si el bloque `dominator` domina a `block` (índices)."""
+        if block not in self.idom or dominator not in self.idom:
+            return False
+        return (
+            self._preorder[dominator] <= self._preorder[block]
+            and self._postorder[block] <= self._postorder[dominator]
+        )
+
+    def _loops(self):
+        loops = []
+        # Bucles abiertos con la posición de su ENDLOOP.
+        enclosing = []
+        for position, end in self._loop_end.items():
+            while enclosing and enclosing[-1][1] < position:
+                enclosing.pop()
+            header = self._block_at[position]
+            # Solo se entra a un LOOP por su marcador: si es inalcanzable,
+            # también lo son los bucles que contiene.
+            if header.index not in self.reachable:
+                continue
+            last = self._block_of(end)
+            loop = Loop(header.index, range(header.index, last.index + 1))
+            if enclosing:
+                loop.parent = enclosing[-1][0]
+                loop.depth = loop.parent.depth + 1
+            enclosing.append((loop, end))
+            loops.append(loop)
+        return loops
+
+    def _block_depths(self):
+        # Cada bucle suma uno a su rango de bloques: diferencias y suma
+        # acumulada en vez de recorrer cada rango.
+        changes = [0] * (len(self.blocks) + 1)
+        for loop in self.loops:
+            changes[loop.blocks.start] += 1
+            changes[loop.blocks.stop] -= 1
+        depths = []
+        depth = 0
+        for change in changes[:-1]:
+            depth += change
+            depths.append(depth)
+        return depths
+
+    def loop_depth(self, block):
+        """Cuántos bucles contienen al bloque `block` (índice)."""
+        return self._depths[block]
+
+    def lower(self, only_reachable=False):
+        """
+        El código lineal. Con `only_reachable` se omiten los bloques
+        inalcanzables, salvo los marcadores ELSE/ENDIF/ENDLOOP cuyo IF o LOOP
+        sigue en el código, para que la estructura quede balanceada.
+        """
+        code = []
+        for block in self.blocks:
+            if not only_reachable or block.index in self.reachable:
+                code.extend(block.instructions)
+                continue
+            for offset, instruction in enumerate(block.instructions):
+                if instruction[0] in ("ELSE", "ENDIF", "ENDLOOP"):
+                    opener = self.openers[block.start + offset]
+                    if self._block_of(opener).index in self.reachable:
+                        code.append(instruction)
+        return code
+
+    def _block_of(self, position):
+        return self.blocks[max(bisect_right(self._starts, position) - 1, 0)]
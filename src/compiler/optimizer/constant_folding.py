@@ -0,0 +1,180 @@
+from ..shared.AST.grammar.binary_operator import BinaryOp
+from ..shared.AST.grammar.cast import Cast
+from ..shared.AST.grammar.identifier_location import IdentifierLocation
+from ..shared.AST.grammar.literal import Literal
+from ..shared.AST.grammar.unary_operator import UnaryOp
+from ..shared.AST.grammar.vardecl import VarDecl
+from ..shared.AST.visitor import NodeTransformer, walk
+from ..shared.symtable.symbol import SymbolKind
+
+# Aritmética con la misma semántica que la VM: enteros de Python sin
+# desbordamiento, división entera truncada hacia cero (DIVI) y flotantes IEEE.
+_ARITHMETIC = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+}
+_COMPARISON = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+}
+
+
+def _divide(a, b):
+    if isinstance(a, float):
+        return a / b
+    quotient = abs(a) // abs(b)
+    return quotient if (a < 0) == (b < 0) else -quotient
+
+
+def literal_value(node):
+    """Valor de un literal int, float o bool; `None` para todo lo demás."""
+    if node.__class__ is not Literal:
+        return None
+    token = node.type_token
+    if token == "INTEGER":
+        return int(node.value)
+    if token == "FLOAT":
+        return float(node.value)
+    if token == "TRUE":
+        return True
+    if token == "FALSE":
+        return False
+    return None
+
+
+def make_literal(value, semantic_type):
+    if semantic_type == "bool":
+        literal = Literal("true" if value else "false", "TRUE" if value else "FALSE")
+    elif semantic_type == "float":
+        literal = Literal(repr(float(value)), "FLOAT")
+    else:
+        literal = Literal(str(int(value)), "INTEGER")
+    literal.semantic_type = semantic_type
+    return literal
+
+
+class ConstantFolder(NodeTransformer):
+    """
+    Plegado de constantes sobre el AST ya verificado por el checker.
+
+    - Evalúa operaciones binarias, `-`/`+` unarios y casts int <-> float
+      cuyos operandos son literales, con la semántica de la VM.
+    - Reemplaza cada lectura de un `const` cuyo inicializador quedó en un
+      literal por ese literal, y elimina su declaración: ya no queda ningún
+      uso, así que tampoco se genera su global.
+    - Un divisor que es la constante cero es un error de compilación, salvo
+      que la división quede en un operando de `&&`/`||` que nunca se evalúa;
+      con un divisor no constante se conserva el chequeo `DivisionByZero`
+      en tiempo de ejecución.
+
+    No se pliegan `!` ni `^` (este último reserva memoria), ni los
+    caracteres. Requiere un AST de objetos: las vistas de `ASTArena` son de
+    solo lectura.
+    """
+
+    def __init__(self):
+        self.errors = []
+        # (línea, columna, mensaje) de cada error, como `Checker.diagnostics`.
+        self.diagnostics = []
+        self.constants = {}
+        self.folded = 0
+        # División -> token del operador, para las divisiones por cero que
+        # todavía pueden descartarse al plegar un `&&`/`||`.
+        self._zero_divisions = {}
+
+    def fold(self, ast):
+        self.transform(ast)
+        for token in self._zero_divisions.values():
+            self._add_error(
+                "División por cero: el divisor es una constante igual a cero.", token
+            )
+        return not self.errors
+
+    def _add_error(self, message, token):
+        line = token.line if token else "N/A"
+        column = token.column if token else "N/A"
+        self.errors.append(f"Error Semántico (Línea {line}, Col {column}): {message}")
+        self.diagnostics.append((line, column, message))
+
+    def _visit_VarDecl(self, node: VarDecl):
+        symbol = node.defined_symbol
+        if (
+            symbol is not None
+            and symbol.kind == SymbolKind.CONSTANT
+            and literal_value(node.initializer) is not None
+        ):
+            self.constants[symbol] = node.initializer
+            return None
+        return node
+
+    def _visit_IdentifierLocation(self, node: IdentifierLocation):
+        literal = self.constants.get(node.referenced_symbol)
+        if literal is None:
+            return node
+        self.folded += 1
+        return make_literal(literal_value(literal), literal.semantic_type)
+
+    def _visit_UnaryOp(self, node: UnaryOp):
+        value = literal_value(node.expr)
+        if value is None or node.op not in ("+", "-") or node.semantic_type not in (
+            "int",
+            "float",
+        ):
+            return node
+        self.folded += 1
+        return make_literal(-value if node.op == "-" else value, node.semantic_type)
+
+    def _visit_Cast(self, node: Cast):
+        value = literal_value(node.expression)
+        source_type = node.expression.semantic_type
+        if value is None or source_type not in ("int", "float"):
+            return node
+        if node.cast_type not in ("int", "float"):
+            return node
+        self.folded += 1
+        # FTOI trunca como int(); ITOF es float().
+        return make_literal(
+            int(value) if node.cast_type == "int" else float(value), node.cast_type
+        )
+
+    def _visit_BinaryOp(self, node: BinaryOp):
+        op = node.op
+        left = literal_value(node.left)
+        right = literal_value(node.right)
+        if op in ("&&", "||"):
+            return self._fold_logical(node, left)
+        if op == "/" and right is not None and right == 0 and not isinstance(right, bool):
+            self._zero_divisions[node] = node.op_token
+            return node
+        if left is None or right is None or isinstance(left, bool) or node.semantic_type is None:
+            return node
+        if isinstance(left, float) or isinstance(right, float):
+            # La VM convierte el operando entero con ITOF antes de operar.
+            left, right = float(left), float(right)
+        if op in _ARITHMETIC:
+            value = _ARITHMETIC[op](left, right)
+        elif op == "/":
+            value = _divide(left, right)
+        elif op in _COMPARISON:
+            value = _COMPARISON[op](left, right)
+        else:
+            return node
+        self.folded += 1
+        return make_literal(value, node.semantic_type)
+
+    def _fold_logical(self, node, left):
+        # Con el operando izquierdo constante, `&&`/`||` se resuelven sin
+        # cambiar qué se evalúa: el derecho solo se conserva si se ejecutaría.
+        if not isinstance(left, bool) or node.right.semantic_type != "bool":
+            return node
+        self.folded += 1
+        if (node.op == "&&") == left:
+            return node.right
+        for dropped in walk(node.right):
+            self._zero_divisions.pop(dropped, None)
+        return make_literal(left, "bool")
@@ -0,0 +1,192 @@
+"""
+Eliminación de subexpresiones comunes dentro de cada bloque básico.
+
+Se simula la pila del bloque numerando valores: dos cálculos puros (cargas
+de locales y globales, constantes, aritmética sin división, comparaciones y
+conversiones) con los mismos operandos reciben el mismo número. Un
+`LOCAL_SET`/`GLOBAL_SET` crea una versión nueva de la variable y un `CALL`
+invalida todas las globales, así que los números nunca cruzan una
+escritura.
+
+Cuando un valor se calcula varias veces, la primera se guarda en una local
+nueva (`DUP; LOCAL_SET $cseN`) y las siguientes se reemplazan por
+`LOCAL_GET $cseN`. Solo se hace si ahorra instrucciones: guardar cuesta dos.
+"""
+
+from ..interpreter.ir_generator import IRModule
+from .cfg import ControlFlowGraph
+
+_BINARY = frozenset(
+    {
+        "ADDI", "ADDF", "SUBI", "SUBF", "MULI", "MULF",
+        "LTI", "LTF", "LEI", "LEF", "GTI", "GTF",
+        "GEI", "GEF", "EQI", "EQF", "NEI", "NEF",
+    }
+)
+_COMMUTATIVE = frozenset({"ADDI", "ADDF", "MULI", "MULF", "EQI", "EQF", "NEI", "NEF"})
+_COMPARISONS = frozenset(
+    {"LTI", "LTF", "LEI", "LEF", "GTI", "GTF", "GEI", "GEF", "EQI", "EQF", "NEI", "NEF"}
+)
+_CONVERSIONS = {"ITOF": "F", "FTOI": "I"}
+# Instrucciones impuras: cuántos valores sacan de la pila y cuántos dejan.
+_STACK_EFFECTS = {
+    "PRINTI": (1, 0),
+    "PRINTF": (1, 0),
+    "PRINTB": (1, 0),
+    "PEEKI": (1, 1),
+    "PEEKF": (1, 1),
+    "PEEKB": (1, 1),
+    "POKEI": (2, 0),
+    "POKEF": (2, 0),
+    "POKEB": (2, 0),
+    "GROW": (1, 1),
+    "DUP": (1, 2),
+    "SWAP": (2, 2),
+    "DIVI": (2, 1),
+    "DIVF": (2, 1),
+    "IF": (1, 0),
+    "CBREAK": (1, 0),
+    "RET": (1, 0),
+}
+
+
+class _Value:
+    __slots__ = ("number", "start", "end", "kind")
+
+    def __init__(self, number, start, end, kind):
+        self.number = number
+        # Posiciones de la primera y la última instrucción que lo calculan;
+        # `start` es None si ese rango no se puede reemplazar.
+        self.start = start
+        self.end = end
+        self.kind = kind
+
+
+class CommonSubexpressionEliminator:
+    """`eliminated` cuenta los cálculos reemplazados por una local."""
+
+    def __init__(self):
+        self.eliminated = 0
+
+    def optimize_module(self, module: IRModule):
+        for function in module.functions.values():
+            if not function.imported:
+                self.optimize_function(function)
+        return module
+
+    def optimize_function(self, function):
+        cfg = ControlFlowGraph.from_function(function)
+        changed = False
+        for block in cfg.blocks:
+            while self._eliminate_one(function, block):
+                changed = True
+        if changed:
+            function.code = cfg.lower()
+        return function
+
+    def _eliminate_one(self, function, block):
+        # Reemplaza la subexpresión repetida que más instrucciones ahorra.
+        occurrences = self._number_values(function, block.instructions)
+        best = None
+        for values in occurrences.values():
+            if len(values) < 2:
+                continue
+            first = values[0]
+            later = [value for value in values[1:] if value.start is not None]
+            # Cada rango reemplazado queda en una instrucción.
+            saving = sum(value.end - value.start for value in later) - 2
+            if saving > 0 and (best is None or saving > best[0]):
+                best = (saving, first, later)
+        if best is None:
+            return False
+        _, first, later = best
+        # `$` no puede aparecer en un identificador de GOX.
+        name = f"$cse{len(function.locals)}"
+        function.new_local(name, first.kind)
+        instructions = block.instructions
+        for value in reversed(later):
+            instructions[value.start : value.end + 1] = [("LOCAL_GET", name)]
+        instructions[first.end + 1 : first.end + 1] = [("DUP",), ("LOCAL_SET", name)]
+        self.eliminated += len(later)
+        return True
+
+    def _number_values(self, function, instructions):
+        numbers = {}
+        versions = {}
+        global_epoch = 0
+        stack = []
+        occurrences = {}
+        # Última posición con un efecto: ningún rango reemplazable la cruza.
+        barrier = -1
+
+        def unknown(position):
+            numbers[("unknown", position, len(numbers))] = number = len(numbers)
+            return _Value(number, None, position, None)
+
+        def pop(position):
+            return stack.pop() if stack else unknown(position)
+
+        for position, instruction in enumerate(instructions):
+            opcode = instruction[0]
+            key = None
+            if opcode == "LOCAL_GET":
+                name = instruction[1]
+                key = ("L", name, versions.get(("L", name), 0))
+                kind = function.locals.get(name, "I")
+                start = position
+            elif opcode == "GLOBAL_GET":
+                name = instruction[1]
+                key = ("G", name, versions.get(("G", name), 0), global_epoch)
+                global_ = function.module.globals.get(name)
+                kind = global_.type if global_ else "I"
+                start = position
+            elif opcode in ("CONSTI", "CONSTF"):
+                # repr distingue 0.0 de -0.0.
+                key = (opcode, repr(instruction[1]))
+                kind = opcode[-1]
+                start = position
+            elif opcode in _BINARY:
+                right = pop(position)
+                left = pop(position)
+                operands = (left.number, right.number)
+                if opcode in _COMMUTATIVE:
+                    operands = tuple(sorted(operands))
+                key = (opcode,) + operands
+                kind = "I" if opcode in _COMPARISONS else opcode[-1]
+                start = left.start if right.start is not None else None
+            elif opcode in _CONVERSIONS:
+                operand = pop(position)
+                key = (opcode, operand.number)
+                kind = _CONVERSIONS[opcode]
+                start = operand.start
+            if key is not None:
+                if start is not None and start <= barrier:
+                    start = None
+                number = numbers.setdefault(key, len(numbers))
+                value = _Value(number, start, position, kind)
+                stack.append(value)
+                occurrences.setdefault(number, []).append(value)
+                continue
+
+            barrier = position
+            if opcode == "LOCAL_SET" or opcode == "GLOBAL_SET":
+                pop(position)
+                variable = ("L" if opcode == "LOCAL_SET" else "G", instruction[1])
+                versions[variable] = versions.get(variable, 0) + 1
+            elif opcode == "CALL":
+                callee = function.module.functions.get(instruction[1])
+                for _ in range(len(callee.parmnames) if callee else 0):
+                    pop(position)
+                global_epoch += 1
+                stack.append(unknown(position))
+            elif opcode == "POP":
+                for _ in range(instruction[1] if len(instruction) > 1 else 1):
+                    pop(position)
+            elif opcode in _STACK_EFFECTS:
+                popped, pushed = _STACK_EFFECTS[opcode]
+                for _ in range(popped):
+                    pop(position)
+                for _ in range(pushed):
+                    stack.append(unknown(position))
+            # Los marcadores y RUNTIME_ERROR no mueven la pila dentro del bloque.
+        return occurrences
@@ -0,0 +1,39 @@
+from ..interpreter.ir_generator import IRModule
+from .cfg import ControlFlowGraph
+
+
+class DeadCodeEliminator:
+    """
+    Elimina el código inalcanzable de cada función usando su
+    `ControlFlowGraph`: lo que sigue a un `RET`, a un `CBREAK` con condición
+    constante verdadera (un `break`), a un `CONTINUE` o a un
+    `RUNTIME_ERROR` hasta la siguiente etiqueta, y las ramas de un `IF` cuya
+    condición es constante. Los marcadores de un IF o LOOP que sigue
+    alcanzable se conservan para que el VM pueda resolver los saltos.
+
+    `removed_blocks` y `removed_instructions` acumulan lo eliminado.
+    """
+
+    def __init__(self):
+        self.removed_blocks = 0
+        self.removed_instructions = 0
+
+    def optimize_module(self, module: IRModule):
+        for function in module.functions.values():
+            if not function.imported:
+                self.optimize_function(function)
+        return module
+
+    def optimize_function(self, function):
+        cfg = ControlFlowGraph.from_function(function)
+        if len(cfg.reachable) == len(cfg.blocks):
+            return function
+        code = cfg.lower(only_reachable=True)
+        self.removed_blocks += sum(
+            1
+            for block in cfg.blocks
+            if block.index not in cfg.reachable and block.instructions
+        )
+        self.removed_instructions += len(function.code) - len(code)
+        function.code = code
+        return function
@@ -0,0 +1,256 @@
+"""
+Movimiento de código invariante de los bucles `while`.
+
+Con los bucles del `ControlFlowGraph`, una expresión del bucle es invariante
+si solo lee constantes, locales que ningún bloque del bucle escribe y
+globales que el bucle no escribe (si el bucle hace un `CALL`, ninguna global
+es invariante). Cada expresión invariante maximal se calcula una vez antes
+del `LOOP` más externo respecto del cual lo es, se guarda en una local nueva
+(`$licmN`) y en el bucle se reemplaza por `LOCAL_GET $licmN`.
+
+Solo se mueven sumas, restas, productos y comparaciones: nunca llamadas,
+lecturas de memoria (`PEEK*`) ni nada que pueda fallar, como la división o
+las conversiones (`FTOI` de un infinito o `ITOF` de un entero enorme).
+Como lo que se mueve no tiene efectos ni falla, calcularlo aunque el bucle
+no itere no cambia el programa.
+"""
+
+from bisect import bisect_left
+
+from ..interpreter.ir_generator import IRModule
+from .cfg import ControlFlowGraph
+
+_HOISTABLE = frozenset(
+    {
+        "ADDI", "ADDF", "SUBI", "SUBF", "MULI", "MULF",
+        "LTI", "LTF", "LEI", "LEF", "GTI", "GTF",
+        "GEI", "GEF", "EQI", "EQF", "NEI", "NEF",
+    }
+)
+_COMPARISONS = frozenset(
+    {"LTI", "LTF", "LEI", "LEF", "GTI", "GTF", "GEI", "GEF", "EQI", "EQF", "NEI", "NEF"}
+)
+# Cuántos valores saca y deja cada instrucción que no es una carga, una
+# constante ni una operación de `_HOISTABLE`.
+_STACK_EFFECTS = {
+    "LOCAL_SET": (1, 0),
+    "GLOBAL_SET": (1, 0),
+    "PRINTI": (1, 0),
+    "PRINTF": (1, 0),
+    "PRINTB": (1, 0),
+    "PEEKI": (1, 1),
+    "PEEKF": (1, 1),
+    "PEEKB": (1, 1),
+    "POKEI": (2, 0),
+    "POKEF": (2, 0),
+    "POKEB": (2, 0),
+    "GROW": (1, 1),
+    "DUP": (1, 2),
+    "SWAP": (2, 2),
+    "DIVI": (2, 1),
+    "DIVF": (2, 1),
+    "ITOF": (1, 1),
+    "FTOI": (1, 1),
+    "IF": (1, 0),
+    "CBREAK": (1, 0),
+    "RET": (1, 0),
+}
+
+
+class _Value:
+    __slots__ = ("start", "end", "kind", "level", "operation")
+
+    def __init__(self, start, end, kind, level, operation=False):
+        # `start` es None si el rango no es un cálculo puro contiguo.
+        self.start = start
+        self.end = end
+        self.kind = kind
+        # Índice del bucle más externo de la cadena del bloque respecto del
+        # cual el valor es invariante; el largo de la cadena si de ninguno.
+        self.level = level
+        self.operation = operation
+
+
+class LoopInvariantCodeMotion:
+    """`hoisted` cuenta las expresiones movidas fuera de un bucle."""
+
+    def __init__(self):
+        self.hoisted = 0
+
+    def optimize_module(self, module: IRModule):
+        for function in module.functions.values():
+            if not function.imported:
+                self.optimize_function(function)
+        return module
+
+    def optimize_function(self, function):
+        # Un solo grafo y una sola pasada por los bloques: cada expresión sale
+        # hasta el bucle más externo respecto del cual es invariante, y sus
+        # partes invariantes en bucles aún más externos salen a esos.
+        cfg = ControlFlowGraph.from_function(function)
+        if not cfg.loops:
+            return function
+        self._index_writes(cfg)
+        preheaders = {}
+        temporaries = {}
+        loops = iter(cfg.loops)
+        next_loop = next(loops, None)
+        chain = []
+        for block in cfg.blocks:
+            while chain and chain[-1].blocks.stop <= block.index:
+                chain.pop()
+            if next_loop is not None and next_loop.header == block.index:
+                chain.append(next_loop)
+                next_loop = next(loops, None)
+            if chain:
+                self._hoist(function, block, chain, preheaders, temporaries)
+        for header, preheader in preheaders.items():
+            # El bloque cabecera empieza con el LOOP: lo insertado antes corre
+            # una vez al entrar, no en cada iteración.
+            cfg.blocks[header].instructions[0:0] = preheader
+        if preheaders:
+            function.code = cfg.lower()
+        return function
+
+    def _index_writes(self, cfg):
+        # Bloques (en orden) que escriben cada variable y los que hacen CALL,
+        # para saber en O(log n) si un rango de bloques los contiene.
+        self._writes = {}
+        self._calls = []
+        for block in cfg.blocks:
+            for instruction in block.instructions:
+                opcode = instruction[0]
+                if opcode == "LOCAL_SET" or opcode == "GLOBAL_SET":
+                    blocks = self._writes.setdefault((opcode, instruction[1]), [])
+                    if not blocks or blocks[-1] != block.index:
+                        blocks.append(block.index)
+                elif opcode == "CALL" and (not self._calls or self._calls[-1] != block.index):
+                    self._calls.append(block.index)
+
+    @staticmethod
+    def _writers(chain, blocks):
+        # Los bucles de la cadena que contienen alguno de `blocks` son un
+        # prefijo (cada uno contiene al siguiente): su largo, por bisección.
+        low, high = 0, len(chain)
+        while low < high:
+            middle = (low + high) // 2
+            loop = chain[middle].blocks
+            position = bisect_left(blocks, loop.start)
+            if position < len(blocks) and blocks[position] < loop.stop:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _level(self, instruction, chain):
+        opcode = instruction[0]
+        if opcode in ("CONSTI", "CONSTF"):
+            return 0
+        if opcode == "LOCAL_GET":
+            return self._writers(chain, self._writes.get(("LOCAL_SET", instruction[1]), ()))
+        # Si un bucle hace un CALL, ninguna global es invariante en él.
+        return max(
+            self._writers(chain, self._writes.get(("GLOBAL_SET", instruction[1]), ())),
+            self._writers(chain, self._calls),
+        )
+
+    def _hoist(self, function, block, chain, preheaders, temporaries):
+        instructions = block.instructions
+        values = self._invariant_values(function, instructions, chain)
+        if not values:
+            return
+        # Los rangos movidos se anidan: se recorren una vez con una pila de
+        # los abiertos, y cada instrucción va al más interno que la contiene.
+        starting = {}
+        for value in values:
+            starting.setdefault(value.start, []).append(value)
+        code = []
+        open_values = [(None, code)]
+        for position, instruction in enumerate(instructions):
+            for value in sorted(starting.get(position, ()), key=lambda value: -value.end):
+                open_values.append((value, []))
+            open_values[-1][1].append(instruction)
+            while open_values[-1][0] is not None and open_values[-1][0].end == position:
+                value, expression = open_values.pop()
+                loop = chain[value.level]
+                key = (loop.header, tuple(expression))
+                name = temporaries.get(key)
+                if name is None:
+                    # `$` no puede aparecer en un identificador de GOX.
+                    name = f"$licm{len(function.locals)}"
+                    function.new_local(name, value.kind)
+                    temporaries[key] = name
+                    preheader = preheaders.setdefault(loop.header, [])
+                    preheader.extend(expression)
+                    preheader.append(("LOCAL_SET", name))
+                open_values[-1][1].append(("LOCAL_GET", name))
+                self.hoisted += 1
+        block.instructions = code
+
+    def _invariant_values(self, function, instructions, chain):
+        # Simula la pila del bloque; devuelve las expresiones que se mueven:
+        # operaciones invariantes en algún bucle de la cadena cuyo consumidor
+        # no lo es en ese mismo bucle.
+        outside = len(chain)
+        stack = []
+        values = []
+        barrier = -1
+
+        def unknown():
+            return _Value(None, None, None, outside)
+
+        def consume(value, level):
+            if value.operation and value.level < level:
+                values.append(value)
+
+        def pop():
+            consume(stack.pop() if stack else unknown(), outside)
+
+        for position, instruction in enumerate(instructions):
+            opcode = instruction[0]
+            if opcode in ("CONSTI", "CONSTF", "LOCAL_GET", "GLOBAL_GET"):
+                if opcode in ("CONSTI", "CONSTF"):
+                    kind = opcode[-1]
+                elif opcode == "LOCAL_GET":
+                    kind = function.locals.get(instruction[1], "I")
+                else:
+                    global_ = function.module.globals.get(instruction[1])
+                    kind = global_.type if global_ else "I"
+                stack.append(_Value(position, position, kind, self._level(instruction, chain)))
+                continue
+            if opcode in _HOISTABLE:
+                right = stack.pop() if stack else unknown()
+                left = stack.pop() if stack else unknown()
+                start = left.start if right.start is not None else None
+                if start is not None and start <= barrier:
+                    start = None
+                level = max(left.level, right.level) if start is not None else outside
+                value = _Value(
+                    start,
+                    position,
+                    "I" if opcode in _COMPARISONS else opcode[-1],
+                    level,
+                    operation=True,
+                )
+                consume(left, level)
+                consume(right, level)
+                stack.append(value)
+                continue
+            barrier = position
+            if opcode == "CALL":
+                callee = function.module.functions.get(instruction[1])
+                for _ in range(len(callee.parmnames) if callee else 0):
+                    pop()
+                stack.append(unknown())
+            elif opcode == "POP":
+                for _ in range(instruction[1] if len(instruction) > 1 else 1):
+                    pop()
+            elif opcode in _STACK_EFFECTS:
+                popped, pushed = _STACK_EFFECTS[opcode]
+                for _ in range(popped):
+                    pop()
+                for _ in range(pushed):
+                    stack.append(unknown())
+        for value in stack:
+            consume(value, outside)
+        return values
@@ -0,0 +1,298 @@
+"""
+Optimizador peephole sobre `IRFunction.code`.
+
+Cada regla se registra con `@rule(nombre, *patrón)`: el patrón son los
+opcodes (o conjuntos de opcodes) que deben aparecer seguidos a partir de una
+posición, y la función recibe `(code, índice)` y devuelve `(fin, reemplazo)`
+para sustituir `code[índice:fin]`, o `None` si la regla no aplica. Todas las
+reglas acortan el código, así que repetir pasadas hasta que ninguna aplica
+termina siempre.
+
+Los marcadores estructurados (IF/ELSE/ENDIF, LOOP/CBREAK/CONTINUE/ENDLOOP)
+son las únicas etiquetas del IR y aparecen como instrucciones, de modo que un
+patrón de instrucciones contiguas nunca cruza un destino de salto.
+"""
+
+import math
+import operator
+
+from ..interpreter.ir_generator import IRModule
+
+_CONSTS = frozenset({"CONSTI", "CONSTF"})
+_MULS = frozenset({"MULI", "MULF"})
+
+
+def _divide_int(a, b):
+    quotient = abs(a) // abs(b)
+    return quotient if (a < 0) == (b < 0) else -quotient
+
+
+# Opcode -> función, con la misma semántica que el VM.
+_ARITHMETIC = {
+    "ADDI": operator.add,
+    "ADDF": operator.add,
+    "SUBI": operator.sub,
+    "SUBF": operator.sub,
+    "MULI": operator.mul,
+    "MULF": operator.mul,
+    "DIVI": _divide_int,
+    "DIVF": operator.truediv,
+}
+_COMPARISONS = {
+    "LTI": operator.lt,
+    "LTF": operator.lt,
+    "LEI": operator.le,
+    "LEF": operator.le,
+    "GTI": operator.gt,
+    "GTF": operator.gt,
+    "GEI": operator.ge,
+    "GEF": operator.ge,
+    "EQI": operator.eq,
+    "EQF": operator.eq,
+    "NEI": operator.ne,
+    "NEF": operator.ne,
+}
+# Negar una comparación de flotantes cambia el resultado con NaN salvo en
+# EQF/NEF, así que solo esas se invierten.
+_INVERTED_COMPARISONS = {
+    "LTI": "GEI",
+    "GEI": "LTI",
+    "LEI": "GTI",
+    "GTI": "LEI",
+    "EQI": "NEI",
+    "NEI": "EQI",
+    "EQF": "NEF",
+    "NEF": "EQF",
+}
+# x op c == x: (opcode, constante). `x + 0.0` no está porque `-0.0 + 0.0`
+# es `0.0`.
+_IDENTITIES = {
+    ("ADDI", 0),
+    ("SUBI", 0),
+    ("MULI", 1),
+    ("DIVI", 1),
+    ("SUBF", 0.0),
+    ("MULF", 1.0),
+    ("DIVF", 1.0),
+}
+_NEGATED_ARITHMETIC = {"ADDI": "SUBI", "SUBI": "ADDI", "ADDF": "SUBF", "SUBF": "ADDF"}
+
+
+class PeepholeRule:
+    __slots__ = ("name", "pattern", "rewrite")
+
+    def __init__(self, name, pattern, rewrite):
+        self.name = name
+        self.pattern = tuple(
+            frozenset({element}) if isinstance(element, str) else element
+            for element in pattern
+        )
+        self.rewrite = rewrite
+
+    def matches(self, code, index):
+        if index + len(self.pattern) > len(code):
+            return False
+        for offset, opcodes in enumerate(self.pattern):
+            if code[index + offset][0] not in opcodes:
+                return False
+        return True
+
+
+RULES = []
+
+
+def rule(name, *pattern):
+    """Registra la función decorada como regla de `RULES`."""
+
+    def register(rewrite):
+        RULES.append(PeepholeRule(name, pattern, rewrite))
+        return rewrite
+
+    return register
+
+
+def _kind(opcode):
+    # "CONSTI" -> "I", "ADDF" -> "F".
+    return opcode[-1]
+
+
+def _is_positive_zero(value):
+    return value == 0 and math.copysign(1.0, value) > 0
+
+
+@rule(
+    "constant_divisor",
+    _CONSTS,
+    "DUP",
+    _CONSTS,
+    {"EQI", "EQF"},
+    "IF",
+    "POP",
+    "RUNTIME_ERROR",
+    "ELSE",
+)
+def _constant_divisor(code, index):
+    # `CONST c; DUP; CONST 0; EQ; IF; POP 1; RUNTIME_ERROR; ELSE; <dividendo>;
+    # SWAP; DIV; ENDIF` con c != 0 -> `<dividendo>; CONST c; DIV`.
+    divisor = code[index]
+    if divisor[1] == 0:
+        return None
+    depth = 0
+    end = index + 8
+    while end < len(code):
+        opcode = code[end][0]
+        if opcode == "IF":
+            depth += 1
+        elif opcode == "ENDIF":
+            if depth == 0:
+                break
+            depth -= 1
+        end += 1
+    else:
+        return None
+    if end - 2 < index + 8 or code[end - 2][0] != "SWAP":
+        return None
+    if code[end - 1][0] not in ("DIVI", "DIVF"):
+        return None
+    return end + 1, code[index + 8 : end - 2] + [divisor, code[end - 1]]
+
+
+@rule("fold_constants", _CONSTS, _CONSTS, set(_ARITHMETIC) | set(_COMPARISONS))
+def _fold_constants(code, index):
+    (left_op, left), (right_op, right), (opcode,) = code[index : index + 3]
+    kind = _kind(opcode)
+    if _kind(left_op) != kind or _kind(right_op) != kind:
+        return None
+    if opcode in _COMPARISONS:
+        return index + 3, [("CONSTI", 1 if _COMPARISONS[opcode](left, right) else 0)]
+    if opcode in ("DIVI", "DIVF") and right == 0:
+        return None
+    try:
+        value = _ARITHMETIC[opcode](left, right)
+    except OverflowError:
+        return None
+    return index + 3, [("CONST" + kind, value)]
+
+
+@rule("fold_conversion", _CONSTS, {"ITOF", "FTOI"})
+def _fold_conversion(code, index):
+    (const_op, value), (opcode,) = code[index : index + 2]
+    if opcode == "ITOF" and const_op == "CONSTI":
+        try:
+            return index + 2, [("CONSTF", float(value))]
+        except OverflowError:
+            return None
+    if opcode == "FTOI" and const_op == "CONSTF" and math.isfinite(value):
+        return index + 2, [("CONSTI", int(value))]
+    return None
+
+
+@rule("identity_operand", _CONSTS, set(op for op, _ in _IDENTITIES))
+def _identity_operand(code, index):
+    (const_op, value), (opcode,) = code[index : index + 2]
+    if _kind(const_op) != _kind(opcode) or (opcode, value) not in _IDENTITIES:
+        return None
+    if opcode == "SUBF" and not _is_positive_zero(value):
+        return None
+    return index + 2, []
+
+
+def _is_negation(code, index):
+    const_op, value = code[index]
+    return value == -1 and _kind(const_op) == _kind(code[index + 1][0])
+
+
+@rule("double_negation", _CONSTS, _MULS, _CONSTS, _MULS)
+def _double_negation(code, index):
+    # -(-x) == x, también en flotantes (el signo de cero y NaN se conservan).
+    if _is_negation(code, index) and _is_negation(code, index + 2):
+        return index + 4, []
+    return None
+
+
+@rule("negated_operand", _CONSTS, _MULS, set(_NEGATED_ARITHMETIC))
+def _negated_operand(code, index):
+    # a + (-b) -> a - b y a - (-b) -> a + b.
+    opcode = code[index + 2][0]
+    if not _is_negation(code, index) or _kind(opcode) != _kind(code[index][0]):
+        return None
+    return index + 3, [(_NEGATED_ARITHMETIC[opcode],)]
+
+
+@rule("negated_comparison", set(_INVERTED_COMPARISONS), "CONSTI", "EQI")
+def _negated_comparison(code, index):
+    # `!` es `CONSTI 0; EQI`: negar una comparación es usar la contraria.
+    if code[index + 1][1] != 0:
+        return None
+    return index + 3, [(_INVERTED_COMPARISONS[code[index][0]],)]
+
+
+@rule("inverted_loop_test", set(_INVERTED_COMPARISONS), "CONSTI", "SUBI", "CBREAK")
+def _inverted_loop_test(code, index):
+    # `while` sale cuando `cond - 1` es distinto de cero; con una comparación
+    # (0 o 1) eso es la comparación contraria.
+    if code[index + 1][1] != 1:
+        return None
+    return index + 4, [(_INVERTED_COMPARISONS[code[index][0]],), ("CBREAK",)]
+
+
+@rule("never_break", "CONSTI", "CBREAK")
+def _never_break(code, index):
+    if code[index][1] != 0:
+        return None
+    return index + 2, []
+
+
+class PeepholeOptimizer:
+    """
+    Aplica `rules` (por defecto `RULES`, en orden de registro) a cada función
+    hasta que ninguna regla cambia el código. `hits` cuenta cuántas veces
+    aplicó cada regla y `passes` las pasadas hechas.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = list(RULES if rules is None else rules)
+        self.hits = {peephole_rule.name: 0 for peephole_rule in self.rules}
+        self.passes = 0
+        self._rules_by_opcode = {}
+        for peephole_rule in self.rules:
+            for opcode in peephole_rule.pattern[0]:
+                self._rules_by_opcode.setdefault(opcode, []).append(peephole_rule)
+
+    def optimize_module(self, module: IRModule):
+        for function in module.functions.values():
+            if not function.imported:
+                self.optimize_function(function)
+        return module
+
+    def optimize_function(self, function):
+        code = function.code
+        changed = True
+        while changed:
+            code, changed = self._pass(code)
+            self.passes += 1
+        function.code = code
+        return function
+
+    def _pass(self, code):
+        rules_by_opcode = self._rules_by_opcode
+        output = []
+        changed = False
+        index = 0
+        length = len(code)
+        while index < length:
+            for peephole_rule in rules_by_opcode.get(code[index][0], ()):
+                if not peephole_rule.matches(code, index):
+                    continue
+                rewritten = peephole_rule.rewrite(code, index)
+                if rewritten is None:
+                    continue
+                index, replacement = rewritten
+                output.extend(replacement)
+                self.hits[peephole_rule.name] += 1
+                changed = True
+                break
+            else:
+                output.append(code[index])
+                index += 1
+        return output, changed
@@ -0,0 +1,303 @@
+from array import array
+
+from ..grammar.gox_token import Token
+from .grammar.assigment import Assignment
+from .grammar.binary_operator import BinaryOp
+from .grammar.break_stmt import BreakStmt
+from .grammar.cast import Cast
+from .grammar.continue_stmt import ContinueStmt
+from .grammar.dereference_location import DereferenceLocation
+from .grammar.funcdecl import FuncDecl
+from .grammar.function_call import FunctionCall
+from .grammar.identifier_location import IdentifierLocation
+from .grammar.if_stmt import IfStmt
+from .grammar.literal import Literal
+from .grammar.parameters import Parameters
+from .grammar.print_stmt import PrintStmt
+from .grammar.program import Program
+from .grammar.return_stmt import ReturnStmt
+from .grammar.type import Type
+from .grammar.unary_operator import UnaryOp
+from .grammar.vardecl import VarDecl
+from .grammar.while_stmt import WhileStmt
+
+# Cómo se guarda cada campo de `_fields` en la columna `data`: índice de un
+# nodo, inicio de una lista de nodos en `lists`, índice en la tabla de
+# cadenas, booleano, o lista de pares (nombre, tipo) de los parámetros.
+NODE, NODES, STR, BOOL, PAIRS = range(5)
+NONE = -1
+
+CODECS = {
+    Program: (NODES,),
+    VarDecl: (STR, STR, STR, NODE),
+    FuncDecl: (BOOL, STR, NODE, STR, NODES),
+    Parameters: (PAIRS,),
+    Assignment: (NODE, NODE),
+    IfStmt: (NODE, NODES, NODES),
+    WhileStmt: (NODE, NODES),
+    BreakStmt: (),
+    ContinueStmt: (),
+    ReturnStmt: (NODE,),
+    PrintStmt: (NODE,),
+    BinaryOp: (NODE, STR, NODE),
+    UnaryOp: (STR, NODE),
+    Literal: (STR, STR),
+    Cast: (STR, NODE),
+    IdentifierLocation: (STR,),
+    DereferenceLocation: (NODE,),
+    FunctionCall: (STR, NODES),
+    Type: (STR,),
+}
+
+# Campo que guarda el token de posición de cada clase, si tiene alguno.
+TOKEN_FIELDS = {
+    BinaryOp: "op_token",
+    UnaryOp: "op_token",
+    DereferenceLocation: "token",
+    FuncDecl: "id_token",
+    FunctionCall: "id_token",
+    IdentifierLocation: "id_token",
+    VarDecl: "identifier_token",
+}
+
+CLASSES = tuple(CODECS)
+CLASS_IDS = {cls: class_id for class_id, cls in enumerate(CLASSES)}
+
+
+class ASTArena:
+    """
+    AST aplanado en columnas `array`. El nodo `i` es de la clase
+    `CLASSES[kinds[i]]` y sus campos ocupan `data[offsets[i]:]` en el orden
+    de `_fields`. Los índices siguen el preorden, así que recorrer todos los
+    nodos es recorrer `range(len(arena))`. Los atributos que completa el
+    checker se guardan en listas paralelas creadas al asignarlos por primera
+    vez.
+
+    `node(i)` devuelve una vista: una instancia de una subclase de la clase
+    del nodo (con el mismo nombre) cuyos campos leen las columnas. `Checker`
+    e `IRCodeGenerator` recorren las vistas igual que el AST de objetos.
+    """
+
+    def __init__(self):
+        self.kinds = array("B")
+        self.offsets = array("I")
+        self.data = array("i")
+        self.lists = array("i")
+        self.strings = []
+        self.string_ids = {}
+        self.token_kinds = array("B")
+        self.token_values = array("i")
+        self.lines = array("i")
+        self.columns = array("i")
+        self.semantic = {}
+
+    @classmethod
+    def from_ast(cls, root):
+        arena = cls()
+        arena._flatten(root)
+        arena.string_ids = {}
+        return arena
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @property
+    def root(self):
+        return self.node(0)
+
+    def node(self, index):
+        view = object.__new__(_VIEW_CLASSES[self.kinds[index]])
+        view._arena = self
+        view._index = index
+        return view
+
+    def kind_of(self, index):
+        return CLASSES[self.kinds[index]]
+
+    def children(self, index):
+        """Índices de los hijos directos del nodo `index`, en orden."""
+        offset = self.offsets[index]
+        data = self.data
+        lists = self.lists
+        for position, codec in enumerate(CODECS[CLASSES[self.kinds[index]]]):
+            value = data[offset + position]
+            if value == NONE:
+                continue
+            if codec == NODE:
+                yield value
+            elif codec == NODES:
+                for child in lists[value + 1 : value + 1 + lists[value]]:
+                    if child != NONE:
+                        yield child
+
+    def nbytes(self):
+        """Bytes de las columnas (sin contar la tabla de cadenas compartida)."""
+        columns = (
+            self.kinds,
+            self.offsets,
+            self.data,
+            self.lists,
+            self.token_kinds,
+            self.token_values,
+            self.lines,
+            self.columns,
+        )
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def _intern(self, value):
+        if value is None:
+            return NONE
+        if value.__class__ is not str:
+            raise TypeError(f"No se puede guardar {value!r} en la tabla de cadenas")
+        string_id = self.string_ids.get(value)
+        if string_id is None:
+            string_id = self.string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    def _flatten(self, root):
+        kinds = self.kinds
+        offsets = self.offsets
+        data = self.data
+        lists = self.lists
+        intern = self._intern
+        # Cada entrada es (nodo, columna y posición donde anotar su índice).
+        pending = [(root, None, 0)]
+        while pending:
+            node, target, position = pending.pop()
+            index = len(kinds)
+            if target is not None:
+                target[position] = index
+            cls = node.__class__
+            kinds.append(CLASS_IDS[cls])
+            offset = len(data)
+            offsets.append(offset)
+            token_field = TOKEN_FIELDS.get(cls)
+            self._store_token(None if token_field is None else getattr(node, token_field))
+            codecs = CODECS[cls]
+            data.extend([NONE] * len(codecs))
+            children = []
+            for field_position, (name, codec) in enumerate(zip(cls._fields, codecs)):
+                value = getattr(node, name)
+                slot = offset + field_position
+                if codec == NODE:
+                    if value is not None:
+                        children.append((value, data, slot))
+                elif codec == STR:
+                    data[slot] = intern(value)
+                elif codec == BOOL:
+                    data[slot] = 1 if value else 0
+                elif value is not None:
+                    start = len(lists)
+                    data[slot] = start
+                    lists.append(len(value))
+                    if codec == PAIRS:
+                        for first, second in value:
+                            lists.append(intern(first))
+                            lists.append(intern(second))
+                    else:
+                        lists.extend([NONE] * len(value))
+                        for item_position, item in enumerate(value, start + 1):
+                            if item is not None:
+                                children.append((item, lists, item_position))
+            # Se apilan al revés para que los índices queden en preorden.
+            pending.extend(reversed(children))
+
+    def _store_token(self, token):
+        if token is None:
+            self.token_kinds.append(0)
+            self.token_values.append(NONE)
+            self.lines.append(NONE)
+            self.columns.append(NONE)
+        else:
+            self.token_kinds.append(token.kind)
+            self.token_values.append(self._intern(token.value))
+            self.lines.append(token.line)
+            self.columns.append(token.column)
+
+    def _semantic_column(self, name):
+        column = self.semantic.get(name)
+        if column is None:
+            column = self.semantic[name] = [None] * len(self.kinds)
+        return column
+
+
+def _field_property(position, codec):
+    def get(view):
+        arena = view._arena
+        value = arena.data[arena.offsets[view._index] + position]
+        if codec == BOOL:
+            return bool(value)
+        if value == NONE:
+            return None
+        if codec == NODE:
+            return arena.node(value)
+        if codec == STR:
+            return arena.strings[value]
+        lists = arena.lists
+        count = lists[value]
+        if codec == PAIRS:
+            strings = arena.strings
+            items = lists[value + 1 : value + 1 + 2 * count]
+            return [
+                (strings[items[i]], strings[items[i + 1]]) for i in range(0, 2 * count, 2)
+            ]
+        return [
+            None if child == NONE else arena.node(child)
+            for child in lists[value + 1 : value + 1 + count]
+        ]
+
+    return property(get)
+
+
+def _token_property():
+    def get(view):
+        arena = view._arena
+        index = view._index
+        kind = arena.token_kinds[index]
+        if not kind:
+            return None
+        return Token(
+            kind,
+            arena.strings[arena.token_values[index]],
+            arena.lines[index],
+            arena.columns[index],
+        )
+
+    return property(get)
+
+
+def _semantic_property(name):
+    def get(view):
+        column = view._arena.semantic.get(name)
+        return None if column is None else column[view._index]
+
+    def set(view, value):
+        view._arena._semantic_column(name)[view._index] = value
+
+    return property(get, set)
+
+
+def _slot_names(cls):
+    for klass in cls.__mro__:
+        yield from klass.__dict__.get("__slots__", ())
+
+
+def _make_view_class(cls):
+    namespace = {
+        "__slots__": ("_arena", "_index"),
+        "__module__": cls.__module__,
+        "__qualname__": cls.__qualname__,
+    }
+    for position, (name, codec) in enumerate(zip(cls._fields, CODECS[cls])):
+        namespace[name] = _field_property(position, codec)
+    token_field = TOKEN_FIELDS.get(cls)
+    for name in _slot_names(cls):
+        if name == token_field:
+            namespace[name] = _token_property()
+        elif name not in namespace and name not in cls._fields:
+            namespace[name] = _semantic_property(name)
+    return type(cls.__name__, (cls,), namespace)
+
+
+_VIEW_CLASSES = tuple(_make_view_class(cls) for cls in CLASSES)
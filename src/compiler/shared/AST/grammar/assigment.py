@@ -1,13 +1,15 @@
-from dataclasses import dataclass
 from ..nodes.statement_node import Statement
 
 
-@dataclass
 class Assignment(Statement):
     """
     ### location '=' expression ';'
     """
 
+    _fields = ("location", "expression")
+    _child_fields = ("location", "expression")
+    __slots__ = _fields
+
     def __init__(self, location, expression):
         self.location = location
         self.expression = expression
@@ -1,17 +1,21 @@
-from dataclasses import dataclass
 from ..nodes.expression_node import Expression
 
 
-@dataclass
 class BinaryOp(Expression):
     """
     ### expression ('||' / '&&' / '<' / '>' / '<=' / '>=' / '==' / '!=' / '+' / '-' / '*' / '/') expression
     """
 
-    def __init__(self, left, op, right):
+    _fields = ("left", "op", "right")
+    _child_fields = ("left", "right")
+    __slots__ = _fields + ("op_token",)
+
+    def __init__(self, left, op, right, op_token=None):
         self.left = left
         self.op = op
         self.right = right
+        self.op_token = op_token
+        self.semantic_type = None
 
     def __repr__(self):
         return f"BinaryOp(left={repr(self.left)}, op={repr(self.op)}, right={repr(self.right)})"
@@ -1,16 +1,19 @@
-from dataclasses import dataclass
 from ..nodes.expression_node import Expression
 
 
-@dataclass
 class Cast(Expression):
     """
     ### type '(' expression ')'
     """
 
+    _fields = ("cast_type", "expression")
+    _child_fields = ("expression",)
+    __slots__ = _fields
+
     def __init__(self, cast_type, expression):
         self.cast_type = cast_type
         self.expression = expression
+        self.semantic_type = None
 
     def __repr__(self):
         return f"Cast(cast_type={self.cast_type}, expression={self.expression})"
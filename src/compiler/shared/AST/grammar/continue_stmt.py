@@ -1,9 +1,9 @@
-from dataclasses import dataclass
 from ..nodes.statement_node import Statement
 
 
-@dataclass
 class ContinueStmt(Statement):
     """
     ### 'continue' ';'
     """
+
+    __slots__ = ()
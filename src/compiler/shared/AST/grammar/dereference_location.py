@@ -1,12 +1,17 @@
-from dataclasses import dataclass
 from ..nodes.statement_node import Statement
 
 
-@dataclass
 class DereferenceLocation(Statement):
     """
     ### '`' expression
     """
 
-    def __init__(self, expression):
+    _fields = ("expression",)
+    _child_fields = ("expression",)
+    __slots__ = _fields + ("token", "semantic_type")
+    typed = True
+
+    def __init__(self, expression, token=None):
         self.expression = expression
+        self.token = token
+        self.semantic_type = None
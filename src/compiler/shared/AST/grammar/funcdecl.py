@@ -1,16 +1,23 @@
-from dataclasses import dataclass
 from ..nodes.statement_node import Statement
 
 
-@dataclass
 class FuncDecl(Statement):
     """
     ### 'import'? 'func' ID '(' parameters ')' type '{' statement* '}'
     """
 
-    def __init__(self, is_import, identifier, parameters, return_type, body):
+    _fields = ("is_import", "identifier", "parameters", "return_type", "body")
+    _child_fields = ("parameters", "body")
+    __slots__ = _fields + ("id_token", "defined_symbol", "body_semantic_scope")
+
+    def __init__(
+        self, is_import, identifier, parameters, return_type, body, id_token=None
+    ):
         self.is_import = is_import
         self.identifier = identifier
         self.parameters = parameters
         self.return_type = return_type
         self.body = body
+        self.id_token = id_token
+        self.defined_symbol = None
+        self.body_semantic_scope = None
@@ -1,16 +1,22 @@
-from dataclasses import dataclass
 from ..nodes.statement_node import Statement
 
 
-@dataclass
 class FunctionCall(Statement):
     """
     ### ID '(' arguments ')'
     """
 
-    def __init__(self, name, arguments):
+    _fields = ("name", "arguments")
+    _child_fields = ("arguments",)
+    __slots__ = _fields + ("id_token", "referenced_symbol", "semantic_type")
+    typed = True
+
+    def __init__(self, name, arguments, id_token=None):
         self.name = name
         self.arguments = arguments
+        self.id_token = id_token
+        self.referenced_symbol = None
+        self.semantic_type = None
 
     def __repr__(self):
         return f"FunctionCall(name={self.name!r}, arguments={self.arguments!r})"
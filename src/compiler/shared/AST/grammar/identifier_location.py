@@ -1,12 +1,16 @@
-from dataclasses import dataclass
 from ..nodes.expression_node import Expression
 
 
-@dataclass
 class IdentifierLocation(Expression):
     """
     ### ID
     """
 
-    def __init__(self, name):
+    _fields = ("name",)
+    __slots__ = _fields + ("id_token", "referenced_symbol")
+
+    def __init__(self, name, id_token=None):
         self.name = name
+        self.id_token = id_token
+        self.referenced_symbol = None
+        self.semantic_type = None
@@ -1,14 +1,18 @@
-from dataclasses import dataclass
 from ..nodes.statement_node import Statement
 
 
-@dataclass
 class IfStmt(Statement):
     """
     ### 'if' expression '{' statement* '}' ('else' '{' statement* '}')?
     """
 
+    _fields = ("condition", "then_block", "else_block")
+    _child_fields = ("condition", "then_block", "else_block")
+    __slots__ = _fields + ("then_block_semantic_scope", "else_block_semantic_scope")
+
     def __init__(self, condition, then_block, else_block):
         self.condition = condition
         self.then_block = then_block
         self.else_block = else_block
+        self.then_block_semantic_scope = None
+        self.else_block_semantic_scope = None
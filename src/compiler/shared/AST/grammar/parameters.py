@@ -1,12 +1,13 @@
-from dataclasses import dataclass
 from ..nodes.statement_node import Statement
 
 
-@dataclass
 class Parameters(Statement):
     """
     ### ID type (',' ID type)* / empty
     """
 
+    _fields = ("params",)
+    __slots__ = _fields
+
     def __init__(self, params):
         self.params = params
@@ -1,12 +1,14 @@
-from dataclasses import dataclass
 from ..nodes.statement_node import Statement
 
 
-@dataclass
 class PrintStmt(Statement):
     """
     ### 'print' expression ';'
     """
 
+    _fields = ("expression",)
+    _child_fields = ("expression",)
+    __slots__ = _fields
+
     def __init__(self, expression):
         self.expression = expression
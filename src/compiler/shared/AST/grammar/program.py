@@ -1,12 +1,16 @@
-from dataclasses import dataclass
 from ..node import Node
 
 
-@dataclass
 class Program(Node):
     """
     ### statement* EOF
     """
 
+    _fields = ("statements",)
+    _child_fields = ("statements",)
+    __slots__ = _fields + ("semantic_scope", "program_body_semantic_scope")
+
     def __init__(self, statements):
         self.statements = statements
+        self.semantic_scope = None
+        self.program_body_semantic_scope = None
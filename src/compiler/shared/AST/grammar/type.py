@@ -1,12 +1,15 @@
-from dataclasses import dataclass
 from ..nodes.statement_node import Statement
 
 
-@dataclass
 class Type(Statement):
     """
     ### 'int' / 'float' / 'char' / 'bool'
     """
 
+    _fields = ("name",)
+    __slots__ = _fields + ("semantic_type",)
+    typed = True
+
     def __init__(self, name):
         self.name = name
+        self.semantic_type = None
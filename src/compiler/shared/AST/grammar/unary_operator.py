@@ -1,13 +1,17 @@
-from dataclasses import dataclass
 from ..nodes.expression_node import Expression
 
 
-@dataclass
 class UnaryOp(Expression):
     """
     ### ('+' / '-' / '^' / '!') expression
     """
 
-    def __init__(self, op, expr):
+    _fields = ("op", "expr")
+    _child_fields = ("expr",)
+    __slots__ = _fields + ("op_token",)
+
+    def __init__(self, op, expr, op_token=None):
         self.op = op
         self.expr = expr
+        self.op_token = op_token
+        self.semantic_type = None
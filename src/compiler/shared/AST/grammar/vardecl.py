@@ -1,18 +1,23 @@
-from dataclasses import dataclass
 from ..nodes.statement_node import Statement
 
 
-@dataclass
 class VarDecl(Statement):
     """
     ### ('var' / 'const') ID type? ('=' expression)? ';'
     """
 
-    def __init__(self, kind, identifier, var_type, initializer):
+    _fields = ("kind", "identifier", "var_type", "initializer")
+    _child_fields = ("initializer",)
+    __slots__ = _fields + ("identifier_token", "defined_symbol", "semantic_type")
+
+    def __init__(self, kind, identifier, var_type, initializer, identifier_token=None):
         self.kind = kind
         self.identifier = identifier
         self.var_type = var_type
         self.initializer = initializer
+        self.identifier_token = identifier_token
+        self.defined_symbol = None
+        self.semantic_type = None
 
     def __repr__(self):
         return (
@@ -1,13 +1,16 @@
-from dataclasses import dataclass
 from ..nodes.statement_node import Statement
 
 
-@dataclass
 class WhileStmt(Statement):
     """
     ### 'while' expression '{' statement* '}'
     """
 
+    _fields = ("condition", "body")
+    _child_fields = ("condition", "body")
+    __slots__ = _fields + ("body_semantic_scope",)
+
     def __init__(self, condition, body):
         self.condition = condition
         self.body = body
+        self.body_semantic_scope = None
@@ -1,6 +1,18 @@
-from dataclasses import dataclass
+class Node:
+    """
+    Base de los nodos del AST. Cada clase enumera en `_fields` sus campos
+    sintácticos, en `_child_fields` los que contienen nodos o listas de nodos,
+    y declara en `__slots__` esos campos más los que completan el parser
+    (tokens de posición) y el checker (tipos, símbolos y scopes), así que las
+    instancias no llevan `__dict__`. `typed` indica si el nodo tiene
+    `semantic_type`, es decir, si el checker le asigna un tipo al visitarlo.
+    """
 
+    __slots__ = ()
+    _fields = ()
+    _child_fields = ()
+    typed = False
 
-@dataclass
-class Node:
-    pass
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({fields})"
@@ -1,7 +1,6 @@
-from dataclasses import dataclass
 from ..node import Node
 
 
-@dataclass
 class Expression(Node):
-    pass
+    __slots__ = ("semantic_type",)
+    typed = True
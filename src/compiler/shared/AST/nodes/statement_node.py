@@ -1,8 +1,6 @@
-from dataclasses import dataclass
 from ..node import Node
 
 
-@dataclass
 class Statement(Node):
     """
     ### statement <- assignment
@@ -15,3 +13,5 @@ class Statement(Node):
     ###       / return_stmt
     ###       / print_stmt
     """
+
+    __slots__ = ()
@@ -0,0 +1,129 @@
+def iter_fields(node):
+    """Pares (nombre, valor) de los campos sintácticos de `node`."""
+    for name in node._fields:
+        yield name, getattr(node, name)
+
+
+def iter_child_nodes(node):
+    """Hijos directos de `node`, en orden y sin los `None`."""
+    for name in node._child_fields:
+        value = getattr(node, name)
+        if value is None:
+            continue
+        if value.__class__ is list:
+            for item in value:
+                if item is not None:
+                    yield item
+        else:
+            yield value
+
+
+def walk(root):
+    """
+    Todos los nodos bajo `root` (incluido) en preorden, con una pila
+    explícita. Solo sigue `_child_fields`, así que no entra en los scopes,
+    símbolos ni tipos que el checker deja en los nodos.
+    """
+    pending = [root]
+    pop = pending.pop
+    append = pending.append
+    while pending:
+        node = pop()
+        yield node
+        child_fields = node._child_fields
+        for position in range(len(child_fields) - 1, -1, -1):
+            value = getattr(node, child_fields[position])
+            if value is None:
+                continue
+            if value.__class__ is list:
+                for index in range(len(value) - 1, -1, -1):
+                    item = value[index]
+                    if item is not None:
+                        append(item)
+            else:
+                append(value)
+
+
+class NodeVisitor:
+    """
+    Base de los recorridos del AST (Checker, IRCodeGenerator). El método
+    `_visit_<Clase>` de cada clase de nodo se resuelve una sola vez por clase
+    siguiendo su MRO (así también sirven las vistas de `ASTArena`) y queda en
+    una tabla propia de cada subclase; si no hay ninguno se usa
+    `_generic_visit`.
+    """
+
+    _handlers = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._handlers = {}
+
+    @classmethod
+    def _resolve_handler(cls, node_class):
+        for klass in node_class.__mro__:
+            handler = getattr(cls, f"_visit_{klass.__name__}", None)
+            if handler is not None:
+                break
+        else:
+            handler = cls._generic_visit
+        cls._handlers[node_class] = handler
+        return handler
+
+    def _generic_visit(self, node):
+        raise NotImplementedError(f"No hay visitante para {type(node)}")
+
+
+class NodeTransformer(NodeVisitor):
+    """
+    Reescribe el AST de abajo hacia arriba: primero transforma los hijos,
+    los vuelve a asignar en su campo y después llama a `_visit_<Clase>` del
+    nodo, que devuelve el nodo que lo reemplaza (él mismo si no cambia). En
+    una lista, devolver `None` elimina el elemento. Sin recursión en Python.
+    """
+
+    def transform(self, root):
+        handlers = self._handlers
+        results = []
+        pending = [(root, False)]
+        while pending:
+            node, ready = pending.pop()
+            if not ready:
+                pending.append((node, True))
+                children = list(iter_child_nodes(node))
+                children.reverse()
+                pending.extend((child, False) for child in children)
+                continue
+            self._replace_children(node, results)
+            handler = handlers.get(node.__class__) or self._resolve_handler(
+                node.__class__
+            )
+            results.append(handler(self, node))
+        return results[0]
+
+    def _replace_children(self, node, results):
+        child_fields = node._child_fields
+        if not child_fields:
+            return
+        count = sum(1 for _ in iter_child_nodes(node))
+        replacements = iter(results[len(results) - count :])
+        del results[len(results) - count :]
+        for name in child_fields:
+            value = getattr(node, name)
+            if value is None:
+                continue
+            if value.__class__ is list:
+                items = []
+                for item in value:
+                    if item is not None:
+                        item = next(replacements)
+                        if item is None:
+                            continue
+                    items.append(item)
+                value[:] = items
+            else:
+                setattr(node, name, next(replacements))
+
+    def _generic_visit(self, node):
+        return node
+
@@ -28,23 +28,6 @@ class Grammar:
         ("RPAREN", r"\)"),
         ("LBRACE", r"\{"),
         ("RBRACE", r"\}"),
-        ("IF", r"\bif\b"),
-        ("INT", r"\bint\b"),
-        ("VAR", r"\bvar\b"),
-        ("TRUE", r"\btrue\b"),
-        ("FUNC", r"\bfunc\b"),
-        ("ELSE", r"\belse\b"),
-        ("BOOL", r"\bbool\b"),
-        ("FALSE", r"\bfalse\b"),
-        ("BREAK", r"\bbreak\b"),
-        ("CONST", r"\bconst\b"),
-        ("PRINT", r"\bprint\b"),
-        ("WHILE", r"\bwhile\b"),
-        ("RETURN", r"\breturn\b"),
-        ("IMPORT", r"\bimport\b"),
-        ("CHAR_TYPE", r"\bchar\b"),
-        ("FLOAT_TYPE", r"\bfloat\b"),
-        ("CONTINUE", r"\bcontinue\b"),
         # ("MEMORY_ADDRESS", r"'\\x[0-9a-fA-F]{2}'"), direcciones de memoria (experimental)
         ("CHAR", r"'(\\[nrt'\"\\]|x[0-9a-fA-F]{2}|[^'\\])'"),
         ("FLOAT", r"\d+\.\d+"),
@@ -55,9 +38,74 @@ class Grammar:
         ("ERROR", r"."),
     ]
 
+    # Las palabras reservadas se reconocen como ID y se reclasifican con esta
+    # tabla, en lugar de probar una alternativa `\bpalabra\b` por cada una.
+    RESERVED_WORDS = {
+        "if": "IF",
+        "int": "INT",
+        "var": "VAR",
+        "true": "TRUE",
+        "func": "FUNC",
+        "else": "ELSE",
+        "bool": "BOOL",
+        "false": "FALSE",
+        "break": "BREAK",
+        "const": "CONST",
+        "print": "PRINT",
+        "while": "WHILE",
+        "return": "RETURN",
+        "import": "IMPORT",
+        "char": "CHAR_TYPE",
+        "float": "FLOAT_TYPE",
+        "continue": "CONTINUE",
+    }
+
+    # Variante para el lexer sobre bytes (mmap): una secuencia UTF-8 de varios
+    # bytes debe consumirse como un solo carácter, igual que en modo texto.
+    UTF8_MULTIBYTE = r"[\xc0-\xff][\x80-\xbf]*"
+    BYTES_TOKEN_OVERRIDES = {
+        "CHAR": r"'(\\[nrt'\"\\]|x[0-9a-fA-F]{2}|" + UTF8_MULTIBYTE + r"|[^'\\])'",
+        "ERROR": UTF8_MULTIBYTE + r"|.",
+    }
+
+    WORD_CHAR = re.compile(r"\w")
+
+    @staticmethod
+    def classify_identifier(content, value, start_pos, end_pos):
+        """
+        Tipo de token de un ID: la palabra reservada correspondiente o "ID".
+        Igual que con `\\b`, una palabra pegada a otro carácter de palabra
+        (p. ej. `3if`) no cuenta como reservada.
+        """
+        token_type = Grammar.RESERVED_WORDS.get(value)
+        if token_type is None:
+            return "ID"
+        if isinstance(content, str):
+            before = content[start_pos - 1 : start_pos]
+            after = content[end_pos : end_pos + 1]
+        else:
+            # Sobre bytes (mmap) se decodifica el carácter vecino completo: una
+            # secuencia UTF-8 ocupa hasta 4 bytes.
+            before = content[max(start_pos - 4, 0) : start_pos].decode(
+                "utf-8", "replace"
+            )[-1:]
+            after = content[end_pos : end_pos + 4].decode("utf-8", "replace")[:1]
+        if Grammar.WORD_CHAR.match(before) or Grammar.WORD_CHAR.match(after):
+            return "ID"
+        return token_type
+
     @staticmethod
     def get_compiled_regex():
         regex_pattern = "|".join(
             f"(?P<{name}>{pattern})" for name, pattern in Grammar.TOKEN_SPECS
         )
         return re.compile(regex_pattern)
+
+    @staticmethod
+    def get_compiled_bytes_regex():
+        """Misma gramática que `get_compiled_regex`, compilada para bytes."""
+        regex_pattern = "|".join(
+            f"(?P<{name}>{Grammar.BYTES_TOKEN_OVERRIDES.get(name, pattern)})"
+            for name, pattern in Grammar.TOKEN_SPECS
+        )
+        return re.compile(regex_pattern.encode("latin-1"))
@@ -1,10 +1,142 @@
+from enum import IntEnum
+
+
+class TokenKind(IntEnum):
+    # Operadores y símbolos
+    LE = 1
+    GE = 2
+    EQ = 3
+    NE = 4
+    LAND = 5
+    LOR = 6
+    NOT = 7
+    LT = 8
+    GT = 9
+    PLUS = 10
+    MINUS = 11
+    GROW = 12
+    TIMES = 13
+    DIVIDE = 14
+    ASSIGN = 15
+    SEMI = 16
+    COMMA = 17
+    DEREF = 18
+    LPAREN = 19
+    RPAREN = 20
+    LBRACE = 21
+    RBRACE = 22
+    # Palabras reservadas
+    IF = 23
+    INT = 24
+    VAR = 25
+    TRUE = 26
+    FUNC = 27
+    ELSE = 28
+    BOOL = 29
+    FALSE = 30
+    BREAK = 31
+    CONST = 32
+    PRINT = 33
+    WHILE = 34
+    RETURN = 35
+    IMPORT = 36
+    CHAR_TYPE = 37
+    FLOAT_TYPE = 38
+    CONTINUE = 39
+    # Literales e identificadores
+    CHAR = 40
+    FLOAT = 41
+    INTEGER = 42
+    ID = 43
+    # Tokens que el lexer descarta o reporta como error
+    NEWLINE = 44
+    WHITESPACE = 45
+    COMMENT = 46
+    UNCLOSED_COMMENT = 47
+    UNCLOSED_CHAR = 48
+    ERROR = 49
+    EOF = 50
+
+
+# Los tokens guardan el valor entero del tipo y cada miembro tiene su constante
+# int en el módulo (igual que `re` con sus flags). En el camino caliente del
+# parser `token.kind == ID` compara dos int exactos, que CPython especializa;
+# con miembros IntEnum la comparación y el acceso `TokenKind.ID` van por la ruta
+# genérica y son varias veces más lentos. `TokenKind(token.kind)` recupera el
+# miembro cuando hace falta.
+LE = TokenKind.LE.value
+GE = TokenKind.GE.value
+EQ = TokenKind.EQ.value
+NE = TokenKind.NE.value
+LAND = TokenKind.LAND.value
+LOR = TokenKind.LOR.value
+NOT = TokenKind.NOT.value
+LT = TokenKind.LT.value
+GT = TokenKind.GT.value
+PLUS = TokenKind.PLUS.value
+MINUS = TokenKind.MINUS.value
+GROW = TokenKind.GROW.value
+TIMES = TokenKind.TIMES.value
+DIVIDE = TokenKind.DIVIDE.value
+ASSIGN = TokenKind.ASSIGN.value
+SEMI = TokenKind.SEMI.value
+COMMA = TokenKind.COMMA.value
+DEREF = TokenKind.DEREF.value
+LPAREN = TokenKind.LPAREN.value
+RPAREN = TokenKind.RPAREN.value
+LBRACE = TokenKind.LBRACE.value
+RBRACE = TokenKind.RBRACE.value
+IF = TokenKind.IF.value
+INT = TokenKind.INT.value
+VAR = TokenKind.VAR.value
+TRUE = TokenKind.TRUE.value
+FUNC = TokenKind.FUNC.value
+ELSE = TokenKind.ELSE.value
+BOOL = TokenKind.BOOL.value
+FALSE = TokenKind.FALSE.value
+BREAK = TokenKind.BREAK.value
+CONST = TokenKind.CONST.value
+PRINT = TokenKind.PRINT.value
+WHILE = TokenKind.WHILE.value
+RETURN = TokenKind.RETURN.value
+IMPORT = TokenKind.IMPORT.value
+CHAR_TYPE = TokenKind.CHAR_TYPE.value
+FLOAT_TYPE = TokenKind.FLOAT_TYPE.value
+CONTINUE = TokenKind.CONTINUE.value
+CHAR = TokenKind.CHAR.value
+FLOAT = TokenKind.FLOAT.value
+INTEGER = TokenKind.INTEGER.value
+ID = TokenKind.ID.value
+NEWLINE = TokenKind.NEWLINE.value
+WHITESPACE = TokenKind.WHITESPACE.value
+COMMENT = TokenKind.COMMENT.value
+UNCLOSED_COMMENT = TokenKind.UNCLOSED_COMMENT.value
+UNCLOSED_CHAR = TokenKind.UNCLOSED_CHAR.value
+ERROR = TokenKind.ERROR.value
+EOF = TokenKind.EOF.value
+
+TYPE_KINDS = frozenset({INT, FLOAT_TYPE, CHAR_TYPE, BOOL})
+LITERAL_KINDS = frozenset({INTEGER, FLOAT, CHAR, TRUE, FALSE})
+
+_kind_names = {kind.value: kind.name for kind in TokenKind}
+_kind_names[None] = None
+
+
 class Token:
-    def __init__(self, type, value, line, column):
-        self.type = type
+    __slots__ = ("kind", "value", "line", "column")
+
+    def __init__(self, kind, value, line, column):
+        if kind.__class__ is str:
+            kind = TokenKind[kind].value
+        self.kind = kind
         self.value = value
         self.line = line
         self.column = column
 
+    @property
+    def type(self):
+        return _kind_names[self.kind]
+
     def __str__(self):
         return f"Token({self.type}, {repr(self.value)}, {self.line}, {self.column})"
 
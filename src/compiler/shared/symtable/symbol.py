@@ -8,6 +8,11 @@ class SymbolKind(Enum):
     PARAMETER = auto()
 
 
+class StorageClass(Enum):
+    GLOBAL = auto()
+    LOCAL = auto()
+
+
 class Symbol:
     def __init__(
         self,
@@ -30,6 +35,11 @@ class Symbol:
         self.return_type = return_type
         self.is_import = is_import
         self.has_return_statement = False
+        # Los asigna el checker a variables, constantes y parámetros: dónde
+        # vive el valor en el IR y su posición entre los globales del
+        # programa o los locales de su función.
+        self.storage = None
+        self.slot = None
 
     def __str__(self):
         if self.kind == SymbolKind.FUNCTION:
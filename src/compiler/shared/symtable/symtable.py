@@ -1,5 +1,27 @@
 from .symbol import Symbol
 
+# Los tipos y operadores se internan como enteros pequeños; las reglas de
+# `SymbolTable` se precalculan en tablas densas indexadas por esos ids.
+TYPE_NAMES = ("int", "float", "char", "bool", "void")
+TYPE_COUNT = len(TYPE_NAMES)
+TYPE_IDS = {name: type_id for type_id, name in enumerate(TYPE_NAMES)}
+# Nombres de tipo de token que equivalen a los internos.
+TYPE_IDS["FLOAT_TYPE"] = TYPE_IDS["float"]
+TYPE_IDS["CHAR_TYPE"] = TYPE_IDS["char"]
+
+BINARY_OPERATORS = ("+", "-", "*", "/", "==", "!=", "<", ">", "<=", ">=", "&&", "||")
+BINARY_OP_IDS = {op: op_id for op_id, op in enumerate(BINARY_OPERATORS)}
+UNARY_OPERATORS = ("+", "-", "!", "^")
+UNARY_OP_IDS = {op: op_id for op_id, op in enumerate(UNARY_OPERATORS)}
+
+
+def binary_index(op_id, left_id, right_id):
+    return (op_id * TYPE_COUNT + left_id) * TYPE_COUNT + right_id
+
+
+def unary_index(op_id, type_id):
+    return op_id * TYPE_COUNT + type_id
+
 
 class Scope:
     def __init__(
@@ -8,47 +30,68 @@ class Scope:
         scope_name="<unnamed_scope>",
         is_loop=False,
         current_function_symbol=None,
+        symbol_table=None,
     ):
         self.symbols = {}
         self.parent_scope = parent_scope
         self.scope_name = scope_name
         self.is_loop = is_loop
-        self.current_function_symbol = current_function_symbol
         self.children_scopes = []
+        self.symbol_table = symbol_table
+        self.is_open = True
+        # El contexto de bucle y de función se hereda al crear el ámbito, así
+        # que consultarlo no recorre la cadena de padres.
         if parent_scope:
             parent_scope.children_scopes.append(self)
+            self.depth = parent_scope.depth + 1
+            self.in_loop = is_loop or parent_scope.in_loop
+            if current_function_symbol is None:
+                current_function_symbol = parent_scope.current_function_symbol
+        else:
+            self.depth = 0
+            self.in_loop = is_loop
+        self.current_function_symbol = current_function_symbol
 
     def define(self, symbol: Symbol):
         if symbol.name in self.symbols:
             return False
         self.symbols[symbol.name] = symbol
+        if self.symbol_table is not None:
+            self.symbol_table._bind(self, symbol)
         return True
 
     def lookup(self, name: str, current_scope_only=False) -> Symbol | None:
-        if name in self.symbols:
-            return self.symbols[name]
-        if not current_scope_only and self.parent_scope:
-            return self.parent_scope.lookup(name)
+        if current_scope_only:
+            return self.symbols.get(name)
+        table = self.symbol_table
+        if table is not None and table.current_scope is self:
+            # Caso habitual del checker: la pila de sombreado del nombre tiene
+            # arriba la definición visible desde el ámbito actual.
+            bindings = table.bindings.get(name)
+            return bindings[-1][1] if bindings else None
+        # Ámbitos ya cerrados o sin tabla: se sube por los padres con un
+        # bucle, sin recursión.
+        scope = self
+        while scope is not None:
+            symbol = scope.symbols.get(name)
+            if symbol is not None:
+                return symbol
+            scope = scope.parent_scope
         return None
 
     def is_in_loop(self) -> bool:
-        if self.is_loop:
-            return True
-        if self.parent_scope:
-            return self.parent_scope.is_in_loop()
-        return False
+        return self.in_loop
 
     def get_current_function_symbol(self) -> Symbol | None:
-        if self.current_function_symbol:
-            return self.current_function_symbol
-        if self.parent_scope:
-            return self.parent_scope.get_current_function_symbol()
-        return None
+        return self.current_function_symbol
 
 
 class SymbolTable:
     def __init__(self):
-        self.global_scope = Scope(scope_name="<global>")
+        # Para cada nombre, las definiciones visibles en los ámbitos abiertos
+        # como pares (profundidad, símbolo), la más interna al final.
+        self.bindings = {}
+        self.global_scope = Scope(scope_name="<global>", symbol_table=self)
         self.current_scope = self.global_scope
         self.valid_types = {
             "int",
@@ -102,28 +145,61 @@ class SymbolTable:
             ("^", "int"): "int",
             ("^", "float"): "float",
         }
+        self._build_type_tables()
 
     def enter_scope(
         self, scope_name="<block>", is_loop=False, current_function_symbol=None
     ):
         if current_function_symbol is None and self.current_scope:
-            current_function_symbol = self.current_scope.get_current_function_symbol()
+            # Cada ámbito ya guarda el símbolo heredado de su padre, así que no
+            # hace falta recorrer la cadena completa.
+            current_function_symbol = self.current_scope.current_function_symbol
 
         new_scope = Scope(
             parent_scope=self.current_scope,
             scope_name=scope_name,
             is_loop=is_loop,
             current_function_symbol=current_function_symbol,
+            symbol_table=self,
         )
         self.current_scope = new_scope
+        return new_scope
+
+    def _bind(self, scope, symbol):
+        # Solo los ámbitos abiertos (el actual y sus ancestros) aportan
+        # definiciones visibles; la pila queda ordenada por profundidad.
+        if not scope.is_open:
+            return
+        stack = self.bindings.setdefault(symbol.name, [])
+        position = len(stack)
+        while position and stack[position - 1][0] > scope.depth:
+            position -= 1
+        stack.insert(position, (scope.depth, symbol))
 
     def exit_scope(self):
         if self.current_scope.parent_scope:
+            bindings = self.bindings
+            for name in self.current_scope.symbols:
+                stack = bindings[name]
+                stack.pop()
+                if not stack:
+                    del bindings[name]
+            self.current_scope.is_open = False
             self.current_scope = self.current_scope.parent_scope
         else:
             # Este error no debería ocurrir si el checker maneja bien los scopes.
             raise Exception("InternalError: Cannot exit global scope")
 
+    def iter_scopes(self):
+        """Genera `(ámbito, profundidad)` en preorden, con pila explícita."""
+        pending = [(self.global_scope, 0)]
+        while pending:
+            scope, depth = pending.pop()
+            yield scope, depth
+            pending.extend(
+                (child_scope, depth + 1) for child_scope in reversed(scope.children_scopes)
+            )
+
     def _normalize_type_name(self, type_name_from_ast):
         # Esto es para mapear los nombres de TIPO DE TOKEN de tu lexer a los nombres de tipo internos
         # Asumo que tus nodos AST ya usan 'int', 'float', etc. directamente para var_type.
@@ -136,15 +212,33 @@ class SymbolTable:
         # 'INT', 'BOOL' de la gramática de tokens para tipos ya son 'int', 'bool'.
         return type_name_from_ast
 
-    def get_binary_op_result_type(
-        self, op: str, left_type: str, right_type: str
-    ) -> str | None:
-        left_type_norm = self._normalize_type_name(left_type)
-        right_type_norm = self._normalize_type_name(right_type)
+    def _build_type_tables(self):
+        # Las reglas en texto siguen siendo la fuente; aquí se vuelcan, ya con
+        # la coerción int -> float resuelta, en listas indexadas por id.
+        self.binary_result_ids = [None] * (len(BINARY_OPERATORS) * TYPE_COUNT**2)
+        for op, op_id in BINARY_OP_IDS.items():
+            for left_id, left_type in enumerate(TYPE_NAMES):
+                for right_id, right_type in enumerate(TYPE_NAMES):
+                    result = self._binary_rule(op, left_type, right_type)
+                    if result is not None:
+                        self.binary_result_ids[
+                            binary_index(op_id, left_id, right_id)
+                        ] = TYPE_IDS[result]
+        self.unary_result_ids = [None] * (len(UNARY_OPERATORS) * TYPE_COUNT)
+        for (op, expr_type), result in self.unary_op_type_compatibility.items():
+            self.unary_result_ids[unary_index(UNARY_OP_IDS[op], TYPE_IDS[expr_type])] = (
+                TYPE_IDS[result]
+            )
+        self.assignable = [
+            target == value or (target == "float" and value == "int")
+            for target in TYPE_NAMES
+            for value in TYPE_NAMES
+        ]
 
+    def _binary_rule(self, op: str, left_type: str, right_type: str) -> str | None:
         # Intento directo
-        if (op, left_type_norm, right_type_norm) in self.type_compatibility_rules:
-            return self.type_compatibility_rules[(op, left_type_norm, right_type_norm)]
+        if (op, left_type, right_type) in self.type_compatibility_rules:
+            return self.type_compatibility_rules[(op, left_type, right_type)]
 
         # Coerción implícita: int a float si el otro es float (para operadores aritméticos y comparativos)
         arithmetic_comparison_ops = {
@@ -160,30 +254,37 @@ class SymbolTable:
             "!=",
         }
         if op in arithmetic_comparison_ops:
-            if left_type_norm == "int" and right_type_norm == "float":
-                if (op, "float", "float") in self.type_compatibility_rules:
-                    return self.type_compatibility_rules[(op, "float", "float")]
-            if left_type_norm == "float" and right_type_norm == "int":
-                if (op, "float", "float") in self.type_compatibility_rules:
-                    return self.type_compatibility_rules[(op, "float", "float")]
+            if (left_type, right_type) in (("int", "float"), ("float", "int")):
+                return self.type_compatibility_rules.get((op, "float", "float"))
         return None
 
+    def get_binary_op_result_type(
+        self, op: str, left_type: str, right_type: str
+    ) -> str | None:
+        op_id = BINARY_OP_IDS.get(op)
+        left_id = TYPE_IDS.get(left_type)
+        right_id = TYPE_IDS.get(right_type)
+        if op_id is None or left_id is None or right_id is None:
+            return None
+        result_id = self.binary_result_ids[binary_index(op_id, left_id, right_id)]
+        return None if result_id is None else TYPE_NAMES[result_id]
+
     def get_unary_op_result_type(self, op: str, expr_type: str) -> str | None:
-        expr_type_norm = self._normalize_type_name(expr_type)
-        if (op, expr_type_norm) in self.unary_op_type_compatibility:
-            return self.unary_op_type_compatibility[(op, expr_type_norm)]
-        return None
+        op_id = UNARY_OP_IDS.get(op)
+        type_id = TYPE_IDS.get(expr_type)
+        if op_id is None or type_id is None:
+            return None
+        result_id = self.unary_result_ids[unary_index(op_id, type_id)]
+        return None if result_id is None else TYPE_NAMES[result_id]
 
     def is_type_assignable(self, target_type: str, value_type: str) -> bool:
-        target_type_norm = self._normalize_type_name(target_type)
-        value_type_norm = self._normalize_type_name(value_type)
-
-        if target_type_norm == value_type_norm:
-            return True
-        # Coerción implícita: se puede asignar un int a un float
-        if target_type_norm == "float" and value_type_norm == "int":
-            return True
-        return False
+        target_id = TYPE_IDS.get(target_type)
+        value_id = TYPE_IDS.get(value_type)
+        if target_id is None or value_id is None:
+            return self._normalize_type_name(target_type) == self._normalize_type_name(
+                value_type
+            )
+        return self.assignable[target_id * TYPE_COUNT + value_id]
 
     def is_type_castable(self, cast_to_type: str, cast_from_type: str) -> bool:
         cast_to_norm = self._normalize_type_name(cast_to_type)
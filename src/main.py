@@ -1,5 +1,6 @@
 import argparse
 from .compiler.compiler import Compiler
+from .utils.report.reporter import Reporter, Verbosity
 
 
 class Main:
@@ -8,10 +9,42 @@ class Main:
         args = Main.parse_arguments()
         if not args.path_file:
             raise NameError("No file path was provided for compilation")
-        Compiler(args.path_file)
+        Compiler(
+            args.path_file,
+            reporter=Reporter(args.verbosity, args.json),
+            time_passes=args.time_passes,
+            time_passes_json=args.time_passes_json,
+            optimize=not args.no_optimize,
+        )
 
     @staticmethod
     def parse_arguments():
         parser = argparse.ArgumentParser(description="gox-compiler")
         parser.add_argument("path_file", help="File to compile")
+        parser.add_argument(
+            "--verbosity",
+            choices=[level.name.lower() for level in Verbosity],
+            default="full",
+            help="Compiler output: silent, summary or full (symbol table and IR)",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Report compiler output as JSON lines",
+        )
+        parser.add_argument(
+            "--no-optimize",
+            action="store_true",
+            help="Generate IR without optimizations (constant folding)",
+        )
+        parser.add_argument(
+            "--time-passes",
+            action="store_true",
+            help="Report wall time, CPU time, peak memory and output size of each phase",
+        )
+        parser.add_argument(
+            "--time-passes-json",
+            metavar="PATH",
+            help="Also write the per-phase measurements to PATH as JSON",
+        )
         return parser.parse_args()
@@ -1,18 +1,32 @@
 import json
 
+from ...compiler.shared.AST.node import Node
+from ...compiler.shared.AST.visitor import iter_fields
+
 
 class ASTtoJSON:
     @staticmethod
     def ast_to_dict(node):
-        if isinstance(node, list):
-            return [ASTtoJSON.ast_to_dict(n) for n in node]
-        elif hasattr(node, "__dict__"):
-            result = {"__class__": node.__class__.__name__}
-            for key, value in node.__dict__.items():
-                result[key] = ASTtoJSON.ast_to_dict(value)
-            return result
-        else:
-            return node
+        # Pila explícita de (valor, contenedor, clave) para no depender del
+        # límite de recursión con árboles profundos.
+        root = [None]
+        pending = [(node, root, 0)]
+        while pending:
+            value, container, key = pending.pop()
+            if isinstance(value, list):
+                items = container[key] = [None] * len(value)
+                pending.extend(
+                    (value[index], items, index) for index in range(len(value) - 1, -1, -1)
+                )
+            elif isinstance(value, Node):
+                result = container[key] = {"__class__": value.__class__.__name__}
+                pending.extend(
+                    (field_value, result, name)
+                    for name, field_value in reversed(list(iter_fields(value)))
+                )
+            else:
+                container[key] = value
+        return root[0]
 
     @staticmethod
     def convert_to_json(ast, file_name: str):
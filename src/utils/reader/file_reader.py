@@ -1,3 +1,6 @@
+import mmap
+
+
 class FileReader:
     @staticmethod
     def read(file_path: str):
@@ -8,3 +11,16 @@ class FileReader:
             raise FileNotFoundError("Error: Archivo no encontrado.")
         except Exception as error:
             raise Exception(error)
+
+    @staticmethod
+    def map(file_path: str):
+        """Mapea el archivo en memoria (solo lectura) para analizarlo como bytes."""
+        try:
+            with open(file_path, "rb") as file:
+                if file.seek(0, 2) == 0:
+                    return b""
+                return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            raise FileNotFoundError("Error: Archivo no encontrado.")
+        except Exception as error:
+            raise Exception(error)
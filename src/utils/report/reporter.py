@@ -0,0 +1,185 @@
+import json
+from enum import IntEnum
+
+from prettytable import PrettyTable
+
+from ...compiler.code_analyzer.helpers.check import SymbolTablePrinter
+
+
+class Verbosity(IntEnum):
+    SILENT = 0
+    SUMMARY = 1
+    FULL = 2
+
+
+class _OutputEvents:
+    """Archivo de solo escritura: cada escritura del programa es un evento."""
+
+    def __init__(self, reporter):
+        self._reporter = reporter
+
+    def write(self, text):
+        if text:
+            self._reporter._emit_json("output", {"text": text})
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class Reporter:
+    """
+    Salida del compilador hacia el usuario: tabla de símbolos, módulo IR y
+    encabezados de cada fase. Con `SILENT` no se formatea nada; con
+    `SUMMARY` solo se cuentan ámbitos, símbolos e instrucciones; con `FULL`
+    se imprime todo como siempre. Con `json_lines=True` cada evento es un
+    objeto JSON en una línea y stdout no lleva nada más: los errores son
+    eventos `error` y la salida del programa, eventos `output`. Cada método
+    revisa primero el nivel, así que los datos de un evento solo se arman si
+    se van a emitir. Sin JSON, los errores de cada fase los siguen
+    imprimiendo sus propias clases.
+    """
+
+    def __init__(self, verbosity=Verbosity.FULL, json_lines=False):
+        if isinstance(verbosity, str):
+            verbosity = Verbosity[verbosity.upper()]
+        self.verbosity = verbosity
+        self.json_lines = json_lines
+
+    def symbol_table(self, symtable):
+        if not self.verbosity:
+            return
+        if self.json_lines:
+            self._emit_json("symbol_table", self._symbol_table_data(symtable))
+        elif self.verbosity is Verbosity.FULL:
+            SymbolTablePrinter(symtable).print_table()
+        else:
+            scopes, symbols = self._count_scopes(symtable)
+            self._write(f"Tabla de símbolos: {scopes} ámbitos, {symbols} símbolos")
+
+    def ir_module(self, module):
+        if not self.verbosity:
+            return
+        if self.json_lines:
+            self._emit_json("ir_module", self._ir_module_data(module))
+        elif self.verbosity is Verbosity.FULL:
+            self._write("\n--- MÓDULO IR GENERADO ---")
+            module.dump()
+        else:
+            functions, instructions = self._count_instructions(module)
+            self._write(
+                f"Módulo IR: {len(module.globals)} globales, {functions} funciones, "
+                f"{instructions} instrucciones"
+            )
+
+    def execution(self):
+        if not self.verbosity:
+            return
+        if self.json_lines:
+            self._emit_json("execution", {})
+        else:
+            self._write("\n--- EJECUCIÓN ---")
+
+    def errors(self, diagnostics):
+        # Como las tablas de errores, se emiten con cualquier verbosidad.
+        for diagnostic in diagnostics:
+            self._emit_json(
+                "error",
+                {
+                    "phase": diagnostic.phase,
+                    "message": diagnostic.message,
+                    "line": diagnostic.line,
+                    "column": diagnostic.column,
+                },
+            )
+
+    def program_output(self):
+        """Destino de la salida del programa: `None` es el stdout del VM."""
+        return _OutputEvents(self) if self.json_lines else None
+
+    def pass_stats(self, passes):
+        # Se pidió explícitamente (--time-passes), así que se imprime con
+        # cualquier nivel de verbosidad.
+        if self.json_lines:
+            self._emit_json("time_passes", {"passes": [stats.to_dict() for stats in passes]})
+            return
+        table = PrettyTable()
+        table.field_names = ["Fase", "Pared (ms)", "CPU (ms)", "Pico memoria (KiB)", "Tamaño"]
+        for name in table.field_names[1:]:
+            table.align[name] = "r"
+        for stats in passes:
+            table.add_row(
+                [
+                    stats.name,
+                    f"{stats.wall * 1000:.2f}",
+                    f"{stats.cpu * 1000:.2f}",
+                    "-" if stats.peak_memory is None else f"{stats.peak_memory / 1024:.1f}",
+                    "-" if stats.size is None else f"{stats.size} {stats.unit}",
+                ]
+            )
+        self._write("\n--- TIEMPOS POR FASE ---")
+        self._write(table.get_string())
+
+    def _emit_json(self, event, data):
+        data = {"event": event, **data}
+        self._write(json.dumps(data, ensure_ascii=False))
+
+    def _write(self, text):
+        print(text)
+
+    def _count_scopes(self, symtable):
+        scopes = symbols = 0
+        for scope, _ in symtable.iter_scopes():
+            scopes += 1
+            symbols += len(scope.symbols)
+        return scopes, symbols
+
+    def _count_instructions(self, module):
+        functions = [
+            function for function in module.functions.values() if not function.imported
+        ]
+        return len(functions), sum(len(function.code) for function in functions)
+
+    def _symbol_table_data(self, symtable):
+        if self.verbosity is not Verbosity.FULL:
+            scopes, symbols = self._count_scopes(symtable)
+            return {"scopes": scopes, "symbols": symbols}
+        return {
+            "scopes": [
+                {
+                    "name": scope.scope_name,
+                    "depth": depth,
+                    "loop": scope.is_loop,
+                    "symbols": [
+                        {
+                            "name": symbol.name,
+                            "kind": symbol.kind.name,
+                            "type": symbol.type,
+                        }
+                        for symbol in scope.symbols.values()
+                    ],
+                }
+                for scope, depth in symtable.iter_scopes()
+            ]
+        }
+
+    def _ir_module_data(self, module):
+        if self.verbosity is not Verbosity.FULL:
+            functions, instructions = self._count_instructions(module)
+            return {
+                "globals": len(module.globals),
+                "functions": functions,
+                "instructions": instructions,
+            }
+        return {
+            "globals": {name: glob.type for name, glob in module.globals.items()},
+            "functions": {
+                name: {
+                    "parameters": function.parmnames,
+                    "imported": function.imported,
+                    "locals": function.locals,
+                    "code": function.code,
+                }
+                for name, function in module.functions.items()
+            },
+        }
@@ -0,0 +1,14 @@
+import contextlib
+import os
+import tempfile
+
+
+@contextlib.contextmanager
+def gox_file(source):
+    """Escribe `source` en un archivo .gox temporal y lo borra al salir."""
+    with tempfile.NamedTemporaryFile("w", suffix=".gox", delete=False) as file:
+        file.write(source)
+    try:
+        yield file.name
+    finally:
+        os.remove(file.name)
@@ -0,0 +1,122 @@
+import contextlib
+import io
+import os
+import unittest
+
+from src.compiler.api import CompilationOptions, compile_file, compile_source
+from .support import gox_file
+
+CODE_DIR = os.path.join(os.path.dirname(__file__), "..", "code")
+
+SOURCE = """\
+var total int = 0;
+func add(a int, b int) int {
+    return a + b;
+}
+var i int = 0;
+while i < 4 {
+    total = add(total, i);
+    i = i + 1;
+}
+print total;
+"""
+
+
+def quietly(function, *args):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = function(*args)
+    return result, output.getvalue()
+
+
+class TestCompileSource(unittest.TestCase):
+    def test_result_holds_every_phase_without_printing(self):
+        result, printed = quietly(compile_source, SOURCE)
+        self.assertEqual(printed, "")
+        self.assertTrue(result.ok)
+        self.assertEqual((result.tokens[0].value, result.tokens[-1].type), ("var", "SEMI"))
+        self.assertEqual(len(result.ast.statements), 5)
+        self.assertIsNotNone(result.symtable.global_scope.lookup("add"))
+        self.assertIn("add", result.ircode.functions)
+        self.assertEqual(
+            list(result.timings),
+            [
+                "read", "lexer", "parser", "checker", "fold", "ir", "peephole", "dce",
+                "licm", "cse",
+            ],
+        )
+        self.assertIsNone(result.output)
+
+    def test_run_captures_program_output(self):
+        result, printed = quietly(compile_source, SOURCE, CompilationOptions(run=True))
+        self.assertEqual(printed, "")
+        self.assertEqual(result.output.split(), ["6"])
+
+    def test_repeated_calls_are_independent(self):
+        first = compile_source(SOURCE, CompilationOptions(run=True))
+        second = compile_source(SOURCE, CompilationOptions(run=True))
+        self.assertIsNot(first.symtable, second.symtable)
+        self.assertEqual(first.output, second.output)
+        self.assertEqual(
+            first.ircode.functions["main"].code, second.ircode.functions["main"].code
+        )
+
+    def test_diagnostics_per_phase(self):
+        cases = [
+            ("var x int = 1 @ 2;\n", "lexer", 1, 14),
+            ("var x int = ;\n", "parser", 1, 12),
+            ("var x int = 1;\nprint x + true;\n", "checker", 2, 8),
+            ("var x int = 0;\nprint 1 / x;\n", "run", None, None),
+        ]
+        for source, phase, line, column in cases:
+            with self.subTest(phase=phase):
+                result, printed = quietly(
+                    compile_source, source, CompilationOptions(run=True)
+                )
+                self.assertEqual(printed, "")
+                self.assertFalse(result.ok)
+                self.assertEqual(result.failed_phase, phase)
+                diagnostic = result.diagnostics[0]
+                self.assertEqual((diagnostic.line, diagnostic.column), (line, column))
+
+    def test_time_passes_measures_memory_and_sizes(self):
+        plain = compile_source(SOURCE)
+        self.assertTrue(all(stats.peak_memory is None for stats in plain.passes))
+        self.assertTrue(all(stats.size is None for stats in plain.passes))
+
+        result = compile_source(SOURCE, CompilationOptions(time_passes=True))
+        sizes = {stats.name: (stats.size, stats.unit) for stats in result.passes}
+        self.assertEqual(sizes["read"], (len(SOURCE), "chars"))
+        self.assertEqual(sizes["lexer"], (len(result.tokens), "tokens"))
+        self.assertEqual(sizes["checker"], (5, "symbols"))
+        self.assertEqual(sizes["ir"][1], "instructions")
+        self.assertGreater(sizes["parser"][0], 20)
+        for stats in result.passes:
+            self.assertGreaterEqual(stats.wall, 0)
+            self.assertGreater(stats.peak_memory, 0)
+        self.assertEqual(result.passes_to_dict()[0]["pass"], "read")
+
+
+class TestCompileFile(unittest.TestCase):
+    def test_streaming_tokens_match_source_compilation(self):
+        with gox_file(SOURCE) as path:
+            streamed = compile_file(path, CompilationOptions(keep_tokens=False))
+        self.assertIsNone(streamed.tokens)
+        self.assertNotIn("lexer", streamed.timings)
+        self.assertEqual(
+            streamed.ircode.functions["main"].code,
+            compile_source(SOURCE).ircode.functions["main"].code,
+        )
+
+    def test_streaming_lexer_errors_become_diagnostics(self):
+        path = os.path.join(CODE_DIR, "mandelplot.gox")
+        result, printed = quietly(
+            compile_file, path, CompilationOptions(keep_tokens=False)
+        )
+        self.assertEqual(printed, "")
+        self.assertEqual(result.failed_phase, "lexer")
+        self.assertEqual(result.diagnostics[0].line, 39)
+
+
+if __name__ == "__main__":
+    unittest.main()
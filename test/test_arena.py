@@ -0,0 +1,84 @@
+import contextlib
+import io
+import unittest
+
+from src.compiler.code_analyzer.checker import Checker
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.code_analyzer.parser import Parser
+from src.compiler.interpreter.ir_generator import IRCodeGenerator
+from src.compiler.shared.AST.arena import ASTArena
+from src.compiler.shared.AST.grammar.binary_operator import BinaryOp
+from src.compiler.shared.AST.grammar.funcdecl import FuncDecl
+from src.utils.json.ast_to_json import ASTtoJSON
+from .support import gox_file
+
+SOURCE = """\
+var total int = 0;
+func add(a int, b int) int {
+    return a + b;
+}
+var i int = 0;
+while i < 5 {
+    if i == 3 {
+        break;
+    } else {
+        total = add(total, i);
+    }
+    i = i + 1;
+}
+print total;
+"""
+
+
+def parse_source(source):
+    with gox_file(source) as path:
+        return Parser(Lexer(path).analyze()).analyze()
+
+
+def check_and_generate(root):
+    checker = Checker(root)
+    with contextlib.redirect_stdout(io.StringIO()):
+        symtable = checker.analyze()
+    module = IRCodeGenerator(symtable).generate(root)
+    return checker.errors, {name: function.code for name, function in module.functions.items()}
+
+
+class TestASTArena(unittest.TestCase):
+    def setUp(self):
+        self.ast = parse_source(SOURCE)
+        self.arena = ASTArena.from_ast(self.ast)
+
+    def test_views_reproduce_the_object_tree(self):
+        self.assertEqual(
+            ASTtoJSON.ast_to_dict(self.arena.root), ASTtoJSON.ast_to_dict(self.ast)
+        )
+
+    def test_indices_follow_preorder(self):
+        order = []
+        pending = [0]
+        while pending:
+            index = pending.pop()
+            order.append(index)
+            pending.extend(reversed(list(self.arena.children(index))))
+        self.assertEqual(order, list(range(len(self.arena))))
+
+    def test_views_are_instances_of_the_node_classes(self):
+        func = self.arena.root.statements[1]
+        self.assertIsInstance(func, FuncDecl)
+        self.assertEqual(type(func).__name__, "FuncDecl")
+        self.assertEqual(func.parameters.params, [("a", "int"), ("b", "int")])
+        body_sum = func.body[0].expression
+        self.assertIsInstance(body_sum, BinaryOp)
+        self.assertEqual((body_sum.op_token.line, body_sum.op_token.value), (3, "+"))
+
+    def test_checker_and_ir_generator_walk_the_views(self):
+        self.assertEqual(
+            check_and_generate(self.arena.root), check_and_generate(self.ast)
+        )
+        loop = self.arena.root.statements[3]
+        self.assertEqual(loop.condition.semantic_type, "bool")
+        self.assertIsNotNone(loop.body_semantic_scope)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1 +1,115 @@
 #test checker
+import contextlib
+import io
+import unittest
+
+from src.compiler.code_analyzer.checker import Checker
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.code_analyzer.parser import Parser
+from src.compiler.shared.symtable.symtable import SymbolTable
+from src.utils.json.ast_to_json import ASTtoJSON
+from .support import gox_file
+
+
+def parse_source(source):
+    with gox_file(source) as path:
+        return Parser(Lexer(path).analyze()).analyze()
+
+
+def check_source(source):
+    checker = Checker(parse_source(source))
+    with contextlib.redirect_stdout(io.StringIO()):
+        checker.analyze()
+    return checker
+
+
+class TestSlottedNodes(unittest.TestCase):
+    def test_nodes_have_no_instance_dict(self):
+        program = parse_source("var x int = 1;\nprint x + 2;\n")
+        binary = program.statements[1].expression
+        for node in (program, program.statements[0], binary, binary.left):
+            self.assertFalse(hasattr(node, "__dict__"), type(node).__name__)
+        with self.assertRaises(AttributeError):
+            binary.unexpected_field = 1
+
+    def test_checker_fills_the_declared_fields(self):
+        checker = check_source("var x int = 1;\nwhile x < 3 {\nx = x + 1;\n}\n")
+        self.assertEqual(checker.errors, [])
+        decl, loop = checker.ast.statements
+        self.assertEqual(decl.defined_symbol.name, "x")
+        self.assertEqual(loop.condition.semantic_type, "bool")
+        self.assertIs(loop.condition.left.referenced_symbol, decl.defined_symbol)
+        self.assertIsNotNone(loop.body_semantic_scope)
+
+    def test_ast_to_dict_lists_syntactic_fields_only(self):
+        program = parse_source("print -1 * 2;\n")
+        self.assertEqual(
+            ASTtoJSON.ast_to_dict(program),
+            {
+                "__class__": "Program",
+                "statements": [
+                    {
+                        "__class__": "PrintStmt",
+                        "expression": {
+                            "__class__": "BinaryOp",
+                            "left": {
+                                "__class__": "UnaryOp",
+                                "op": "-",
+                                "expr": {
+                                    "__class__": "Literal",
+                                    "value": "1",
+                                    "type_token": "INTEGER",
+                                },
+                            },
+                            "op": "*",
+                            "right": {
+                                "__class__": "Literal",
+                                "value": "2",
+                                "type_token": "INTEGER",
+                            },
+                        },
+                    }
+                ],
+            },
+        )
+
+
+class TestCheckerErrors(unittest.TestCase):
+    def test_binary_operator_error_points_at_the_operator(self):
+        checker = check_source("var x int = 1;\nprint x +\n  true;\n")
+        self.assertEqual(len(checker.errors), 1)
+        self.assertIn("(Línea 2, Col 8)", checker.errors[0])
+        self.assertIn("Operador binario '+'", checker.errors[0])
+
+
+class TestTypeTables(unittest.TestCase):
+    def setUp(self):
+        self.table = SymbolTable()
+
+    def test_binary_results_include_int_float_coercion(self):
+        result = self.table.get_binary_op_result_type
+        self.assertEqual(result("+", "int", "int"), "int")
+        self.assertEqual(result("*", "int", "float"), "float")
+        self.assertEqual(result("<", "float", "int"), "bool")
+        self.assertEqual(result("==", "char", "char"), "bool")
+        self.assertEqual(result("&&", "bool", "bool"), "bool")
+        self.assertIsNone(result("+", "bool", "bool"))
+        self.assertIsNone(result("&&", "int", "float"))
+        self.assertIsNone(result("+", "int", "string"))
+        self.assertIsNone(result("%", "int", "int"))
+
+    def test_results_are_the_interned_type_names(self):
+        self.assertIs(self.table.get_binary_op_result_type("-", "int", "float"), "float")
+        self.assertIs(self.table.get_unary_op_result_type("!", "bool"), "bool")
+        self.assertIsNone(self.table.get_unary_op_result_type("!", "int"))
+
+    def test_assignability(self):
+        assignable = self.table.is_type_assignable
+        self.assertTrue(assignable("float", "int"))
+        self.assertTrue(assignable("float", "FLOAT_TYPE"))
+        self.assertFalse(assignable("int", "float"))
+        self.assertFalse(assignable("bool", "int"))
+
+
+if __name__ == "__main__":
+    unittest.main()
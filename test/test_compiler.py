@@ -0,0 +1,112 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from src.compiler.compiler import Compiler
+from src.utils.report.reporter import Reporter
+from .support import gox_file
+
+CODE_DIR = os.path.join(os.path.dirname(__file__), "..", "code")
+
+
+def compile_output(path, **options):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        Compiler(path, **options)
+    return output.getvalue()
+
+
+class TestCompilerLexerErrors(unittest.TestCase):
+    def test_lexer_error_stops_before_parser_diagnostics(self):
+        with gox_file("var x int = 1 @ 2;\nprint x;\n") as path:
+            output = compile_output(path)
+        self.assertIn("Caracter ilegal: '@'", output)
+        self.assertNotIn("Se esperaba", output)
+        self.assertNotIn("MÓDULO IR", output)
+
+    def test_unclosed_char_in_repo_program(self):
+        output = compile_output(os.path.join(CODE_DIR, "mandelplot.gox"))
+        self.assertIn("Caracter no terminado en la línea 39", output)
+        self.assertNotIn("MÓDULO IR", output)
+
+
+class TestCompilerArena(unittest.TestCase):
+    def test_arena_output_matches_object_ast(self):
+        path = os.path.join(CODE_DIR, "factorize.gox")
+        self.assertEqual(compile_output(path, use_arena=True), compile_output(path))
+
+
+class TestCompilerReporting(unittest.TestCase):
+    PATH = os.path.join(CODE_DIR, "factorize.gox")
+
+    def test_full_prints_symbol_table_and_ir(self):
+        output = compile_output(self.PATH)
+        self.assertIn("TABLA DE SÍMBOLOS COMPLETA", output)
+        self.assertIn("MÓDULO IR GENERADO", output)
+        self.assertIn("--- EJECUCIÓN ---", output)
+
+    def test_silent_prints_only_the_program_output(self):
+        output = compile_output(self.PATH, reporter=Reporter("silent"))
+        program_output = compile_output(self.PATH).split("--- EJECUCIÓN ---\n")[1]
+        self.assertEqual(output, program_output)
+
+    def test_summary_counts_scopes_and_instructions(self):
+        output = compile_output(self.PATH, reporter=Reporter("summary"))
+        self.assertIn("Tabla de símbolos: 9 ámbitos, 10 símbolos", output)
+        self.assertIn("Módulo IR: 1 globales, 4 funciones", output)
+        self.assertNotIn("FUNCTION:::", output)
+
+    def test_json_lines(self):
+        output = compile_output(self.PATH, reporter=Reporter("full", json_lines=True))
+        lines = output.splitlines()
+        events = [json.loads(line)["event"] for line in lines[:3]]
+        self.assertEqual(events, ["symbol_table", "ir_module", "execution"])
+        module = json.loads(lines[1])
+        self.assertIn(["RET"], module["functions"]["factorize"]["code"])
+
+    def test_json_lines_wrap_program_output(self):
+        output = compile_output(self.PATH, reporter=Reporter("silent", json_lines=True))
+        events = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual({event["event"] for event in events}, {"output"})
+        text = "".join(event["text"] for event in events)
+        self.assertEqual(text, compile_output(self.PATH, reporter=Reporter("silent")))
+
+    def test_json_lines_report_errors_as_events(self):
+        cases = [
+            ("print y;\n", "checker", 1),
+            ("var x int = 1 @ 2;\n", "lexer", 1),
+            ("var a int = 0;\nprint 1;\nprint 10 / a;\n", "run", None),
+        ]
+        for source, phase, line in cases:
+            with self.subTest(phase=phase), gox_file(source) as path:
+                output = compile_output(path, reporter=Reporter("summary", json_lines=True))
+                events = [json.loads(line) for line in output.splitlines()]
+                errors = [event for event in events if event["event"] == "error"]
+                self.assertEqual(len(errors), 1)
+                self.assertEqual((errors[0]["phase"], errors[0]["line"]), (phase, line))
+                self.assertTrue(errors[0]["message"])
+
+    def test_time_passes_table_and_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            report = os.path.join(directory, "passes.json")
+            output = compile_output(
+                self.PATH, reporter=Reporter("silent"), time_passes_json=report
+            )
+            with open(report, encoding="utf-8") as file:
+                data = json.load(file)
+        self.assertIn("TIEMPOS POR FASE", output)
+        self.assertEqual(
+            [stats["pass"] for stats in data["passes"]],
+            [
+                "read", "lexer", "parser", "checker", "fold", "ir", "peephole", "dce",
+                "licm", "cse", "output",
+            ],
+        )
+        self.assertEqual(data["passes"][3]["unit"], "symbols")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import contextlib
+import io
+import unittest
+
+from src.compiler.api import CompilationOptions, compile_source
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.code_analyzer.parser import Parser
+from src.compiler.code_analyzer.checker import Checker
+from src.compiler.interpreter.ir_generator import IRCodeGenerator
+from src.compiler.interpreter.vm import VirtualMachine
+from .support import gox_file
+
+DEPTH = 100_000
+
+
+def compile_and_run(source):
+    with gox_file(source) as path, contextlib.redirect_stdout(io.StringIO()):
+        ast = Parser(Lexer(path).iter_tokens()).analyze()
+        symtable = Checker(ast).analyze()
+        module = IRCodeGenerator(symtable).generate(ast)
+    output = io.StringIO()
+    VirtualMachine(module, stdout=output).run()
+    return ast, output.getvalue().split()
+
+
+class TestDeepNesting(unittest.TestCase):
+    def test_nested_if_blocks(self):
+        ast, output = compile_and_run(
+            "if true {\n" * DEPTH + "print 1;\n" + "}\n" * DEPTH
+        )
+        self.assertEqual(output, ["1"])
+        node = ast.statements[0]
+        for _ in range(DEPTH - 1):
+            node = node.then_block[0]
+        self.assertEqual(type(node.then_block[0]).__name__, "PrintStmt")
+
+    def test_nested_while_and_else_blocks(self):
+        _, output = compile_and_run(
+            "while true {\n" * DEPTH
+            + "if false { print 0; } else { print 7; }\n"
+            + "break;\n}\n" * DEPTH
+            + "print 8;\n"
+        )
+        self.assertEqual(output[0], "7")
+        self.assertEqual(output[-1], "8")
+
+    def test_default_pipeline_at_depth(self):
+        # La entrada real: plegado y todos los pases de IR, que construyen
+        # el grafo de flujo y buscan bucles sobre los 100k niveles.
+        result = compile_source(
+            "while true {\n" * DEPTH
+            + "if false { print 0; } else { print 7; }\n"
+            + "break;\n}\n" * DEPTH
+            + "print 8;\n",
+            CompilationOptions(run=True),
+        )
+        self.assertTrue(result.ok)
+        self.assertEqual(sorted(result.optimizers), ["cse", "dce", "licm", "peephole"])
+        self.assertEqual(result.output.split(), ["7", "8"])
+
+    def test_nested_parenthesized_expression(self):
+        # 1 - (1 - (1 - ... (1))): el resultado alterna entre 0 y 1.
+        _, output = compile_and_run(
+            "print " + "1 - (" * DEPTH + "1" + ")" * DEPTH + ";\n"
+        )
+        self.assertEqual(output, [str(1 - DEPTH % 2)])
+
+    def test_long_operator_chains(self):
+        _, output = compile_and_run(
+            "print " + "-" * DEPTH + "3;\n"
+            "print " + " + ".join(["1"] * DEPTH) + ";\n"
+            "print " + "(" * DEPTH + "5" + ")" * DEPTH + ";\n"
+        )
+        self.assertEqual(output, ["3", str(DEPTH), "5"])
+
+    def test_names_loop_and_function_resolved_at_depth(self):
+        # En el bloque más interno se leen un parámetro, un local y una
+        # global, se sale del bucle y se retorna desde la función.
+        _, output = compile_and_run(
+            "var g int = 2;\n"
+            "func f(a int) int {\nvar x int = a;\nwhile true {\n"
+            + "if x > 0 {\n" * DEPTH
+            + "x = x + a * g;\nif x > 100 { return x; }\nbreak;\n"
+            + "}\n" * DEPTH
+            + "}\nreturn x;\n}\n"
+            "print f(3);\n"
+        )
+        self.assertEqual(output, ["9"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1 +1,102 @@
-#test ir_generator.py
\ No newline at end of file
+#test ir_generator.py
+import contextlib
+import io
+import unittest
+
+from src.compiler.code_analyzer.checker import Checker
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.code_analyzer.parser import Parser
+from src.compiler.interpreter.ir_generator import IRCodeGenerator
+from src.compiler.shared.symtable.symtable import Scope
+from src.compiler.shared.symtable.symbol import StorageClass
+from .support import gox_file
+
+SOURCE = """\
+var g int = 1;
+func f(a int) int {
+    var t int = a;
+    while t < 10 {
+        if t > 5 {
+            var g int = t;
+            t = t + g;
+        }
+        t = t + g;
+    }
+    return t;
+}
+print f(2);
+"""
+
+
+def check_source(source):
+    with gox_file(source) as path:
+        ast = Parser(Lexer(path).analyze()).analyze()
+    with contextlib.redirect_stdout(io.StringIO()):
+        symtable = Checker(ast).analyze()
+    return ast, symtable
+
+
+class TestResolvedSymbols(unittest.TestCase):
+    def test_checker_assigns_storage_and_slots(self):
+        ast, _ = check_source(SOURCE)
+        global_g, func = ast.statements[0], ast.statements[1]
+        self.assertEqual(global_g.defined_symbol.storage, StorageClass.GLOBAL)
+        self.assertEqual(global_g.defined_symbol.slot, 0)
+        local_t = func.body[0]
+        self.assertEqual(local_t.defined_symbol.storage, StorageClass.LOCAL)
+        self.assertEqual(local_t.defined_symbol.slot, 1)
+        self.assertEqual(local_t.initializer.referenced_symbol.slot, 0)
+        inner_if = func.body[1].body[0]
+        shadowing_g = inner_if.then_block[0].defined_symbol
+        self.assertEqual((shadowing_g.storage, shadowing_g.slot), (StorageClass.LOCAL, 2))
+        outer_use = func.body[1].body[1].expression.right
+        self.assertIs(outer_use.referenced_symbol, global_g.defined_symbol)
+
+    def test_generator_does_not_search_scopes(self):
+        ast, symtable = check_source(SOURCE)
+        calls = []
+        original = Scope.lookup
+
+        def counting_lookup(scope, name, current_scope_only=False):
+            calls.append(name)
+            return original(scope, name, current_scope_only)
+
+        Scope.lookup = counting_lookup
+        try:
+            module = IRCodeGenerator(symtable).generate(ast)
+        finally:
+            Scope.lookup = original
+        self.assertEqual(calls, ["main"])
+        code = module.functions["f"].code
+        self.assertIn(("LOCAL_GET", "g"), code)
+        self.assertIn(("GLOBAL_GET", "g"), code)
+
+
+class TestOperatorTables(unittest.TestCase):
+    def generate(self, source):
+        ast, symtable = check_source(source)
+        return IRCodeGenerator(symtable).generate(ast).functions["main"].code
+
+    def test_mixed_operands_are_coerced_to_float(self):
+        code = self.generate("var f float = 1.5;\nvar i int = 2;\nprint f + i;\n")
+        position = code.index(("GLOBAL_GET", "i"))
+        self.assertEqual(
+            code[position : position + 3], [("GLOBAL_GET", "i"), ("ITOF",), ("ADDF",)]
+        )
+        code = self.generate("var f float = 1.5;\nvar i int = 2;\nprint i / f;\n")
+        self.assertIn(("CONSTF", 0.0), code)
+        position = code.index(("GLOBAL_GET", "i"))
+        self.assertEqual(
+            code[position : position + 4],
+            [("GLOBAL_GET", "i"), ("ITOF",), ("SWAP",), ("DIVF",)],
+        )
+
+    def test_chars_and_unary_operators_use_integer_opcodes(self):
+        code = self.generate("var c char = 'a';\nprint c < 'b';\nprint -2;\nprint ^4;\n")
+        self.assertIn(("LTI",), code)
+        self.assertIn(("GROW",), code)
+        self.assertEqual(code.count(("MULI",)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import contextlib
+import io
+import os
+import unittest
+
+from src.compiler.code_analyzer.errors.lexer import LexerAbort
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.shared.grammar.gox_token import Token, TokenKind, ID
+from .support import gox_file
+
+
+def lex_source(source):
+    with gox_file(source) as path:
+        lexer = Lexer(path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            tokens = lexer.analyze()
+    return lexer, tokens
+
+
+class TestLexerPositions(unittest.TestCase):
+    def test_lines_and_columns(self):
+        _, tokens = lex_source("var x int;\n  x = 1;\n\n\tprint x;")
+        positions = [(t.value, t.line, t.column) for t in tokens]
+        self.assertEqual(positions[0], ("var", 1, 0))
+        self.assertEqual(positions[4], ("x", 2, 2))
+        self.assertEqual(positions[-3], ("print", 4, 1))
+
+    def test_multiline_block_comment_advances_lines(self):
+        _, tokens = lex_source("/* uno\n dos\n tres */ var a int;\n// fin\nprint a;")
+        first = tokens[0]
+        self.assertEqual((first.value, first.line, first.column), ("var", 3, 9))
+        self.assertEqual((tokens[4].value, tokens[4].line), ("print", 5))
+
+    def test_long_single_line(self):
+        source = "var a int = 1; " * 2000
+        _, tokens = lex_source(source)
+        self.assertTrue(all(t.line == 1 for t in tokens))
+        self.assertEqual(tokens[-1].column, len(source) - 2)
+
+    def test_error_positions(self):
+        lexer, tokens = lex_source("var a int;\n\n  $")
+        self.assertIsNone(tokens)
+        token, _ = lexer.errors[0]
+        self.assertEqual((token.line, token.column), (3, 2))
+
+
+class TestLexerKeywords(unittest.TestCase):
+    def test_reserved_words_are_classified(self):
+        _, tokens = lex_source("const x = 1; while iffy { print char(x); }")
+        kinds = [t.type for t in tokens]
+        self.assertEqual(kinds[0], "CONST")
+        self.assertEqual(kinds[5], "WHILE")
+        self.assertEqual((kinds[6], tokens[6].value), ("ID", "iffy"))
+        self.assertEqual(kinds[8:10], ["PRINT", "CHAR_TYPE"])
+
+    def test_word_glued_to_a_number_is_not_reserved(self):
+        _, tokens = lex_source("x = 3if;")
+        self.assertEqual([t.type for t in tokens[2:4]], ["INTEGER", "ID"])
+
+
+class TestLexerIterTokens(unittest.TestCase):
+    def test_iter_tokens_matches_analyze(self):
+        with gox_file("var x int = 1;\n/* c */ x = x * 2;\nprint x;\n") as path:
+            expected = [tuple(t) for t in Lexer(path).analyze()]
+            lexer = Lexer(path)
+            tokens = lexer.iter_tokens()
+            self.assertNotIsInstance(tokens, list)
+            self.assertEqual([tuple(t) for t in tokens], expected)
+            self.assertEqual(lexer.tokens, [])
+
+    def test_stream_stops_at_first_error(self):
+        with gox_file("var x int = 1;\n@\nprint x;\n$\n") as path:
+            lexer = Lexer(path)
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                tokens = lexer.iter_tokens()
+                received = [next(tokens) for _ in range(6)]
+                self.assertEqual(output.getvalue(), "")
+                with self.assertRaises(LexerAbort):
+                    next(tokens)
+        self.assertEqual(received[-1].value, ";")
+        self.assertEqual(len(lexer.errors), 2)
+        self.assertIn("Caracter ilegal", output.getvalue())
+
+
+class TestLexerMmap(unittest.TestCase):
+    def lex_both(self, source):
+        with gox_file(source) as path, contextlib.redirect_stdout(io.StringIO()):
+            text = Lexer(path)
+            text.analyze()
+            mapped = Lexer(path, use_mmap=True)
+            mapped.analyze()
+        return (text, text.tokens), (mapped, mapped.tokens)
+
+    def test_mmap_matches_text_mode(self):
+        path = os.path.join(os.path.dirname(__file__), "..", "code", "mandel.gox")
+        expected = [tuple(t) for t in Lexer(path).analyze()]
+        tokens = Lexer(path, use_mmap=True).analyze()
+        self.assertEqual([tuple(t) for t in tokens], expected)
+        self.assertTrue(all(isinstance(t.value, str) for t in tokens))
+
+    def test_columns_count_characters_on_non_ascii_lines(self):
+        (text, text_tokens), (mapped, mapped_tokens) = self.lex_both(
+            "/* café */ var a = 'ñ';\nprint a; € 3if\n"
+        )
+        self.assertEqual(
+            [tuple(t) for t in mapped_tokens], [tuple(t) for t in text_tokens]
+        )
+        self.assertEqual(tuple(mapped_tokens[3]), ("CHAR", "'ñ'", 1, 19))
+
+    def test_errors_are_decoded(self):
+        (text, _), (mapped, _) = self.lex_both("var a int;\n  ñ")
+        self.assertEqual(
+            [(tuple(t), m) for t, m in mapped.errors],
+            [(tuple(t), m) for t, m in text.errors],
+        )
+        self.assertEqual(tuple(mapped.errors[0][0]), ("ERROR", "ñ", 2, 2))
+
+    def test_reserved_words_next_to_non_ascii_characters(self):
+        # `€` no es carácter de palabra y `ñ` sí, igual que en modo texto.
+        (_, text_tokens), (_, mapped_tokens) = self.lex_both(
+            "€if x {} x€while ñif\n"
+        )
+        self.assertEqual(
+            [tuple(t) for t in mapped_tokens], [tuple(t) for t in text_tokens]
+        )
+        kinds = [(t.type, t.value) for t in mapped_tokens]
+        self.assertEqual(kinds[0], ("IF", "if"))
+        self.assertIn(("WHILE", "while"), kinds)
+        self.assertEqual(kinds[-1], ("ID", "if"))
+
+    def test_mapping_is_closed_after_scanning(self):
+        with gox_file("var a int;\n") as path:
+            lexer = Lexer(path, use_mmap=True)
+            lexer.analyze()
+            self.assertTrue(lexer.file_content.closed)
+            lexer = Lexer(path, use_mmap=True)
+            tokens = lexer.iter_tokens()
+            next(tokens)
+            tokens.close()
+            self.assertTrue(lexer.file_content.closed)
+
+
+class TestTokenKinds(unittest.TestCase):
+    def test_tokens_store_integer_kinds(self):
+        _, tokens = lex_source("var x int = 1;\n")
+        self.assertEqual(tokens[1].kind, ID)
+        self.assertEqual(TokenKind(tokens[1].kind), TokenKind.ID)
+        self.assertEqual(tokens[1].type, "ID")
+
+    def test_token_is_slotted(self):
+        token = Token("ID", "x", 1, 1)
+        self.assertEqual(token.kind, TokenKind.ID)
+        self.assertFalse(hasattr(token, "__dict__"))
+        self.assertEqual(tuple(token), ("ID", "x", 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
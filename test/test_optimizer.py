@@ -0,0 +1,314 @@
+import glob
+import os
+import time
+import unittest
+
+from src.compiler.api import CompilationOptions, compile_file, compile_source
+from src.compiler.interpreter.ir_generator import IRFunction, IRModule
+from src.compiler.optimizer.cfg import ControlFlowGraph
+from src.compiler.optimizer.licm import LoopInvariantCodeMotion
+from src.compiler.optimizer.peephole import PeepholeOptimizer, PeepholeRule
+
+CODE_DIR = os.path.join(os.path.dirname(__file__), "..", "code")
+
+
+def main_code(source, optimize=True):
+    result = compile_source(source, CompilationOptions(optimize=optimize))
+    return result, result.ircode.functions["main"].code
+
+
+class TestConstantFolding(unittest.TestCase):
+    def test_consts_are_inlined_and_their_globals_dropped(self):
+        source = (
+            "const xmin = -2.0;\nconst xmax = 1.0;\nconst width = 80.0;\n"
+            "var dx float = (xmax - xmin) / width;\nprint dx;\n"
+        )
+        result, code = main_code(source)
+        self.assertEqual(list(result.ircode.globals), ["dx"])
+        self.assertEqual(code[:2], [("CONSTF", 3.0 / 80.0), ("GLOBAL_SET", "dx")])
+
+        plain, _ = main_code(source, optimize=False)
+        self.assertIn("xmin", plain.ircode.globals)
+
+    def test_casts_and_unary_minus(self):
+        _, code = main_code("print int(7.9) + -2;\nprint float(3) / 2.0;\n")
+        self.assertEqual(code[:4], [("CONSTI", 5), ("PRINTI",), ("CONSTF", 1.5), ("PRINTF",)])
+
+    def test_integer_division_truncates_like_the_vm(self):
+        _, code = main_code("print -7 / 2;\n")
+        self.assertEqual(code[0], ("CONSTI", -3))
+
+    def test_variable_divisor_keeps_runtime_check(self):
+        result, code = main_code("var x int = 0;\nprint 10 / x;\n")
+        self.assertTrue(result.ok)
+        self.assertIn("DIVI", [instruction[0] for instruction in code])
+        run = compile_source("var x int = 0;\nprint 10 / x;\n", CompilationOptions(run=True))
+        self.assertEqual(run.failed_phase, "run")
+
+    def test_constant_zero_divisor_is_a_compile_error(self):
+        result = compile_source("const zero = 0;\nvar x int = 4;\nprint x / zero;\n")
+        self.assertEqual(result.failed_phase, "fold")
+        self.assertEqual((result.diagnostics[0].line, result.diagnostics[0].column), (3, 8))
+        self.assertIsNone(result.ircode)
+
+    def test_zero_divisor_in_skipped_operand_is_not_an_error(self):
+        result = compile_source("print true || (1 / 0 == 0);\n", CompilationOptions(run=True))
+        self.assertTrue(result.ok)
+        self.assertEqual(result.output.split(), ["1"])
+
+    def test_programs_print_the_same_with_and_without_optimizations(self):
+        for path in sorted(glob.glob(os.path.join(CODE_DIR, "*.gox"))):
+            if os.path.basename(path) in ("mandel.gox", "mandel_loop.gox"):
+                continue  # Tardan demasiado para la suite.
+            with self.subTest(program=os.path.basename(path)):
+                folded = compile_file(path, CompilationOptions(run=True))
+                plain = compile_file(path, CompilationOptions(run=True, optimize=False))
+                self.assertEqual(folded.output, plain.output)
+                self.assertEqual(folded.failed_phase, plain.failed_phase)
+
+
+class TestPeephole(unittest.TestCase):
+    def test_loop_test_and_constant_divisor(self):
+        result, code = main_code(
+            "var i int = 0;\nwhile i < 10 {\n    i = i + 1;\n}\nprint i / 2;\n"
+        )
+        self.assertEqual(
+            code[2:7],
+            [("LOOP",), ("GLOBAL_GET", "i"), ("CONSTI", 10), ("GEI",), ("CBREAK",)],
+        )
+        self.assertNotIn(("RUNTIME_ERROR", "DivisionByZero"), code)
+        self.assertEqual(code[-6:-3], [("GLOBAL_GET", "i"), ("CONSTI", 2), ("DIVI",)])
+        self.assertEqual(result.peephole_hits["inverted_loop_test"], 1)
+        self.assertEqual(result.peephole_hits["constant_divisor"], 1)
+
+    def test_negations_are_simplified(self):
+        _, code = main_code(
+            "var x int = 3;\nvar y int = 1;\nprint -(-x);\nprint y - -x;\n"
+        )
+        self.assertNotIn(("MULI",), code)
+        self.assertIn(("ADDI",), code)
+
+    def test_negated_comparisons_are_inverted(self):
+        source = (
+            "var x int = 3;\nprint !(x < 2);\n"
+            "if !(x == 3) { print 3; } else { print 4; }\n"
+        )
+        result, code = main_code(source)
+        self.assertNotIn(("EQI",), code)
+        self.assertIn(("GEI",), code)
+        self.assertEqual(result.peephole_hits["negated_comparison"], 2)
+        run = compile_source(source, CompilationOptions(run=True))
+        self.assertEqual(run.output.split(), ["1", "4"])
+
+    def test_rules_run_to_a_fixpoint(self):
+        # `while true` deja `CONSTI 1; CONSTI 1; SUBI; CBREAK`: primero se
+        # pliega la resta y en la pasada siguiente desaparece el CBREAK.
+        result, code = main_code("while true {\n    print 1;\n    break;\n}\n")
+        self.assertEqual(code[:2], [("LOOP",), ("CONSTI", 1)])
+        self.assertEqual(result.peephole_hits["fold_constants"], 1)
+        self.assertEqual(result.peephole_hits["never_break"], 1)
+
+    def test_custom_rule_registry(self):
+        swap_twice = PeepholeRule(
+            "swap_twice", ("SWAP", "SWAP"), lambda code, index: (index + 2, [])
+        )
+        function = IRFunction(IRModule(), "f", [], [], "I")
+        function.code = [("CONSTI", 1), ("CONSTI", 2), ("SWAP",), ("SWAP",), ("SUBI",)]
+        optimizer = PeepholeOptimizer([swap_twice])
+        optimizer.optimize_function(function)
+        self.assertEqual(function.code, [("CONSTI", 1), ("CONSTI", 2), ("SUBI",)])
+        self.assertEqual(optimizer.hits, {"swap_twice": 1})
+        self.assertEqual(optimizer.passes, 2)
+
+
+NESTED_LOOPS = """\
+func f(n int) int {
+    var i int = 0;
+    while i < n {
+        var j int = 0;
+        while j < i {
+            if j == 7 {
+                return j;
+                print 99;
+            }
+            j = j + 1;
+        }
+        i = i + 1;
+    }
+    return -1;
+}
+print f(3);
+print f(10);
+"""
+
+
+class TestControlFlowGraph(unittest.TestCase):
+    def function_code(self, optimize):
+        result = compile_source(NESTED_LOOPS, CompilationOptions(optimize=optimize))
+        return result.ircode.functions["f"].code
+
+    def test_lowering_round_trips(self):
+        code = self.function_code(optimize=False)
+        self.assertEqual(ControlFlowGraph(code).lower(), code)
+
+    def test_dominators_and_loop_nesting(self):
+        cfg = ControlFlowGraph(self.function_code(optimize=False))
+        outer, inner = cfg.loops
+        self.assertEqual((outer.depth, inner.depth), (1, 2))
+        self.assertIs(inner.parent, outer)
+        self.assertLess(outer.blocks.start, inner.blocks.start)
+        self.assertLess(inner.blocks.stop, outer.blocks.stop)
+        self.assertTrue(cfg.dominates(outer.header, inner.header))
+        self.assertFalse(cfg.dominates(inner.header, outer.header))
+        self.assertEqual(cfg.loop_depth(cfg.entry.index), 0)
+        self.assertEqual(cfg.loop_depth(inner.header), 2)
+
+    def test_code_after_return_is_removed(self):
+        plain = self.function_code(optimize=False)
+        optimized = self.function_code(optimize=True)
+        self.assertIn(("CONSTI", 99), plain)
+        self.assertNotIn(("CONSTI", 99), optimized)
+        for marker in ("IF", "ENDIF", "LOOP", "ENDLOOP"):
+            self.assertEqual(optimized.count((marker,)), plain.count((marker,)))
+        run = compile_source(NESTED_LOOPS, CompilationOptions(run=True))
+        self.assertEqual(run.output.split(), ["-1", "7"])
+
+    def test_constant_condition_drops_the_other_branch(self):
+        cfg = ControlFlowGraph(
+            [
+                ("CONSTI", 1),
+                ("IF",),
+                ("CONSTI", 2),
+                ("PRINTI",),
+                ("ELSE",),
+                ("CONSTI", 3),
+                ("PRINTI",),
+                ("ENDIF",),
+            ]
+        )
+        self.assertEqual(
+            cfg.lower(only_reachable=True),
+            [("CONSTI", 1), ("IF",), ("CONSTI", 2), ("PRINTI",), ("ELSE",), ("ENDIF",)],
+        )
+
+
+class TestCommonSubexpressions(unittest.TestCase):
+    def function(self, source, name="f", run=False):
+        result = compile_source(source, CompilationOptions(run=run))
+        return result, result.ircode.functions[name]
+
+    def test_repeated_expression_is_spilled_once(self):
+        source = (
+            "func f(a int, b int) int {\n"
+            "    return (a*b + a) * 3 + (a*b + a) * 5;\n}\nprint f(3, 4);\n"
+        )
+        result, function = self.function(source, run=True)
+        self.assertEqual(function.code.count(("MULI",)), 3)
+        self.assertEqual(function.code.count(("LOCAL_GET", "$cse2")), 1)
+        self.assertEqual(function.locals["$cse2"], "I")
+        self.assertEqual(result.optimizers["cse"].eliminated, 1)
+        self.assertEqual(result.output.split(), ["120"])
+
+    def test_assignments_and_calls_end_the_reuse(self):
+        source = (
+            "var g float = 1.0;\nfunc h() float { g = g + 1.0; return g; }\n"
+            "func f(x float) float {\n"
+            "    var s float = x*x + x*x*x;\n    x = x + 1.0;\n"
+            "    var t float = x*x + x*x*x;\n"
+            "    var u float = g*g + g*g*g + h() + g*g + g*g*g;\n"
+            "    return s + t + u;\n}\nprint f(2.0);\n"
+        )
+        result, function = self.function(source, run=True)
+        self.assertFalse([name for name in function.locals if name.startswith("$cse")])
+        plain = compile_source(source, CompilationOptions(run=True, skip_passes=["cse"]))
+        self.assertEqual(result.output, plain.output)
+
+    def test_short_expressions_are_not_spilled(self):
+        _, function = self.function(
+            "func f(x int) int {\n    return x*x + x*x;\n}\nprint f(2);\n"
+        )
+        self.assertEqual(function.code.count(("MULI",)), 2)
+
+
+LOOP_INVARIANTS = """\
+var g int = 5;
+func f(n int, k int, scale float) float {
+    var total float = 0.0;
+    var i int = 0;
+    while i < n {
+        var j int = 0;
+        while j < k * 2 + g {
+            total = total + scale * 2.0 + float(i) * (scale * scale);
+            j = j + 1;
+        }
+        if k == 0 {
+            total = total + 100.0 / scale;
+        }
+        i = i + 1;
+    }
+    return total;
+}
+print f(3, 2, 0.5);
+print f(0, 0, 0.0);
+"""
+
+
+class TestLoopInvariantCodeMotion(unittest.TestCase):
+    def test_invariants_leave_both_loops(self):
+        result = compile_source(LOOP_INVARIANTS, CompilationOptions(run=True))
+        code = result.ircode.functions["f"].code
+        preheader = code[: code.index(("LOOP",))]
+        self.assertIn(("GLOBAL_GET", "g"), preheader)
+        self.assertEqual(preheader.count(("MULF",)), 2)
+        self.assertEqual(result.optimizers["licm"].hoisted, 4)
+        # La división puede fallar: se queda en el bucle, detrás de su IF.
+        self.assertNotIn(("DIVF",), preheader)
+        plain = compile_source(LOOP_INVARIANTS, CompilationOptions(run=True, skip_passes=["licm"]))
+        self.assertEqual(result.output, plain.output)
+        self.assertEqual(result.output.split(), ["33.75", "0.0"])
+
+    def test_calls_memory_and_writes_stay_in_the_loop(self):
+        source = (
+            "var g int = 2;\nfunc h() int { g = g + 1; return g; }\n"
+            "func f(addr int) int {\n    var i int = 0;\n    var t int = 0;\n"
+            "    while i < 3 {\n        t = t + g * 3 + h();\n"
+            "        t = t + `(addr + 4) * 2;\n        i = i + 1;\n    }\n"
+            "    return t;\n}\nvar base int = ^8;\nprint f(0);\n"
+        )
+        result = compile_source(source, CompilationOptions(run=True))
+        code = result.ircode.functions["f"].code
+        self.assertNotIn(("GLOBAL_GET", "g"), code[: code.index(("LOOP",))])
+        self.assertIn(("PEEKI",), code[code.index(("LOOP",)) :])
+        self.assertEqual(result.optimizers["licm"].hoisted, 1)
+        plain = compile_source(source, CompilationOptions(run=True, optimize=False))
+        self.assertEqual(result.output, plain.output)
+
+    def test_many_loops_scale(self):
+        # Antes se reconstruía el grafo por cada bucle: 500 bucles seguidos
+        # tardaban minutos.
+        count = 500
+        sequential = (
+            "var n int = 3;\nvar i int = 0;\n"
+            + "i = 0;\nwhile i < n * 2 {\n    i = i + 1;\n}\n" * count
+            + "print i;\n"
+        )
+        # `n * 2` sale de una vez hasta antes del bucle más externo.
+        nested = (
+            "var n int = 3;\n"
+            + "while true {\n" * count
+            + "print n * 2;\n"
+            + "break;\n}\n" * count
+        )
+        for source, hoisted in ((sequential, count), (nested, 1)):
+            module = compile_source(source, CompilationOptions(skip_passes=["licm"])).ircode
+            optimizer = LoopInvariantCodeMotion()
+            started = time.perf_counter()
+            optimizer.optimize_module(module)
+            self.assertLess(time.perf_counter() - started, 5.0)
+            self.assertEqual(optimizer.hoisted, hoisted)
+            result = compile_source(source, CompilationOptions(run=True))
+            self.assertEqual(result.output.split(), ["6"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import contextlib
+import io
+import unittest
+
+from src.compiler.code_analyzer.helpers.token_stream import TokenStream
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.code_analyzer.parser import Parser
+from src.compiler.shared.grammar.gox_token import Token
+from .support import gox_file
+
+
+def make_tokens(*specs):
+    return [Token(kind, value, 1, column) for column, (kind, value) in enumerate(specs)]
+
+
+class TestTokenStream(unittest.TestCase):
+    def test_advance_and_peek(self):
+        stream = TokenStream(make_tokens(("ID", "x"), ("ASSIGN", "="), ("SEMI", ";")))
+        self.assertEqual(stream.peek().type, "ID")
+        self.assertEqual(stream.peek(3).type, "SEMI")
+        self.assertIsNone(stream.peek(4))
+        self.assertEqual(stream.advance().value, "x")
+        self.assertEqual(len(stream), 2)
+        stream.advance()
+        stream.advance()
+        self.assertIsNone(stream.advance())
+        self.assertFalse(stream)
+
+    def test_parser_consumes_tokens_without_mutating_the_list(self):
+        tokens = make_tokens(
+            ("ID", "x"), ("ASSIGN", "="), ("INTEGER", "1"), ("SEMI", ";")
+        )
+        program = Parser(tokens).analyze()
+        self.assertEqual(len(program.statements), 1)
+        self.assertEqual(len(tokens), 4)
+
+    def test_parser_pulls_tokens_lazily(self):
+        tokens = make_tokens(
+            ("ID", "x"), ("ASSIGN", "="), ("INTEGER", "1"), ("SEMI", ";")
+        )
+        pulled = []
+
+        def source():
+            for token in tokens:
+                pulled.append(token)
+                yield token
+
+        parser = Parser(source())
+        self.assertEqual(len(pulled), 1)
+        program = parser.analyze()
+        self.assertEqual(len(program.statements), 1)
+        self.assertEqual(len(pulled), 4)
+
+
+def parse_expression(source):
+    with gox_file(f"print {source};") as path:
+        with contextlib.redirect_stdout(io.StringIO()):
+            program = Parser(Lexer(path).iter_tokens()).analyze()
+    return render(program.statements[0].expression)
+
+
+def render(node):
+    name = type(node).__name__
+    if name == "BinaryOp":
+        return f"({render(node.left)} {node.op} {render(node.right)})"
+    if name == "UnaryOp":
+        return f"({node.op}{render(node.expr)})"
+    if name == "Literal":
+        return node.value
+    if name == "IdentifierLocation":
+        return node.name
+    if name == "FunctionCall":
+        return f"{node.name}(" + ", ".join(render(a) for a in node.arguments) + ")"
+    return name
+
+
+class TestExpressionPrecedence(unittest.TestCase):
+    def test_left_associativity(self):
+        self.assertEqual(parse_expression("1 - 2 - 3"), "((1 - 2) - 3)")
+        self.assertEqual(parse_expression("a / b * c"), "((a / b) * c)")
+        self.assertEqual(parse_expression("a < b == c"), "((a < b) == c)")
+
+    def test_precedence_levels(self):
+        self.assertEqual(
+            parse_expression("a || b && c == d + e * -f"),
+            "(a || (b && (c == (d + (e * (-f))))))",
+        )
+        self.assertEqual(
+            parse_expression("a * b + c > d && e || f"),
+            "(((((a * b) + c) > d) && e) || f)",
+        )
+
+    def test_parentheses_and_calls(self):
+        self.assertEqual(
+            parse_expression("(x + f(1, y * 2)) * 3"), "((x + f(1, (y * 2))) * 3)"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import contextlib
+import io
+import unittest
+
+from src.compiler.code_analyzer.checker import Checker
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.code_analyzer.parser import Parser
+from src.compiler.interpreter.ir_generator import IRCodeGenerator
+from src.compiler.shared.AST.grammar.binary_operator import BinaryOp
+from src.compiler.shared.AST.grammar.break_stmt import BreakStmt
+from src.compiler.shared.AST.grammar.literal import Literal
+from src.compiler.shared.AST.grammar.print_stmt import PrintStmt
+from src.compiler.shared.AST.visitor import (
+    NodeTransformer,
+    NodeVisitor,
+    iter_child_nodes,
+    walk,
+)
+from .support import gox_file
+
+
+def parse_source(source):
+    with gox_file(source) as path:
+        return Parser(Lexer(path).analyze()).analyze()
+
+
+class TestNodeVisitor(unittest.TestCase):
+    def test_each_subclass_has_its_own_table(self):
+        self.assertIsNot(Checker._handlers, IRCodeGenerator._handlers)
+        self.assertIs(
+            Checker._resolve_handler(BinaryOp), Checker.__dict__["_visit_BinaryOp"]
+        )
+        self.assertIs(Checker._handlers[BinaryOp], Checker._visit_BinaryOp)
+        self.assertNotIn(BinaryOp, NodeVisitor._handlers)
+
+    def test_resolution_follows_the_mro(self):
+        class Visitor(NodeVisitor):
+            def _visit_Expression(self, node):
+                return "expression"
+
+        class Folded(Literal):
+            __slots__ = ()
+
+        self.assertEqual(Visitor._resolve_handler(Folded)(Visitor(), None), "expression")
+        self.assertIs(Visitor._resolve_handler(BreakStmt), NodeVisitor._generic_visit)
+
+
+class TestTraversal(unittest.TestCase):
+    def test_walk_is_preorder_over_child_fields(self):
+        program = parse_source("var x int = 1 + 2;\nprint x;\n")
+        names = [type(node).__name__ for node in walk(program)]
+        self.assertEqual(
+            names,
+            [
+                "Program",
+                "VarDecl",
+                "BinaryOp",
+                "Literal",
+                "Literal",
+                "PrintStmt",
+                "IdentifierLocation",
+            ],
+        )
+
+    def test_walk_skips_checker_annotations(self):
+        program = parse_source("var x int = 1;\nwhile x < 2 {\nx = x + 1;\n}\n")
+        with contextlib.redirect_stdout(io.StringIO()):
+            Checker(program).analyze()
+        loop = program.statements[1]
+        self.assertIsNotNone(loop.body_semantic_scope)
+        self.assertEqual(
+            [type(child).__name__ for child in iter_child_nodes(loop)],
+            ["BinaryOp", "Assignment"],
+        )
+        self.assertEqual(sum(1 for _ in walk(program)), 12)
+
+    def test_transformer_replaces_and_removes_nodes(self):
+        class Rewriter(NodeTransformer):
+            def _visit_Literal(self, node):
+                return Literal(str(int(node.value) * 10), node.type_token)
+
+            def _visit_PrintStmt(self, node):
+                expression = node.expression
+                if isinstance(expression, Literal) and expression.value == "20":
+                    return None
+                return node
+
+        program = parse_source("print 1;\nprint 2;\nprint 3 + 4;\n")
+        result = Rewriter().transform(program)
+        self.assertIs(result, program)
+        self.assertEqual(len(program.statements), 2)
+        self.assertIsInstance(program.statements[0], PrintStmt)
+        self.assertEqual(program.statements[0].expression.value, "10")
+        addition = program.statements[1].expression
+        self.assertEqual((addition.left.value, addition.right.value), ("30", "40"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+import contextlib
+import io
+import os
+import unittest
+
+from src.compiler.code_analyzer.lexer import Lexer
+from src.compiler.code_analyzer.parser import Parser
+from src.compiler.code_analyzer.checker import Checker
+from src.compiler.interpreter.ir_generator import IRCodeGenerator, IRFunction, IRModule
+from src.compiler.interpreter.vm import VirtualMachine
+from src.compiler.interpreter.errors.vm import VMRuntimeError
+from .support import gox_file
+
+CODE_DIR = os.path.join(os.path.dirname(__file__), "..", "code")
+
+
+def compile_file(path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        tokens = Lexer(path).analyze()
+        ast = Parser(tokens).analyze()
+        symtable = Checker(ast).analyze()
+        return IRCodeGenerator(symtable).generate(ast)
+
+
+def run_ir(code, local_types=None):
+    module = IRModule()
+    function = IRFunction(module, "main", [], [], "I")
+    for name, type in (local_types or {}).items():
+        function.new_local(name, type)
+    function.code = code
+    output = io.StringIO()
+    VirtualMachine(module, stdout=output).run()
+    return output.getvalue().split()
+
+
+def run_source(source):
+    with gox_file(source) as path:
+        module = compile_file(path)
+    output = io.StringIO()
+    result = VirtualMachine(module, stdout=output).run()
+    return result, output.getvalue()
+
+
+class TestVirtualMachine(unittest.TestCase):
+    def test_fib_program(self):
+        module = compile_file(os.path.join(CODE_DIR, "fib.gox"))
+        output = io.StringIO()
+        VirtualMachine(module, stdout=output).run()
+        values = [int(line) for line in output.getvalue().split()]
+        self.assertEqual(values[:6], [1, 1, 2, 3, 5, 8])
+        self.assertEqual(values[-1], 6765)
+
+    def test_recursive_calls_and_user_main(self):
+        _, output = run_source(
+            "func fib(n int) int {\n"
+            "    if n <= 1 { return 1; }\n"
+            "    return fib(n-1) + fib(n-2);\n"
+            "}\n"
+            "func main() int {\n"
+            "    print fib(10);\n"
+            "    return 7;\n"
+            "}\n"
+        )
+        self.assertEqual(output, "89\n")
+
+    def test_nested_control_flow(self):
+        _, output = run_source(
+            "var i int = 0;\n"
+            "while i < 10 {\n"
+            "    i = i + 1;\n"
+            "    if i == 3 { continue; }\n"
+            "    if i > 5 { break; } else { print i; }\n"
+            "}\n"
+        )
+        self.assertEqual(output.split(), ["1", "2", "4", "5"])
+
+    def test_integer_division_truncates(self):
+        _, output = run_source("var a int = -7;\nprint a / 2;\nprint 7.0 / 2.0;\n")
+        self.assertEqual(output.split(), ["-3", "3.5"])
+
+    def test_division_by_zero(self):
+        with self.assertRaises(VMRuntimeError):
+            run_source("var a int = 0;\nprint 10 / a;\n")
+
+    def test_memory_peek_and_poke(self):
+        _, output = run_source(
+            "var size int = ^64;\n"
+            "`8 = 1234;\n"
+            "print `8 + 0;\n"
+            "print size;\n"
+        )
+        self.assertEqual(output.split(), ["1234", "64"])
+
+    def test_unary_minus_and_plus(self):
+        _, output = run_source(
+            "var x int = 3;\n"
+            "var y float = 2.5;\n"
+            "print -x;\n"
+            "print -(-x);\n"
+            "print +x;\n"
+            "print 1 - -x;\n"
+            "print -y;\n"
+            "print -y * 2.0;\n"
+            "if -x < 0 { print 1; } else { print 0; }\n"
+        )
+        self.assertEqual(output.split(), ["-3", "3", "3", "4", "-2.5", "-5.0", "1"])
+
+    def test_no_fusion_across_endif(self):
+        # La suma es destino del salto del IF: no puede fusionarse con la
+        # constante del ELSE que la precede en el código.
+        for condition, expected in ((1, "8"), (0, "9")):
+            with self.subTest(condition=condition):
+                output = run_ir(
+                    [
+                        ("CONSTI", 5),
+                        ("CONSTI", condition),
+                        ("IF",),
+                        ("CONSTI", 3),
+                        ("ELSE",),
+                        ("CONSTI", 4),
+                        ("ENDIF",),
+                        ("ADDI",),
+                        ("PRINTI",),
+                    ]
+                )
+                self.assertEqual(output, [expected])
+
+    def test_no_fusion_across_loop_label(self):
+        # Cada vuelta vuelve al LOOP y suma el 5 que dejó la anterior.
+        output = run_ir(
+            [
+                ("CONSTI", 0),
+                ("LOCAL_SET", "i"),
+                ("CONSTI", 0),
+                ("CONSTI", 5),
+                ("LOOP",),
+                ("ADDI",),
+                ("LOCAL_GET", "i"),
+                ("CONSTI", 1),
+                ("ADDI",),
+                ("DUP",),
+                ("LOCAL_SET", "i"),
+                ("CONSTI", 3),
+                ("GEI",),
+                ("CBREAK",),
+                ("CONSTI", 5),
+                ("ENDLOOP",),
+                ("PRINTI",),
+            ],
+            {"i": "I"},
+        )
+        self.assertEqual(output, ["15"])
+
+    def test_fused_operations_inside_branches(self):
+        # Cargas y constantes seguidas de aritmética o comparación, justo
+        # después de cada etiqueta.
+        _, output = run_source(
+            "var g int = 4;\n"
+            "func f(n int) int {\n"
+            "    var total int = 0;\n"
+            "    var i int = 0;\n"
+            "    while i < n {\n"
+            "        if i < g { total = total + g; } else { total = total - 1; }\n"
+            "        i = i + 1;\n"
+            "    }\n"
+            "    return total * 2;\n"
+            "}\n"
+            "print f(6);\n"
+            "print f(0);\n"
+        )
+        self.assertEqual(output.split(), ["28", "0"])
+
+    def test_logical_not(self):
+        _, output = run_source(
+            "var b bool = true;\n"
+            "var x int = 3;\n"
+            "print !b;\n"
+            "print !!b;\n"
+            "print !(x < 2);\n"
+            "if !b { print 1; } else { print 2; }\n"
+            "if !(x == 3) { print 3; } else { print 4; }\n"
+            "var i int = 0;\n"
+            "while !(i >= 2) { i = i + 1; }\n"
+            "print i;\n"
+        )
+        self.assertEqual(output.split(), ["0", "1", "1", "2", "4", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()